@@ -1,9 +1,51 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 import uvicorn
 
 from routes.like_routes import router as like_router
+from config.db import get_pool_metrics
+from config.server import server_options
+from utils.metrics import MetricsMiddleware, metrics_response
+from utils.query_profiler import QueryProfilerMiddleware
+from utils.readiness import ReadinessProbe, warm_up
+from utils.outbox_dispatcher import outbox_dispatcher
+from utils.webhook_utils import webhook_client
+from utils.likes_counter import likes_flusher
+from utils.pet_cache import pet_cache
+from utils.post_owners import post_owners
+
+
+# Maximum SQL statements per request, checked in QUERY_PROFILING mode
+QUERY_BUDGETS = {
+    # 3 with the pet cache and the PostOwners snapshot warm; +4 the first time a post is liked
+    "POST /likes/add": 7,
+    "POST /likes/add/bulk": 7,
+    "POST /likes/owners/invalidate": 1,
+}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background delivery of LIKE_ADDED webhooks stored in the outbox
+    await webhook_client.start()
+    await outbox_dispatcher.start()
+    # Write-behind flusher for Posts.likes (final flush on shutdown)
+    await likes_flusher.start()
+    # Listener for pet ownership cache invalidations
+    await pet_cache.start()
+    # Listener for post owner snapshot invalidations (posts:invalidate, pets:invalidate)
+    await post_owners.start()
+    # Pre-open the DB pools and the Redis connection and build the OpenAPI schema
+    await warm_up(app)
+    yield
+    await post_owners.stop()
+    await pet_cache.stop()
+    await likes_flusher.stop()
+    await outbox_dispatcher.stop()
+    await webhook_client.close()
+
 
 # Crear la app FastAPI
 app = FastAPI(
@@ -13,11 +55,26 @@ app = FastAPI(
     docs_url="/api-docs-addLike",                   
     redoc_url=None,
     openapi_url="/api-docs-likes/openapi.json",   
+    lifespan=lifespan,
 )
 
 @app.get("/health", tags=["Health Check"])
 def simple_health_check():
-    return {"status": "ok"}
+    return {"status": "ok", "db_pools": get_pool_metrics()}
+
+
+# Postgres x3 and Redis (plus the Notifications Service), cached for READINESS_CACHE_SECONDS
+readiness = ReadinessProbe(optional_checks={"notifier": webhook_client.check})
+
+
+@app.get("/ready", tags=["Health Check"])
+async def readiness_check():
+    return await readiness.response()
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return metrics_response()
 
 
 # Configurar CORS
@@ -28,6 +85,10 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Per-route latency histograms for /metrics
+app.add_middleware(MetricsMiddleware)
+# SQL statements per request against QUERY_BUDGETS (only with QUERY_PROFILING=true)
+app.add_middleware(QueryProfilerMiddleware, budgets=QUERY_BUDGETS)
 
 
 app.include_router(like_router)
@@ -49,4 +110,4 @@ app.openapi = custom_openapi
 
 # Ejecución directa
 if __name__ == "__main__":
-    uvicorn.run("app:app", host="0.0.0.0", port=6001, reload=True)
+    uvicorn.run("app:app", **server_options(6001))
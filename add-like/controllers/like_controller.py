@@ -1,104 +1,186 @@
-from sqlalchemy import select, update
+import asyncio
+import uuid
+from collections import Counter
+from sqlalchemy.dialects.postgresql import insert
 from datetime import datetime
 from fastapi import HTTPException
 from models.like_model import Like
-from models.post_model import Post
-from models.pet_model import Pet
-from config.db import SessionReactions, SessionPost, SessionPet
-from utils.webhook_utils import send_like_webhook
-
-def add_like_controller(postId, responsibleId, petId):
-    db_reactions = SessionReactions()
-    db_posts = SessionPost()
-    db_pets = SessionPet()
-
+from models.outbox_model import LikeOutbox
+from config.db import SessionReactions
+from utils.outbox_dispatcher import outbox_dispatcher
+from utils.likes_counter import likes_flusher
+from utils.pet_likes_index import record_pet_like
+from utils.pet_cache import pet_cache
+from utils.post_owners import post_owners
+from utils.leaderboard import record_leaderboard_like
+
+def _like_added_event(petId, postId, liker_pet_name, owner, now):
+    """
+    Construye la fila de LikeOutbox con el evento LIKE_ADDED para el Notifications Service.
+    """
+    payload = {
+        "event": "LIKE_ADDED",
+        "data": {
+            "type": "Likes",
+            "actorId": str(petId),
+            "recipientId": str(postId),
+            "responsibleId": owner["ownerResponsibleId"],
+            "timestamp": now.isoformat(),
+            "content": f"{liker_pet_name} le dio like a una publicación de {owner['ownerPetName']}."
+        }
+    }
+    return LikeOutbox(
+        eventType=payload["event"],
+        payload=payload,
+        status="pending",
+        attempts=0,
+        nextAttemptAt=now,
+        createdAt=now
+    )
+
+
+def _canonical_ids(postId, petId):
+    """
+    Normaliza los ids de la petición a la forma canónica del UUID (minúsculas, con guiones),
+    la que usan las filas y las claves de Redis (contador, índice por mascota, rankings).
+    """
     try:
+        return str(uuid.UUID(str(postId))), str(uuid.UUID(str(petId)))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Invalid postId or petId")
+
+
+async def add_like_controller(postId, responsibleId, petId):
+    postId, petId = _canonical_ids(postId, petId)
+    async with SessionReactions() as db_reactions:
+        # Pet ownership (cached) and the post owner snapshot (Reactions DB) are read concurrently
+        pet, owner = await asyncio.gather(
+            pet_cache.get_pet(petId),
+            post_owners.get(db_reactions, postId),
+        )
+
         # Verify that the pet belongs to the responsible user
-        pet = db_pets.execute(
-            select(Pet).where(
-                Pet.id == petId,
-                Pet.responsibleId == responsibleId
-            )
-        ).scalar_one_or_none()
-
-        if not pet:
+        if not pet or pet["responsibleId"] != str(responsibleId).lower():
             raise HTTPException(status_code=403, detail="Responsible does not own the pet trying to like")
 
         # Verify that the post exists
-        post = db_posts.execute(
-            select(Post).where(Post.id == postId)
-        ).scalar_one_or_none()
-
-        if not post:
+        if not owner:
             raise HTTPException(status_code=404, detail="Post not found")
 
-        # Check if the like already exists
-        existing_like = db_reactions.execute(
-            select(Like).where(
-                Like.postId == postId,
-                Like.petId == petId
-            )
-        ).scalar_one_or_none()
-
-        if existing_like:
+        # Insert the like (do not commit yet); the (postId, petId) unique
+        # constraint makes duplicate detection part of the same statement
+        liked_at = datetime.utcnow()
+        new_like_id = (await db_reactions.execute(
+            insert(Like)
+            .values(postId=postId, petId=petId, createdAt=liked_at)
+            .on_conflict_do_nothing(index_elements=[Like.postId, Like.petId])
+            .returning(Like.id)
+        )).scalar_one_or_none()
+
+        if new_like_id is None:
             raise HTTPException(status_code=400, detail="Like already exists")
 
-        # Prepare the new like (do not commit yet)
-        new_like = Like(
-            postId=postId,
-            petId=petId,
-            createdAt=datetime.utcnow()
-        )
-        db_reactions.add(new_like)
-
-        # Get the name of the pet who gave the like
-        liker_pet_name = pet.name
+        # The pet who owns the post comes from the same snapshot
+        if not owner["ownerResponsibleId"]:
+            raise HTTPException(status_code=404, detail="Owner pet not found")
 
-        # Get the pet who owns the post
-        post_owner_pet = db_pets.execute(
-            select(Pet).where(Pet.id == post.petId)
-        ).scalar_one_or_none()
+        # Store the webhook event in the outbox, in the same transaction as the like;
+        # the outbox dispatcher delivers it in the background
+        db_reactions.add(_like_added_event(petId, postId, pet["name"], owner, datetime.utcnow()))
+        await db_reactions.commit()
+        outbox_dispatcher.notify()
+
+        # Update the like counter (Redis write-through, Posts.likes flushed in batches),
+        # get-likes' per-pet index of liked posts and the leaderboards
+        await asyncio.gather(
+            likes_flusher.record(postId, 1),
+            record_pet_like(petId, postId, True),
+            record_leaderboard_like(postId, 1, liked_at),
+        )
 
-        if not post_owner_pet:
-            raise HTTPException(status_code=404, detail="Owner pet not found")
+        return {"message": "Like added successfully"}
 
-        post_owner_pet_name = post_owner_pet.name
-        post_owner_responsible_id = post_owner_pet.responsibleId
-
-        # Build the webhook payload
-        payload = {
-            "event": "LIKE_ADDED",
-            "data": {
-                "type": "Likes",
-                "actorId": str(petId),
-                "recipientId": str(postId),
-                "responsibleId": str(post_owner_responsible_id),
-                "timestamp": datetime.utcnow().isoformat(),
-                "content": f"{liker_pet_name} le dio like a una publicación de {post_owner_pet_name}."
-            }
-        }
 
-        # Try to send the webhook before committing the like
+async def add_likes_bulk_controller(operations: list, responsibleId) -> list:
+    """
+    Añade varios likes en una sola transacción.
+    La propiedad de las mascotas y los dueños de los posts (PostOwners) se validan con consultas IN,
+    los likes se insertan con un único INSERT multi-fila y se devuelve un resultado por operación.
+    """
+    results = {}
+    # (postId, petId) as sent -> canonical pair; spellings of the same pair are processed once
+    canonical = {}
+    for postId, petId in dict.fromkeys((op.postId, op.petId) for op in operations):
         try:
-            send_like_webhook(payload)
-        except Exception as e:
-            db_reactions.rollback()  # Rollback the like if webhook fails
-            raise HTTPException(status_code=500, detail=f"Failed to send like notification: {str(e)}")
-
-        # Commit the like only if webhook was successful
-        db_reactions.commit()
-
-        # Update the like counter in the post
-        db_posts.execute(
-            update(Post)
-            .where(Post.id == postId)
-            .values(likes=Post.likes + 1)
+            canonical[(postId, petId)] = _canonical_ids(postId, petId)
+        except HTTPException:
+            results[(postId, petId)] = (422, "Invalid postId or petId")
+    pending = list(dict.fromkeys(canonical.values()))
+
+    async with SessionReactions() as db_reactions:
+        pets, owners = await asyncio.gather(
+            pet_cache.get_pets(list({petId for _, petId in pending})),
+            post_owners.get_many(db_reactions, list({postId for postId, _ in pending})),
         )
-        db_posts.commit()
 
-        return {"message": "Like added successfully"}
+        valid = []
+        for key in pending:
+            postId, petId = key
+            pet = pets.get(petId)
+            if not pet or pet["responsibleId"] != str(responsibleId).lower():
+                results[key] = (403, "Responsible does not own the pet trying to like")
+            elif not owners.get(postId):
+                results[key] = (404, "Post not found")
+            elif not owners[postId]["ownerResponsibleId"]:
+                results[key] = (404, "Owner pet not found")
+            else:
+                valid.append(key)
+
+        inserted = set()
+        if valid:
+            now = datetime.utcnow()
+            # Single multi-row INSERT; duplicates are skipped by the (postId, petId) unique constraint
+            rows = (await db_reactions.execute(
+                insert(Like)
+                .values([{"postId": postId, "petId": petId, "createdAt": now} for postId, petId in valid])
+                .on_conflict_do_nothing(index_elements=[Like.postId, Like.petId])
+                .returning(Like.postId, Like.petId)
+            )).all()
+            inserted = {(str(postId), str(petId)) for postId, petId in rows}
+
+            for key in valid:
+                postId, petId = key
+                if key not in inserted:
+                    results[key] = (400, "Like already exists")
+                    continue
+                results[key] = (200, "Like added successfully")
+                db_reactions.add(_like_added_event(
+                    petId, postId, pets[petId]["name"], owners[postId], now
+                ))
+            await db_reactions.commit()
+
+    if inserted:
+        outbox_dispatcher.notify()
+        await asyncio.gather(
+            *(likes_flusher.record(postId, count) for postId, count in Counter(p for p, _ in inserted).items()),
+            *(record_pet_like(petId, postId, True) for postId, petId in inserted),
+            *(record_leaderboard_like(postId, count, now) for postId, count in Counter(p for p, _ in inserted).items()),
+        )
 
-    finally:
-        db_reactions.close()
-        db_posts.close()
-        db_pets.close()
+    response = []
+    for op in operations:
+        key = (op.postId, op.petId)
+        status_code, detail = results[canonical.get(key, key)]
+        response.append({"postId": op.postId, "petId": op.petId, "status": status_code, "detail": detail})
+    return response
+
+
+async def invalidate_post_owners_controller(postIds: list, petIds: list) -> dict:
+    """
+    Invalida las proyecciones de dueño de los posts y de las mascotas indicadas
+    (post borrado, mascota renombrada o con otro responsable). Las mascotas también se
+    invalidan en la caché de mascotas.
+    """
+    invalidated = await post_owners.invalidate(postIds, petIds)
+    await asyncio.gather(*(pet_cache.invalidate(petId) for petId in petIds))
+    return {"invalidated": invalidated}
@@ -1,12 +1,91 @@
-import os, jwt
+import os, jwt, time, hashlib, hmac, threading
+from collections import OrderedDict
 from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials, APIKeyHeader
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.serialization import load_pem_public_key
 from dotenv import load_dotenv
+from utils.metrics import record_cache_lookup
 
 load_dotenv()
 JWT_SECRET = os.getenv("JWT_SECRET")
+# Optional asymmetric verification: PEM public key of the token issuer (RS256/ES256)
+JWT_PUBLIC_KEY_PATH = os.getenv("JWT_PUBLIC_KEY_PATH")
+JWT_CACHE_MAX_SIZE = int(os.getenv("JWT_CACHE_MAX_SIZE", 10000))
+# Upper bound for caching tokens without "exp" (and for picking up key rotations)
+JWT_CACHE_MAX_TTL = float(os.getenv("JWT_CACHE_MAX_TTL", 300))
+# Shared secret of the internal endpoints (X-Internal-Token); unset disables them
+INTERNAL_SERVICE_TOKEN = os.getenv("INTERNAL_SERVICE_TOKEN")
+
+
+def _load_verification_key():
+    if not JWT_PUBLIC_KEY_PATH:
+        return JWT_SECRET
+    with open(JWT_PUBLIC_KEY_PATH) as f:
+        return f.read()
+
+
+def _key_algorithm(key) -> str:
+    """Único algoritmo que admite la clave cargada: HS256 con JWT_SECRET, RS256 o ES256 según el PEM."""
+    if not JWT_PUBLIC_KEY_PATH:
+        return "HS256"
+    public_key = load_pem_public_key(key.encode())
+    return "ES256" if isinstance(public_key, ec.EllipticCurvePublicKey) else "RS256"
+
+
+JWT_VERIFICATION_KEY = _load_verification_key()
+# Defaults to the algorithm of the loaded key: a token signed with another one is rejected (403)
+JWT_ALGORITHMS = [
+    algorithm.strip()
+    for algorithm in os.getenv("JWT_ALGORITHMS", _key_algorithm(JWT_VERIFICATION_KEY)).split(",")
+]
 
 bearer_scheme = HTTPBearer()
+internal_token_scheme = APIKeyHeader(name="X-Internal-Token", auto_error=False)
+
+
+class TokenCache:
+    """
+    Caché LRU acotada de tokens ya verificados: hash del token -> (userId, expiración).
+    Las entradas caducan con el "exp" del token (o JWT_CACHE_MAX_TTL si es antes).
+    """
+
+    def __init__(self, max_size: int, max_ttl: float):
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self._entries = OrderedDict()
+        # Sync dependencies run in the threadpool
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str):
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, token: str, responsible_id: str, exp=None):
+        expires_at = time.time() + self.max_ttl
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (responsible_id, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+token_cache = TokenCache(JWT_CACHE_MAX_SIZE, JWT_CACHE_MAX_TTL)
 
 def get_current_responsible(
     cred: HTTPAuthorizationCredentials = Depends(bearer_scheme)
@@ -14,13 +93,20 @@ def get_current_responsible(
     """
     Validates the Bearer token, decodes the JWT, and returns the responsibleId (extracted from userId).
     Throws 401/403 errors if the token is missing, invalid, or expired..
+    Verified tokens are cached until their expiration, so repeated requests skip jwt.decode.
     """
     token = cred.credentials 
+    responsible_id = token_cache.get(token)
+    record_cache_lookup("jwt", responsible_id is not None)
+    if responsible_id is not None:
+        return responsible_id
+
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=["HS256"])
+        payload = jwt.decode(token, JWT_VERIFICATION_KEY, algorithms=JWT_ALGORITHMS)
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
-    except jwt.InvalidTokenError:
+    except jwt.PyJWTError:
+        # InvalidTokenError, and InvalidKeyError when the token's alg does not match the key type
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid token")
 
     responsible_id = payload.get("userId") 
@@ -29,4 +115,17 @@ def get_current_responsible(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No userId in token"
         )
+    token_cache.set(token, responsible_id, payload.get("exp"))
     return responsible_id
+
+
+def require_internal_token(token: str = Depends(internal_token_scheme)):
+    """
+    Protects the service-to-service endpoints (Posts and Pets services): requires the
+    X-Internal-Token header to match INTERNAL_SERVICE_TOKEN. Without a configured token
+    the endpoints are disabled.
+    """
+    if not INTERNAL_SERVICE_TOKEN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Internal endpoints are disabled")
+    if not token or not hmac.compare_digest(token, INTERNAL_SERVICE_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid internal token")
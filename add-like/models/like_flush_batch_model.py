@@ -0,0 +1,9 @@
+from sqlalchemy import Column, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from config.db import Base
+
+class LikeFlushBatch(Base):
+    # Batches of Redis deltas already applied to Posts.likes (same database, same transaction)
+    __tablename__ = "LikeFlushBatches"
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    appliedAt = Column(DateTime, nullable=False)
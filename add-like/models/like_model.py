@@ -1,11 +1,20 @@
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, Index, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from config.db import Base
 
 class Like(Base):
     __tablename__ = "Likes"
+    __table_args__ = (
+        # One like per (post, pet); also serves as the composite lookup index
+        UniqueConstraint("postId", "petId", name="uq_likes_post_pet"),
+        # Keyset pagination of a post's likes ordered by (createdAt, id)
+        Index("ix_likes_post_created_id", "postId", "createdAt", "id"),
+        # Per-pet lookups ("which of these posts has this pet liked?")
+        Index("ix_likes_pet_post", "petId", "postId"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     postId = Column(UUID(as_uuid=True))
     petId = Column(UUID(as_uuid=True))
-    createdAt = Column(DateTime)
+    # NOT NULL: keyset pagination compares (createdAt, id), which never matches a NULL
+    createdAt = Column(DateTime, nullable=False, server_default=func.now())
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, Integer, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+import uuid
+from config.db import Base
+
+class LikeOutbox(Base):
+    __tablename__ = "LikeOutbox"
+    __table_args__ = (
+        # Dispatcher scans pending events that are due for (re)delivery
+        Index("ix_like_outbox_status_next_attempt", "status", "nextAttemptAt"),
+        # Retention purge of delivered/failed events by age
+        Index("ix_like_outbox_status_created", "status", "createdAt"),
+    )
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    eventType = Column(String, nullable=False)
+    payload = Column(JSONB, nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending | sending | delivered | failed
+    attempts = Column(Integer, nullable=False, default=0)
+    lastError = Column(String)
+    nextAttemptAt = Column(DateTime, nullable=False)
+    createdAt = Column(DateTime, nullable=False)
+    deliveredAt = Column(DateTime)
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID
+from config.db import Base
+
+class PostOwner(Base):
+    """Proyección local (Reactions DB) del dueño de cada post, para no leer Posts y Pets al dar like."""
+    __tablename__ = "PostOwners"
+    __table_args__ = (
+        # Invalidation of every post of a pet (rename, ownership change)
+        Index("ix_post_owners_owner_pet", "ownerPetId"),
+    )
+    postId = Column(UUID(as_uuid=True), primary_key=True)
+    ownerPetId = Column(UUID(as_uuid=True), nullable=False)
+    ownerPetName = Column(String)
+    ownerResponsibleId = Column(UUID(as_uuid=True), nullable=False)
+    refreshedAt = Column(DateTime, nullable=False)
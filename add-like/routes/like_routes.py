@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends, status
 from fastapi.security import HTTPBearer
-from schemas.like_schema import LikeRequest, LikeResponse
-from controllers.like_controller import add_like_controller
-from middlewares.auth_middleware import get_current_responsible
+from schemas.like_schema import (
+    LikeRequest, LikeResponse, BulkLikeRequest, BulkLikeResponse,
+    PostOwnerInvalidationRequest, PostOwnerInvalidationResponse,
+)
+from controllers.like_controller import add_like_controller, add_likes_bulk_controller, invalidate_post_owners_controller
+from middlewares.auth_middleware import get_current_responsible, require_internal_token
 
 router = APIRouter()
 
@@ -31,10 +34,11 @@ Permite registrar un Like.
         403: {"description": "Responsible does not own the pet"},
         404: {"description": "Publicación no encontrada"},
         401: {"description": "Token missing or invalid"},
+        422: {"description": "postId o petId no es un UUID válido"},
     },
     dependencies=[Depends(security_scheme)],
 )
-def add_like(
+async def add_like(
     request_data: LikeRequest,
     responsible_id: str = Depends(get_current_responsible)
 ):
@@ -43,8 +47,55 @@ def add_like(
     - Devuelve 401 si el token es inválido.
     - Devuelve 403 si la mascota no pertenece al responsable autenticado.
     """
-    return add_like_controller(
+    return await add_like_controller(
         request_data.postId,
         responsible_id,
         request_data.petId
     )
+
+
+@router.post(
+    "/likes/add/bulk",
+    tags=["Likes"],
+    summary="Añadir varios Likes en una sola petición",
+    description="""
+Registra hasta 500 Likes en una sola transacción (importaciones, clientes móviles sincronizando offline).
+Devuelve un resultado por operación, en el mismo orden, con el código que tendría la petición individual
+(200 añadido, 400 ya existe, 403 la mascota no pertenece al responsable, 404 publicación no encontrada).
+""",
+    response_model=BulkLikeResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Operaciones procesadas (ver el resultado de cada una)"},
+        401: {"description": "Token missing or invalid"},
+        422: {"description": "Petición inválida o demasiadas operaciones"},
+    },
+    dependencies=[Depends(security_scheme)],
+)
+async def add_likes_bulk(
+    request_data: BulkLikeRequest,
+    responsible_id: str = Depends(get_current_responsible)
+):
+    return {"results": await add_likes_bulk_controller(request_data.operations, responsible_id)}
+
+
+@router.post(
+    "/likes/owners/invalidate",
+    tags=["Internal"],
+    summary="Invalidar la proyección de dueños de posts",
+    description="""
+Hook para los servicios de Posts y Pets: borra la proyección postId -> dueño (tabla PostOwners)
+de los posts indicados y de todos los posts de las mascotas indicadas, que se vuelve a cargar en
+el siguiente like. Llamar al borrar un post o al cambiar el nombre o el responsable de una mascota.
+También se puede publicar el postId en el canal Redis `posts:invalidate` o el petId en `pets:invalidate`.
+Requiere la cabecera `X-Internal-Token` con el valor de `INTERNAL_SERVICE_TOKEN`.
+""",
+    response_model=PostOwnerInvalidationResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        403: {"description": "Token interno ausente o inválido"},
+    },
+    dependencies=[Depends(require_internal_token)],
+)
+async def invalidate_post_owners(request_data: PostOwnerInvalidationRequest):
+    return await invalidate_post_owners_controller(request_data.postIds, request_data.petIds)
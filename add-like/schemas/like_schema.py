@@ -1,8 +1,31 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import List
+
+# Maximum operations accepted by one bulk request
+BULK_MAX_OPERATIONS = 500
 
 class LikeRequest(BaseModel):
     postId: str
     petId: str
 
 class LikeResponse(BaseModel):
-    message: str
\ No newline at end of file
+    message: str
+
+class BulkLikeRequest(BaseModel):
+    operations: List[LikeRequest] = Field(..., min_length=1, max_length=BULK_MAX_OPERATIONS)
+
+class BulkLikeResult(BaseModel):
+    postId: str
+    petId: str
+    status: int
+    detail: str
+
+class BulkLikeResponse(BaseModel):
+    results: List[BulkLikeResult]
+
+class PostOwnerInvalidationRequest(BaseModel):
+    postIds: List[str] = Field(default_factory=list, max_length=BULK_MAX_OPERATIONS)
+    petIds: List[str] = Field(default_factory=list, max_length=BULK_MAX_OPERATIONS)
+
+class PostOwnerInvalidationResponse(BaseModel):
+    invalidated: int
@@ -0,0 +1,86 @@
+import os
+import sys
+import time
+import jwt
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from middlewares import auth_middleware
+from middlewares.auth_middleware import TokenCache, get_current_responsible
+
+
+def _credentials(token):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def test_token_cache_honours_expiration_and_size():
+    cache = TokenCache(max_size=2, max_ttl=60)
+    cache.set("a", "user-a", exp=time.time() - 1)
+    assert cache.get("a") is None
+    cache.set("b", "user-b")
+    cache.set("c", "user-c")
+    cache.set("d", "user-d")
+    assert cache.get("b") is None
+    assert cache.get("d") == "user-d"
+
+
+def test_verified_token_is_cached(monkeypatch):
+    monkeypatch.setattr(auth_middleware, "JWT_VERIFICATION_KEY", "secret")
+    monkeypatch.setattr(auth_middleware, "JWT_ALGORITHMS", ["HS256"])
+    monkeypatch.setattr(auth_middleware, "token_cache", TokenCache(10, 60))
+    token = jwt.encode({"userId": "user-1", "exp": int(time.time()) + 60}, "secret", algorithm="HS256")
+    assert get_current_responsible(_credentials(token)) == "user-1"
+
+    def fail_decode(*args, **kwargs):
+        raise AssertionError("cached tokens must not be decoded again")
+
+    monkeypatch.setattr(auth_middleware.jwt, "decode", fail_decode)
+    assert get_current_responsible(_credentials(token)) == "user-1"
+
+
+def test_invalid_token_is_rejected(monkeypatch):
+    monkeypatch.setattr(auth_middleware, "JWT_VERIFICATION_KEY", "secret")
+    monkeypatch.setattr(auth_middleware, "JWT_ALGORITHMS", ["HS256"])
+    token = jwt.encode({"userId": "user-1"}, "other-secret", algorithm="HS256")
+    with pytest.raises(HTTPException) as exc:
+        get_current_responsible(_credentials(token))
+    assert exc.value.status_code == 403
+
+
+def test_token_signed_for_another_key_type_is_rejected(monkeypatch):
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+    rsa_public_pem = rsa.generate_private_key(public_exponent=65537, key_size=2048).public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    monkeypatch.setattr(auth_middleware, "JWT_PUBLIC_KEY_PATH", "issuer.pem")
+    assert auth_middleware._key_algorithm(rsa_public_pem) == "RS256"
+
+    # Even with both algorithms configured, an ES256 token against an RSA key is a 403, not a 500
+    monkeypatch.setattr(auth_middleware, "JWT_VERIFICATION_KEY", rsa_public_pem)
+    monkeypatch.setattr(auth_middleware, "JWT_ALGORITHMS", ["RS256", "ES256"])
+    monkeypatch.setattr(auth_middleware, "token_cache", TokenCache(10, 60))
+    token = jwt.encode({"userId": "user-1"}, ec.generate_private_key(ec.SECP256R1()), algorithm="ES256")
+    with pytest.raises(HTTPException) as exc:
+        get_current_responsible(_credentials(token))
+    assert exc.value.status_code == 403
+
+
+def test_internal_endpoints_require_the_configured_token(monkeypatch):
+    monkeypatch.setattr(auth_middleware, "INTERNAL_SERVICE_TOKEN", None)
+    with pytest.raises(HTTPException) as exc:
+        auth_middleware.require_internal_token("anything")
+    assert exc.value.status_code == 403
+
+    monkeypatch.setattr(auth_middleware, "INTERNAL_SERVICE_TOKEN", "internal-secret")
+    for token in (None, "wrong"):
+        with pytest.raises(HTTPException) as exc:
+            auth_middleware.require_internal_token(token)
+        assert exc.value.status_code == 403
+    auth_middleware.require_internal_token("internal-secret")
@@ -0,0 +1,28 @@
+import os
+import sys
+import asyncio
+from datetime import datetime
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from utils import leaderboard
+
+POST = "11111111-1111-1111-1111-11111111aaaa"
+
+
+def test_post_is_stored_under_its_canonical_id(monkeypatch):
+    calls = []
+
+    async def update(keys, args):
+        calls.append((keys, args))
+
+    monkeypatch.setattr(leaderboard, "_update_leaderboard", update)
+    now = datetime.utcnow()
+    asyncio.run(leaderboard.record_leaderboard_like(POST.upper(), 1, now))
+    asyncio.run(leaderboard.record_leaderboard_like(POST.replace("-", ""), -1, now))
+    asyncio.run(leaderboard.record_leaderboard_like("not-a-uuid", 1, now))
+
+    assert [args[0] for _, args in calls] == [POST, POST]
+    assert calls[0][0][3] == leaderboard.TRENDING_BUCKET_KEY.format(bucket=leaderboard.bucket_of(now))
@@ -0,0 +1,211 @@
+import os
+import re
+import sys
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+from controllers import like_controller
+
+POST = "11111111-1111-1111-1111-11111111aaaa"
+PET = "33333333-3333-3333-3333-33333333bbbb"
+RESPONSIBLE = "44444444-4444-4444-4444-444444444444"
+
+
+class _Result:
+    def scalar_one_or_none(self):
+        return 1
+
+
+class _Session:
+    def __init__(self):
+        self.statements = []
+        self.added = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return _Result()
+
+    def add(self, row):
+        self.added.append(row)
+
+    async def commit(self):
+        pass
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    calls = []
+    session = _Session()
+
+    async def get_pet(petId):
+        calls.append(("pet", petId))
+        return {"responsibleId": RESPONSIBLE, "name": "Luna"}
+
+    async def get_owner(db_reactions, postId):
+        calls.append(("owner", postId))
+        return {"ownerPetId": PET, "ownerPetName": "Firulais", "ownerResponsibleId": RESPONSIBLE}
+
+    async def record(*args):
+        calls.append(args)
+
+    monkeypatch.setattr(like_controller, "SessionReactions", lambda: session)
+    monkeypatch.setattr(like_controller.pet_cache, "get_pet", get_pet)
+    monkeypatch.setattr(like_controller.post_owners, "get", get_owner)
+    monkeypatch.setattr(like_controller.likes_flusher, "record", record)
+    monkeypatch.setattr(like_controller, "record_pet_like", record)
+    monkeypatch.setattr(like_controller, "record_leaderboard_like", record)
+    monkeypatch.setattr(like_controller.outbox_dispatcher, "notify", lambda: None)
+    return calls, session
+
+
+def test_uppercase_ids_are_canonicalized_for_redis_and_the_insert(recorded):
+    calls, session = recorded
+
+    asyncio.run(like_controller.add_like_controller(POST.upper(), RESPONSIBLE, PET.upper().replace("-", "")))
+
+    assert ("pet", PET) in calls and ("owner", POST) in calls
+    assert (POST, 1) in calls
+    assert (PET, POST, True) in calls
+    assert any(call[:2] == (POST, 1) and len(call) == 3 for call in calls)
+    assert session.statements[0].compile().params["postId"] == POST
+
+
+def test_malformed_id_is_rejected_before_any_lookup(recorded):
+    calls, _ = recorded
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(like_controller.add_like_controller("not-a-uuid", RESPONSIBLE, PET))
+
+    assert error.value.status_code == 422
+    assert calls == []
+
+
+_UUID = re.compile(r"'([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})'")
+
+
+def _id_pairs(statement) -> list:
+    """Pares (postId, petId) que escribe la sentencia, leídos del SQL que se enviaría a Postgres."""
+    sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    ids = _UUID.findall(sql)
+    return list(zip(ids[0::2], ids[1::2]))
+
+
+class _LikesTable:
+    """Sesión falsa sobre un conjunto de likes (postId, petId): el INSERT masivo omite los existentes."""
+
+    def __init__(self, likes=()):
+        self.likes = set(likes)
+        self.added = []
+        self.commits = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        rows = []
+        for key in _id_pairs(statement):
+            if key not in self.likes:
+                self.likes.add(key)
+                rows.append(key)
+        return SimpleNamespace(all=lambda: rows)
+
+    def add(self, row):
+        self.added.append(row)
+
+    async def commit(self):
+        self.commits += 1
+
+
+OTHER_PET = "55555555-5555-5555-5555-555555555555"
+STRANGER_PET = "66666666-6666-6666-6666-666666666666"
+MISSING_POST = "77777777-7777-7777-7777-777777777777"
+ORPHAN_POST = "88888888-8888-8888-8888-888888888888"
+LIKED_POST = "99999999-9999-9999-9999-999999999999"
+
+
+def _bulk(monkeypatch, table):
+    calls = []
+
+    async def get_pets(petIds):
+        return {
+            petId: {"responsibleId": "someone-else" if petId == STRANGER_PET else RESPONSIBLE, "name": "Luna"}
+            for petId in petIds
+        }
+
+    async def get_owners(db_reactions, postIds):
+        owners = {postId: {"ownerPetId": PET, "ownerPetName": "Firulais", "ownerResponsibleId": RESPONSIBLE} for postId in postIds}
+        owners[ORPHAN_POST] = {"ownerPetId": PET, "ownerPetName": None, "ownerResponsibleId": None}
+        owners.pop(MISSING_POST, None)
+        return owners
+
+    async def record(*args):
+        calls.append(args)
+
+    monkeypatch.setattr(like_controller, "SessionReactions", lambda: table)
+    monkeypatch.setattr(like_controller.pet_cache, "get_pets", get_pets)
+    monkeypatch.setattr(like_controller.post_owners, "get_many", get_owners)
+    monkeypatch.setattr(like_controller.likes_flusher, "record", record)
+    monkeypatch.setattr(like_controller, "record_pet_like", record)
+    monkeypatch.setattr(like_controller, "record_leaderboard_like", record)
+    monkeypatch.setattr(like_controller.outbox_dispatcher, "notify", lambda: None)
+    return calls
+
+
+def test_bulk_add_maps_each_operation_to_its_status(monkeypatch):
+    table = _LikesTable(likes={(LIKED_POST, PET)})
+    calls = _bulk(monkeypatch, table)
+    operations = [
+        SimpleNamespace(postId=POST, petId=PET),
+        SimpleNamespace(postId=POST.upper(), petId=OTHER_PET),
+        SimpleNamespace(postId=POST, petId=PET),  # same operation twice in the request
+        SimpleNamespace(postId=POST, petId=OTHER_PET.upper()),  # and spelled differently
+        SimpleNamespace(postId=LIKED_POST, petId=PET),
+        SimpleNamespace(postId=POST, petId=STRANGER_PET),
+        SimpleNamespace(postId=MISSING_POST, petId=PET),
+        SimpleNamespace(postId=ORPHAN_POST, petId=PET),
+        SimpleNamespace(postId="not-a-uuid", petId=PET),
+    ]
+
+    results = asyncio.run(like_controller.add_likes_bulk_controller(operations, RESPONSIBLE))
+
+    assert [result["status"] for result in results] == [200, 200, 200, 200, 400, 403, 404, 404, 422]
+    assert results[1]["postId"] == POST.upper()
+    assert table.commits == 1 and len(table.added) == 2
+    # One counter/leaderboard update per post, one index update per inserted like
+    assert (POST, 2) in calls
+    assert sorted(call for call in calls if len(call) == 3 and call[2] is True) == [(PET, POST, True), (OTHER_PET, POST, True)]
+    assert [call for call in calls if len(call) == 3 and call[2] is not True][0][:2] == (POST, 2)
+
+
+def test_bulk_like_of_repeated_operations_counts_each_like_once(monkeypatch):
+    pets = ["33333333-3333-3333-3333-33333333333%d" % i for i in range(3)]
+    table = _LikesTable()
+    calls = _bulk(monkeypatch, table)
+    operations = [SimpleNamespace(postId=POST, petId=petId) for petId in pets]
+    operations += [SimpleNamespace(postId=POST.upper(), petId=petId) for petId in pets[:2]]
+
+    results = asyncio.run(like_controller.add_likes_bulk_controller(operations, RESPONSIBLE))
+
+    assert [result["status"] for result in results] == [200] * 5
+    assert table.likes == {(POST, petId) for petId in pets}
+    assert len(table.added) == 3
+    # Counter (postId, delta) and leaderboard (postId, delta, liked_at) get +3 for the post, not +5
+    assert sum(call[1] for call in calls if call[0] == POST and len(call) == 2) == 3
+    assert sum(call[1] for call in calls if call[0] == POST and len(call) == 3) == 3
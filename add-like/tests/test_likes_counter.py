@@ -0,0 +1,191 @@
+import os
+import sys
+from uuid import uuid4
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from sqlalchemy.dialects import postgresql
+from utils.likes_counter import build_bulk_likes_update
+
+
+def test_bulk_update_is_a_single_statement():
+    deltas = {str(uuid4()): 3, str(uuid4()): -1, str(uuid4()): 1}
+    sql = str(build_bulk_likes_update(deltas).compile(dialect=postgresql.dialect()))
+    assert sql.count("UPDATE") == 1
+    assert "FROM (VALUES" in sql
+    assert sql.count("::UUID") == len(deltas)
+
+
+def test_only_abandoned_flushes_are_taken_over(monkeypatch):
+    import asyncio
+    import time
+    from utils import likes_counter
+
+    taken = []
+
+    class _Redis:
+        async def zrangebyscore(self, key, minimum, maximum):
+            claims = {"posts:likes:pending:dead": time.time() - 300, "posts:likes:pending:live": time.time()}
+            return [name for name, claimed_at in claims.items() if claimed_at <= maximum]
+
+        async def hgetall(self, key):
+            return {"post": "2"}
+
+    async def take_over(keys, args):
+        taken.append(args[0])
+        return 1
+
+    monkeypatch.setattr(likes_counter, "redis_client", _Redis())
+    monkeypatch.setattr(likes_counter, "_take_over_deltas", take_over)
+    batches = asyncio.run(likes_counter.LikesFlusher()._take_orphaned_deltas())
+    assert taken == ["posts:likes:pending:dead"]
+    assert batches == {"posts:likes:pending:dead": {"post": 2}}
+
+
+class _PostsSession:
+    """Sesión falsa de Posts: LikeFlushBatches como conjunto de ids y registro de las sentencias."""
+
+    def __init__(self, applied_batches=()):
+        self.applied_batches = set(applied_batches)
+        self.statements = []
+        self.commits = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, execution_options=None):
+        from types import SimpleNamespace
+        self.statements.append(statement)
+        rows = []
+        if statement.is_insert:
+            ids = [value for name, value in statement.compile().params.items() if name.startswith("id")]
+            rows = [batch_id for batch_id in ids if batch_id not in self.applied_batches]
+            self.applied_batches.update(rows)
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: rows))
+
+    async def commit(self):
+        self.commits += 1
+
+
+def _flush_with(monkeypatch, session, batches):
+    import asyncio
+    from utils import likes_counter
+
+    acked = []
+
+    class _Pipeline:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        def delete(self, key):
+            acked.append(key)
+
+        def zrem(self, *args):
+            pass
+
+        def incr(self, key):
+            pass
+
+        async def execute(self):
+            pass
+
+    class _Redis:
+        def pipeline(self, transaction=True):
+            return _Pipeline()
+
+    async def take_orphaned():
+        return dict(batches)
+
+    async def take_new():
+        return None, {}
+
+    flusher = likes_counter.LikesFlusher()
+    monkeypatch.setattr(likes_counter, "LIKES_FLUSH_BACKEND", "redis")
+    monkeypatch.setattr(likes_counter, "redis_client", _Redis())
+    monkeypatch.setattr(likes_counter, "SessionPost", lambda: session)
+    monkeypatch.setattr(flusher, "_take_orphaned_deltas", take_orphaned)
+    monkeypatch.setattr(flusher, "_take_redis_deltas", take_new)
+    return asyncio.run(flusher.flush()), acked
+
+
+def test_a_batch_already_applied_is_not_applied_again(monkeypatch):
+    batch_id = uuid4()
+    key = f"posts:likes:pending:{batch_id}"
+    session = _PostsSession(applied_batches={batch_id})
+
+    updated, acked = _flush_with(monkeypatch, session, {key: {str(uuid4()): 3}})
+
+    assert updated == 0
+    assert not any(statement.is_update for statement in session.statements)
+    assert acked == [key] and session.commits == 1
+
+
+def test_new_batch_locks_posts_in_id_order_before_updating(monkeypatch):
+    postIds = sorted(str(uuid4()) for _ in range(3))
+    key = f"posts:likes:pending:{uuid4()}"
+    session = _PostsSession()
+
+    updated, acked = _flush_with(monkeypatch, session, {key: {postId: 1 for postId in reversed(postIds)}})
+
+    assert updated == 3 and acked == [key]
+    lock = next(statement for statement in session.statements if statement.is_select)
+    update = next(statement for statement in session.statements if statement.is_update)
+    assert session.statements.index(lock) < session.statements.index(update)
+    assert "FOR UPDATE" in str(lock.compile(dialect=postgresql.dialect()))
+    sql = str(update.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    assert [sql.index(postId) for postId in postIds] == sorted(sql.index(postId) for postId in postIds)
+
+
+def test_cached_page_is_kept_unless_the_change_can_alter_it(monkeypatch):
+    import asyncio
+    import orjson
+    import pytest
+    import redis.asyncio as redis
+    from config.redis_client import redis_host, redis_port
+    from utils import likes_counter
+
+    async def scenario():
+        client = redis.Redis(host=redis_host, port=redis_port, decode_responses=True)
+        try:
+            await client.ping()
+        except Exception as e:
+            pytest.skip(f"Redis not available: {e}")
+        monkeypatch.setattr(likes_counter, "_apply_delta", client.register_script(likes_counter._APPLY_DELTA_SCRIPT))
+        monkeypatch.setattr(likes_counter, "LIKES_FLUSH_BACKEND", "memory")
+        flusher = likes_counter.LikesFlusher()
+
+        popular, small = str(uuid4()), str(uuid4())
+        page = [{"likeId": str(uuid4()), "postId": popular, "petId": str(uuid4()), "createdAt": "2024-01-01T00:00:00"}
+                for _ in range(likes_counter.LIKES_PAGE_ROWS)]
+        keys = {}
+        for postId, count in ((popular, 120), (small, 10)):
+            keys[postId] = (likes_counter.LIKES_COUNT_KEY.format(postId=postId), likes_counter.LIKES_PAGE_KEY.format(postId=postId))
+            await client.set(keys[postId][0], count, ex=60)
+            await client.set(keys[postId][1], orjson.dumps(page), ex=60)
+        try:
+            # A like on a post with more than a page of likes lands after the cached page
+            await flusher.record(popular, 1)
+            assert await client.get(keys[popular][0]) == "121"
+            assert await client.exists(keys[popular][1])
+            # Removing a like that is not in the page keeps it too
+            await flusher.record(popular, -1, [str(uuid4())])
+            assert await client.exists(keys[popular][1])
+            # Removing a like that is in the page drops it
+            await flusher.record(popular, -1, [page[3]["petId"]])
+            assert not await client.exists(keys[popular][1])
+            # While the post fits in a page, every like changes it
+            await flusher.record(small, 1)
+            assert not await client.exists(keys[small][1])
+        finally:
+            await client.delete(*keys[popular], *keys[small])
+            await client.aclose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,42 @@
+import os
+import sys
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from prometheus_client import REGISTRY
+from utils.metrics import MetricsMiddleware, record_cache_lookup, metrics_response
+
+
+def _sample(name, labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_requests_are_labelled_with_the_route_template():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/likes/{postId}")
+    def get_likes(postId: str):
+        return {"postId": postId}
+
+    labels = {"method": "GET", "route": "/likes/{postId}", "status": "200"}
+    before = _sample("http_request_duration_seconds_count", labels)
+    client = TestClient(app)
+    client.get("/likes/a")
+    client.get("/likes/b")
+    client.get("/missing")
+    assert _sample("http_request_duration_seconds_count", labels) == before + 2
+    assert _sample("http_request_duration_seconds_count", {"method": "GET", "route": "unmatched", "status": "404"}) >= 1
+
+
+def test_cache_lookups_are_exported():
+    record_cache_lookup("test_cache", True, 3)
+    record_cache_lookup("test_cache", False)
+    record_cache_lookup("test_cache", False, 0)
+    body = metrics_response().body.decode()
+    assert 'cache_lookups_total{cache="test_cache",result="hit"} 3.0' in body
+    assert 'cache_lookups_total{cache="test_cache",result="miss"} 1.0' in body
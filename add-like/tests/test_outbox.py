@@ -0,0 +1,19 @@
+import os
+import sys
+from datetime import timedelta
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from utils.outbox_dispatcher import retry_delay, OUTBOX_BACKOFF_BASE, OUTBOX_BACKOFF_MAX
+
+
+def test_retry_delay_doubles_per_attempt():
+    assert retry_delay(1) == timedelta(seconds=OUTBOX_BACKOFF_BASE)
+    assert retry_delay(2) == timedelta(seconds=OUTBOX_BACKOFF_BASE * 2)
+    assert retry_delay(3) == timedelta(seconds=OUTBOX_BACKOFF_BASE * 4)
+
+
+def test_retry_delay_is_capped():
+    assert retry_delay(100) == timedelta(seconds=OUTBOX_BACKOFF_MAX)
@@ -0,0 +1,25 @@
+import os
+import sys
+import asyncio
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from utils.pet_cache import PetCache
+
+
+def test_local_hits_and_invalid_ids_skip_redis_and_db(monkeypatch):
+    from utils import pet_cache as pet_cache_module
+
+    async def fail_mget(*args, **kwargs):
+        raise AssertionError("Redis should not be queried")
+
+    monkeypatch.setattr(pet_cache_module.redis_client, "mget", fail_mget)
+    cache = PetCache()
+    pet_id = "11111111-1111-1111-1111-111111111111"
+    cache._set_local(pet_id, {"responsibleId": "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa", "name": "Firulais"})
+
+    pets = asyncio.run(cache.get_pets([pet_id.upper(), "not-a-uuid"]))
+    assert pets[pet_id.upper()]["name"] == "Firulais"
+    assert pets["not-a-uuid"] is None
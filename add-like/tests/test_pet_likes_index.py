@@ -0,0 +1,26 @@
+import os
+import sys
+import asyncio
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from utils import pet_likes_index
+
+POST = "11111111-1111-1111-1111-11111111aaaa"
+PET = "33333333-3333-3333-3333-33333333bbbb"
+
+
+def test_like_and_unlike_use_the_same_canonical_member(monkeypatch):
+    calls = []
+
+    async def update(keys, args):
+        calls.append((keys, args))
+
+    monkeypatch.setattr(pet_likes_index, "_update_pet_likes", update)
+    asyncio.run(pet_likes_index.record_pet_like(PET.upper(), POST.upper(), True))
+    asyncio.run(pet_likes_index.record_pet_like(PET, POST.replace("-", ""), False))
+
+    assert calls[0][0][0] == calls[1][0][0] == pet_likes_index.PET_LIKED_POSTS_KEY.format(petId=PET)
+    assert [args[0] for _, args in calls] == [POST, POST]
@@ -0,0 +1,52 @@
+import os
+import sys
+import asyncio
+import uuid
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from utils.post_owners import PostOwnerSnapshots
+
+CACHED_POST = "11111111-1111-1111-1111-111111111111"
+NEW_POST = "22222222-2222-2222-2222-222222222222"
+OWNER_PET = "33333333-3333-3333-3333-333333333333"
+RESPONSIBLE = "44444444-4444-4444-4444-444444444444"
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class _Session:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def execute(self, statement):
+        return _Result(self.rows)
+
+
+def test_only_missing_snapshots_are_loaded_from_posts_and_pets():
+    snapshots = PostOwnerSnapshots()
+    loaded = []
+
+    async def fake_load(postIds):
+        loaded.extend(postIds)
+        return {NEW_POST: {"ownerPetId": OWNER_PET, "ownerPetName": "Luna", "ownerResponsibleId": RESPONSIBLE}}
+
+    snapshots._load = fake_load
+    session = _Session([(uuid.UUID(CACHED_POST), uuid.UUID(OWNER_PET), "Firulais", uuid.UUID(RESPONSIBLE))])
+
+    result = asyncio.run(snapshots.get_many(session, [CACHED_POST.upper(), NEW_POST, "not-a-uuid"]))
+
+    assert loaded == [NEW_POST]
+    assert result[CACHED_POST.upper()] == {
+        "ownerPetId": OWNER_PET, "ownerPetName": "Firulais", "ownerResponsibleId": RESPONSIBLE,
+    }
+    assert result[NEW_POST]["ownerPetName"] == "Luna"
+    assert result["not-a-uuid"] is None
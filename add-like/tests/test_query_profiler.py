@@ -0,0 +1,54 @@
+import os
+import sys
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from utils.query_profiler import QueryBudgetExceeded, QueryProfilerMiddleware, profile_queries, _instrument_engine
+
+
+class _SyncEngine:
+    # _instrument_engine listens on AsyncEngine.sync_engine
+    def __init__(self, engine):
+        self.sync_engine = engine
+
+
+def _app(engine, queries: int, mode: str):
+    app = FastAPI()
+    app.add_middleware(QueryProfilerMiddleware, budgets={"GET /posts/{postId}": 2}, enabled=True, mode=mode)
+
+    @app.get("/posts/{postId}")
+    def get_post(postId: str):
+        with engine.connect() as conn:
+            for _ in range(queries):
+                conn.execute(text("SELECT 1"))
+        return {"postId": postId}
+
+    return app
+
+
+def test_profile_counts_statements_per_database():
+    engine = create_engine("sqlite://")
+    _instrument_engine(_SyncEngine(engine), "test")
+    with profile_queries() as profile:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+    assert profile.count == 2
+    assert profile.by_database["test"] == 2
+
+
+def test_endpoint_over_budget_fails_in_raise_mode():
+    engine = create_engine("sqlite://")
+    _instrument_engine(_SyncEngine(engine), "test")
+
+    assert TestClient(_app(engine, 2, "raise")).get("/posts/a").status_code == 200
+    with pytest.raises(QueryBudgetExceeded, match=r"GET /posts/\{postId\} ejecutó 3 consultas \(presupuesto 2\)"):
+        TestClient(_app(engine, 3, "raise")).get("/posts/a")
+    # warn mode only logs
+    assert TestClient(_app(engine, 3, "warn")).get("/posts/a").status_code == 200
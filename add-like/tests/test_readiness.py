@@ -0,0 +1,51 @@
+import os
+import sys
+import asyncio
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from utils.readiness import ReadinessProbe
+
+
+def _probe(calls: list, failing: set = frozenset()):
+    probe = ReadinessProbe()
+
+    def check(name):
+        async def run():
+            calls.append(name)
+            if name in failing:
+                raise ConnectionError(f"{name} down")
+            return {"circuit": "closed"} if name == "notifier" else None
+        return run
+
+    probe.checks = {name: check(name) for name in ("postgres_pet", "redis")}
+    probe.optional_checks = {"notifier": check("notifier")}
+    return probe
+
+
+def test_results_are_cached_between_probes():
+    calls = []
+    probe = _probe(calls)
+
+    async def run():
+        first = await probe.check()
+        second = await probe.check()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first["status"] == "ready" and not first["cached"]
+    assert second["cached"] and second["checks"] == first["checks"]
+    assert first["checks"]["notifier"]["circuit"] == "closed"
+    assert sorted(calls) == ["notifier", "postgres_pet", "redis"]
+
+
+def test_optional_failures_degrade_and_required_failures_are_not_ready():
+    degraded = asyncio.run(_probe([], failing={"notifier"}).response())
+    assert degraded.status_code == 200
+    assert b'"status":"degraded"' in degraded.body
+
+    not_ready = asyncio.run(_probe([], failing={"redis"}).response())
+    assert not_ready.status_code == 503
+    assert b'"error":"redis down"' in not_ready.body
@@ -0,0 +1,78 @@
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from utils.webhook_utils import CircuitBreaker
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow_request()
+
+
+def test_breaker_half_open_after_reset_timeout():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == "half-open"
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_half_open_admits_a_single_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    breaker.opened_at -= 60  # reset timeout elapsed
+    assert breaker.state == "half-open"
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    breaker.opened_at -= 60
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.allow_request() and breaker.allow_request()
+
+
+def test_batch_is_short_circuited_while_the_probe_is_pending(monkeypatch):
+    import asyncio
+    from utils import webhook_utils
+
+    client = webhook_utils.WebhookClient()
+    client.breaker.record_failure()
+    client.breaker.failures = webhook_utils.WEBHOOK_BREAKER_FAILURES
+    client.breaker.opened_at = 0.0  # long ago: half-open
+    monkeypatch.setattr(webhook_utils, "WEBHOOK_NOTIFICATIONS_URL", "http://notifier.test/events")
+    monkeypatch.setattr(webhook_utils, "WEBHOOK_NOTIFICATIONS_BATCH_URL", None)
+    posted = []
+
+    class _Client:
+        async def post(self, url, json):
+            posted.append(json)
+            await asyncio.sleep(0)
+            return webhook_utils.httpx.Response(200, request=webhook_utils.httpx.Request("POST", url))
+
+    client._client = _Client()
+    results = asyncio.run(client.send_many([{"n": i} for i in range(5)]))
+
+    assert posted == [{"n": 0}]
+    assert results[0] is None
+    assert all(isinstance(result, webhook_utils.CircuitOpenError) for result in results[1:])
+    assert client.breaker.state == "closed"
@@ -0,0 +1,72 @@
+import os
+import uuid
+from datetime import datetime
+from dotenv import load_dotenv
+from config.redis_client import redis_client
+
+load_dotenv()
+
+# Same settings and keys get-likes uses for the top-liked and trending leaderboards
+TRENDING_BUCKET_SECONDS = int(os.getenv("TRENDING_BUCKET_SECONDS", 3600))
+TRENDING_WINDOW_BUCKETS = int(os.getenv("TRENDING_WINDOW_BUCKETS", 24))
+
+LEADERBOARD_READY_KEY = "leaderboard:likes:ready"
+LEADERBOARD_BUILD_KEY = "leaderboard:likes:build"
+TOP_LIKED_KEY = "leaderboard:likes:top"
+TRENDING_BUCKET_KEY = "leaderboard:likes:trending:{bucket}"
+
+_EPOCH = datetime(1970, 1, 1)
+
+# The sorted sets are only complete while the ready marker exists (get-likes rebuilds them
+# from the DB), so likes are applied only then. Otherwise the token of the rebuild in progress
+# is deleted, because its DB read may predate this like, and get-likes reads again.
+# Members that drop to 0 are removed.
+_UPDATE_LEADERBOARD_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    redis.call('DEL', KEYS[2])
+    return 0
+end
+for i = 3, #KEYS do
+    if tonumber(redis.call('ZINCRBY', KEYS[i], ARGV[2], ARGV[1])) <= 0 then
+        redis.call('ZREM', KEYS[i], ARGV[1])
+    end
+end
+if #KEYS > 3 then
+    redis.call('EXPIREAT', KEYS[4], ARGV[3])
+end
+return 1
+"""
+_update_leaderboard = redis_client.register_script(_UPDATE_LEADERBOARD_SCRIPT)
+
+
+def bucket_of(moment: datetime) -> int:
+    """Número del bucket de tendencias de un instante (UTC sin zona, como Likes.createdAt)."""
+    return int((moment - _EPOCH).total_seconds() // TRENDING_BUCKET_SECONDS)
+
+
+def bucket_expires_at(bucket: int) -> int:
+    """Un bucket se guarda mientras forma parte de la ventana de tendencias."""
+    return (bucket + TRENDING_WINDOW_BUCKETS + 1) * TRENDING_BUCKET_SECONDS
+
+
+async def record_leaderboard_like(postId, delta: int, liked_at: datetime):
+    """
+    Suma `delta` likes del post al ranking total y al bucket de tendencias de `liked_at`
+    (la fecha del like, también al quitarlo), si ese bucket sigue dentro de la ventana.
+    Si Redis falla, el ranking queda desviado hasta la siguiente reconstrucción.
+    """
+    try:
+        # One member per post: the sets are keyed by the canonical UUID
+        member = str(uuid.UUID(str(postId)))
+    except ValueError:
+        return
+    keys = [LEADERBOARD_READY_KEY, LEADERBOARD_BUILD_KEY, TOP_LIKED_KEY]
+    expires_at = 0
+    # Likes without createdAt only count in the all-time ranking
+    if liked_at is not None and bucket_of(liked_at) > bucket_of(datetime.utcnow()) - TRENDING_WINDOW_BUCKETS:
+        keys.append(TRENDING_BUCKET_KEY.format(bucket=bucket_of(liked_at)))
+        expires_at = bucket_expires_at(bucket_of(liked_at))
+    try:
+        await _update_leaderboard(keys=keys, args=[member, delta, expires_at])
+    except Exception as e:
+        print(f"[Leaderboard] No se pudo actualizar el ranking de likes: {str(e)}")
@@ -0,0 +1,213 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import select, update, delete, or_, and_
+from dotenv import load_dotenv
+from config.db import SessionReactions
+from models.outbox_model import LikeOutbox
+from utils.webhook_utils import webhook_client, CircuitOpenError, WEBHOOK_FLUSH_INTERVAL
+
+load_dotenv()
+
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", 1.0))
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", 50))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 10))
+OUTBOX_BACKOFF_BASE = float(os.getenv("OUTBOX_BACKOFF_BASE", 2.0))
+OUTBOX_BACKOFF_MAX = float(os.getenv("OUTBOX_BACKOFF_MAX", 300.0))
+# Claimed events are leased for this long; if the dispatcher dies while sending, they are sent again
+OUTBOX_CLAIM_TIMEOUT = float(os.getenv("OUTBOX_CLAIM_TIMEOUT", 120.0))
+# Delivered events are deleted after this many days, failed ones (kept for inspection) after the second
+OUTBOX_RETENTION_DAYS = float(os.getenv("OUTBOX_RETENTION_DAYS", 7))
+OUTBOX_FAILED_RETENTION_DAYS = float(os.getenv("OUTBOX_FAILED_RETENTION_DAYS", 30))
+OUTBOX_PURGE_INTERVAL = float(os.getenv("OUTBOX_PURGE_INTERVAL", 3600))
+# Rows per DELETE, so the purge never holds long locks
+OUTBOX_PURGE_BATCH_SIZE = 1000
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """
+    Backoff exponencial para el siguiente intento de entrega: base * 2^(intentos - 1), con tope.
+    """
+    return timedelta(seconds=min(OUTBOX_BACKOFF_BASE * 2 ** (attempts - 1), OUTBOX_BACKOFF_MAX))
+
+
+class OutboxDispatcher:
+    """
+    Tarea en segundo plano que envía los eventos pendientes de LikeOutbox al Notifications Service.
+    Varias réplicas pueden ejecutarla a la vez: las filas se reservan con FOR UPDATE SKIP LOCKED
+    y se marcan como "sending" en una transacción corta, antes de enviarlas.
+    También borra los eventos entregados y fallidos que superan su retención.
+    """
+
+    def __init__(self):
+        self._task = None
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._purged_at = 0.0
+
+    def notify(self):
+        """Despierta al dispatcher tras registrar un evento nuevo, sin esperar al siguiente sondeo."""
+        self._wakeup.set()
+
+    async def start(self):
+        if not webhook_client.enabled:
+            print("[Outbox] No se configuró la URL del WebHook. Los eventos quedarán pendientes.")
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+    async def _run(self):
+        while not self._stopping:
+            if time.monotonic() - self._purged_at >= OUTBOX_PURGE_INTERVAL:
+                self._purged_at = time.monotonic()
+                try:
+                    await self.purge()
+                except Exception as e:
+                    print(f"[Outbox] Error borrando eventos antiguos: {str(e)}")
+
+            dispatched = 0
+            # While the circuit is open the notifier is not contacted; events stay pending.
+            # (Checks the state only: the half-open probe is taken by the first send.)
+            if webhook_client.breaker.state != "open":
+                try:
+                    dispatched = await self.dispatch_pending()
+                except Exception as e:
+                    print(f"[Outbox] Error despachando eventos: {str(e)}")
+
+            # A full batch means there may be more pending events: keep draining
+            if dispatched >= OUTBOX_BATCH_SIZE:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=OUTBOX_POLL_INTERVAL)
+                # In batch mode, give concurrent likes a moment to coalesce into one POST
+                if webhook_client.batch_mode and not self._stopping:
+                    await asyncio.sleep(WEBHOOK_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _claim(self) -> list:
+        """
+        Reserva un lote de eventos (pendientes, o "sending" cuya reserva caducó) y lo marca como
+        "sending" hasta dentro de OUTBOX_CLAIM_TIMEOUT segundos, en su propia transacción.
+        """
+        now = datetime.utcnow()
+        due = (
+            select(LikeOutbox.id)
+            .where(
+                LikeOutbox.status.in_(["pending", "sending"]),
+                LikeOutbox.nextAttemptAt <= now
+            )
+            .order_by(LikeOutbox.createdAt)
+            .limit(OUTBOX_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        async with SessionReactions() as db_reactions:
+            events = (await db_reactions.execute(
+                update(LikeOutbox)
+                .where(LikeOutbox.id.in_(due.scalar_subquery()))
+                .values(status="sending", nextAttemptAt=now + timedelta(seconds=OUTBOX_CLAIM_TIMEOUT))
+                .returning(LikeOutbox.id, LikeOutbox.payload, LikeOutbox.attempts, LikeOutbox.createdAt)
+                .execution_options(synchronize_session=False)
+            )).all()
+            await db_reactions.commit()
+        return sorted(events, key=lambda event: event.createdAt)
+
+    async def dispatch_pending(self) -> int:
+        """
+        Envía un lote de eventos pendientes y registra el resultado de cada uno.
+        Ninguna transacción queda abierta durante el envío HTTP.
+        Devuelve el número de eventos procesados.
+        """
+        events = await self._claim()
+        if not events:
+            return 0
+
+        results = await webhook_client.send_many([event.payload for event in events])
+
+        now = datetime.utcnow()
+        delivered_ids = []
+        # Not attempted (circuit open): retried once the circuit closes
+        skipped_ids = []
+        failed = []
+        for event, result in zip(events, results):
+            if result is None:
+                delivered_ids.append(event.id)
+            elif isinstance(result, CircuitOpenError):
+                skipped_ids.append(event.id)
+            else:
+                attempts = event.attempts + 1
+                failed.append((event.id, {
+                    "attempts": attempts,
+                    "lastError": str(result)[:500],
+                    "status": "failed" if attempts >= OUTBOX_MAX_ATTEMPTS else "pending",
+                    "nextAttemptAt": now + retry_delay(attempts),
+                }))
+
+        async with SessionReactions() as db_reactions:
+            if delivered_ids:
+                await db_reactions.execute(
+                    update(LikeOutbox)
+                    .where(LikeOutbox.id.in_(delivered_ids))
+                    .values(status="delivered", deliveredAt=now)
+                    .execution_options(synchronize_session=False)
+                )
+            if skipped_ids:
+                await db_reactions.execute(
+                    update(LikeOutbox)
+                    .where(LikeOutbox.id.in_(skipped_ids))
+                    .values(status="pending", nextAttemptAt=now)
+                    .execution_options(synchronize_session=False)
+                )
+            for event_id, values in failed:
+                await db_reactions.execute(
+                    update(LikeOutbox)
+                    .where(LikeOutbox.id == event_id)
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+            await db_reactions.commit()
+        return len(events)
+
+    async def purge(self) -> int:
+        """
+        Borra, en lotes de OUTBOX_PURGE_BATCH_SIZE, los eventos entregados hace más de
+        OUTBOX_RETENTION_DAYS días y los fallidos hace más de OUTBOX_FAILED_RETENTION_DAYS.
+        Devuelve el número de filas borradas.
+        """
+        now = datetime.utcnow()
+        expired = or_(
+            and_(LikeOutbox.status == "delivered", LikeOutbox.createdAt < now - timedelta(days=OUTBOX_RETENTION_DAYS)),
+            and_(LikeOutbox.status == "failed", LikeOutbox.createdAt < now - timedelta(days=OUTBOX_FAILED_RETENTION_DAYS)),
+        )
+        purged = 0
+        while not self._stopping:
+            async with SessionReactions() as db_reactions:
+                result = await db_reactions.execute(
+                    delete(LikeOutbox).where(LikeOutbox.id.in_(
+                        select(LikeOutbox.id).where(expired)
+                        .limit(OUTBOX_PURGE_BATCH_SIZE)
+                        .with_for_update(skip_locked=True)
+                        .scalar_subquery()
+                    ))
+                )
+                await db_reactions.commit()
+            purged += result.rowcount
+            if result.rowcount < OUTBOX_PURGE_BATCH_SIZE:
+                break
+        if purged:
+            print(f"[Outbox] Eventos antiguos borrados: {purged}")
+        return purged
+
+
+outbox_dispatcher = OutboxDispatcher()
@@ -0,0 +1,42 @@
+import uuid
+from config.redis_client import redis_client
+
+# Same keys get-likes uses for its per-pet index of liked posts
+PET_LIKED_POSTS_KEY = "pet:{petId}:liked_posts"
+PET_LIKED_POSTS_BUILD_KEY = "pet:{petId}:liked_posts:build"
+
+# The set is only complete if it exists (get-likes builds it from the DB on demand), so it is
+# updated in place when present. When absent, any build in progress is cancelled because its
+# DB snapshot may predate this change.
+_UPDATE_PET_LIKES_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    if ARGV[2] == '1' then
+        redis.call('SADD', KEYS[1], ARGV[1])
+    else
+        redis.call('SREM', KEYS[1], ARGV[1])
+    end
+else
+    redis.call('DEL', KEYS[2])
+end
+return 1
+"""
+_update_pet_likes = redis_client.register_script(_UPDATE_PET_LIKES_SCRIPT)
+
+
+async def record_pet_like(petId, postId, liked: bool):
+    """
+    Mantiene el índice Redis de posts con like de la mascota que usa get-likes.
+    Si Redis falla, el índice puede quedar desactualizado hasta que expire (PET_LIKES_INDEX_TTL en get-likes).
+    """
+    try:
+        # get-likes builds the set with the canonical ids read from the DB
+        petId, postId = str(uuid.UUID(str(petId))), str(uuid.UUID(str(postId)))
+    except ValueError:
+        return
+    try:
+        await _update_pet_likes(
+            keys=[PET_LIKED_POSTS_KEY.format(petId=petId), PET_LIKED_POSTS_BUILD_KEY.format(petId=petId)],
+            args=[postId, "1" if liked else "0"]
+        )
+    except Exception as e:
+        print(f"[PetLikesIndex] No se pudo actualizar el índice de likes de la mascota: {str(e)}")
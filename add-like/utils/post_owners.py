@@ -0,0 +1,173 @@
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import select, delete, or_
+from sqlalchemy.dialects.postgresql import insert
+from dotenv import load_dotenv
+from config.db import SessionPost, SessionReactions
+from config.redis_client import redis_client
+from models.post_model import Post
+from models.post_owner_model import PostOwner
+from utils.metrics import record_cache_lookup
+from utils.pet_cache import pet_cache, PET_INVALIDATION_CHANNEL
+
+load_dotenv()
+
+# Snapshots older than this are refreshed from Posts/Pets (safety net for missed invalidations)
+POST_OWNER_SNAPSHOT_TTL = int(os.getenv("POST_OWNER_SNAPSHOT_TTL", 86400))
+POST_OWNER_RECONNECT_DELAY = 1.0
+# Invalidation hook: PUBLISH the postId here (e.g. from the posts service when a post is deleted)
+POST_INVALIDATION_CHANNEL = "posts:invalidate"
+
+
+def _normalize_id(value):
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        return None
+
+
+def _snapshot(owner_pet_id, name, responsible_id) -> dict:
+    return {
+        "ownerPetId": str(owner_pet_id),
+        "ownerPetName": name,
+        "ownerResponsibleId": str(responsible_id) if responsible_id else None,
+    }
+
+
+class PostOwnerSnapshots:
+    """
+    Proyección postId -> (ownerPetId, ownerPetName, ownerResponsibleId) en la tabla PostOwners
+    de la base de datos de Reactions. Se rellena la primera vez que se da like a un post y se
+    invalida por postId o por ownerPetId (endpoint /likes/owners/invalidate o los canales
+    pets:invalidate y posts:invalidate). Con la proyección caliente, dar like no lee Posts ni Pets
+    salvo la mascota que da el like.
+    """
+
+    def __init__(self):
+        self._task = None
+
+    async def get_many(self, db_reactions, postIds: list) -> dict:
+        """
+        Devuelve {postId: snapshot o None si el post no existe}. Si el post existe pero la
+        mascota dueña no, el snapshot tiene ownerResponsibleId None y no se guarda.
+        Lee PostOwners con la sesión de la petición; los que faltan se cargan de Posts y Pets.
+        """
+        normalized = {postId: _normalize_id(postId) for postId in dict.fromkeys(postIds)}
+        ids = [value for value in set(normalized.values()) if value is not None]
+        snapshots = {}
+        if ids:
+            rows = (await db_reactions.execute(
+                select(PostOwner.postId, PostOwner.ownerPetId, PostOwner.ownerPetName, PostOwner.ownerResponsibleId)
+                .where(
+                    PostOwner.postId.in_(ids),
+                    PostOwner.refreshedAt >= datetime.utcnow() - timedelta(seconds=POST_OWNER_SNAPSHOT_TTL),
+                )
+            )).all()
+            snapshots = {str(post_id): _snapshot(pet_id, name, responsible_id) for post_id, pet_id, name, responsible_id in rows}
+
+        missing = [postId for postId in ids if postId not in snapshots]
+        record_cache_lookup("post_owner", True, len(ids) - len(missing))
+        record_cache_lookup("post_owner", False, len(missing))
+        if missing:
+            snapshots.update(await self._load(missing))
+
+        return {postId: snapshots.get(value) if value else None for postId, value in normalized.items()}
+
+    async def get(self, db_reactions, postId):
+        return (await self.get_many(db_reactions, [postId]))[postId]
+
+    async def _load(self, postIds: list) -> dict:
+        async with SessionPost() as db_posts:
+            owners = {
+                str(post_id): str(pet_id)
+                for post_id, pet_id in (await db_posts.execute(
+                    select(Post.id, Post.petId).where(Post.id.in_(postIds))
+                )).all()
+            }
+        pets = await pet_cache.get_pets(list(set(owners.values())))
+
+        loaded = {}
+        rows = []
+        now = datetime.utcnow()
+        for postId, petId in owners.items():
+            pet = pets.get(petId)
+            loaded[postId] = _snapshot(petId, pet and pet["name"], pet and pet["responsibleId"])
+            if pet:
+                rows.append({
+                    "postId": postId, "ownerPetId": petId, "ownerPetName": pet["name"],
+                    "ownerResponsibleId": pet["responsibleId"], "refreshedAt": now,
+                })
+        if rows:
+            # Own short transaction: the snapshot is kept even if the like is rejected
+            try:
+                async with SessionReactions() as db_reactions:
+                    stmt = insert(PostOwner).values(rows)
+                    await db_reactions.execute(stmt.on_conflict_do_update(
+                        index_elements=[PostOwner.postId],
+                        set_={
+                            "ownerPetId": stmt.excluded.ownerPetId,
+                            "ownerPetName": stmt.excluded.ownerPetName,
+                            "ownerResponsibleId": stmt.excluded.ownerResponsibleId,
+                            "refreshedAt": stmt.excluded.refreshedAt,
+                        },
+                    ))
+                    await db_reactions.commit()
+            except Exception as e:
+                print(f"[PostOwners] No se pudo guardar la proyección: {str(e)}")
+        return loaded
+
+    async def invalidate(self, postIds: list = (), petIds: list = ()) -> int:
+        """
+        Borra las proyecciones de los posts indicados y de todos los posts de las mascotas
+        indicadas; se vuelven a cargar en el siguiente like. Devuelve las filas borradas.
+        """
+        postIds = [value for value in map(_normalize_id, postIds) if value]
+        petIds = [value for value in map(_normalize_id, petIds) if value]
+        if not postIds and not petIds:
+            return 0
+        async with SessionReactions() as db_reactions:
+            result = await db_reactions.execute(
+                delete(PostOwner).where(or_(PostOwner.postId.in_(postIds), PostOwner.ownerPetId.in_(petIds)))
+            )
+            await db_reactions.commit()
+        return result.rowcount
+
+    async def start(self):
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _listen(self):
+        while True:
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.subscribe(PET_INVALIDATION_CHANNEL, POST_INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    if message["channel"] == PET_INVALIDATION_CHANNEL:
+                        await self.invalidate(petIds=[message["data"]])
+                    else:
+                        await self.invalidate(postIds=[message["data"]])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[PostOwners] Error en la suscripción de invalidaciones: {str(e)}")
+                await asyncio.sleep(POST_OWNER_RECONNECT_DELAY)
+            finally:
+                await pubsub.aclose()
+
+
+post_owners = PostOwnerSnapshots()
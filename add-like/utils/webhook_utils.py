@@ -1,24 +1,165 @@
 import os
-import requests
+import time
+import asyncio
+import httpx
 from dotenv import load_dotenv
+from utils.metrics import WEBHOOK_DURATION, WEBHOOK_REQUESTS
 
 load_dotenv()
 
 WEBHOOK_NOTIFICATIONS_URL = os.getenv("WEBHOOK_NOTIFICATIONS_URL")
+# When set, events are coalesced and POSTed as {"events": [...]} to this endpoint
+WEBHOOK_NOTIFICATIONS_BATCH_URL = os.getenv("WEBHOOK_NOTIFICATIONS_BATCH_URL")
+WEBHOOK_TIMEOUT = float(os.getenv("WEBHOOK_TIMEOUT", 5.0))
+WEBHOOK_MAX_CONNECTIONS = int(os.getenv("WEBHOOK_MAX_CONNECTIONS", 20))
+WEBHOOK_MAX_KEEPALIVE = int(os.getenv("WEBHOOK_MAX_KEEPALIVE", 10))
+WEBHOOK_BATCH_MAX_SIZE = int(os.getenv("WEBHOOK_BATCH_MAX_SIZE", 100))
+WEBHOOK_FLUSH_INTERVAL = float(os.getenv("WEBHOOK_FLUSH_INTERVAL", 0.2))
+WEBHOOK_BREAKER_FAILURES = int(os.getenv("WEBHOOK_BREAKER_FAILURES", 5))
+WEBHOOK_BREAKER_RESET_TIMEOUT = float(os.getenv("WEBHOOK_BREAKER_RESET_TIMEOUT", 30.0))
 
-def send_like_webhook(data: dict):
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
     """
-    Envía un WebHook al Notifications Service.
+    Circuit breaker simple: tras `failure_threshold` fallos seguidos se abre y rechaza envíos
+    durante `reset_timeout` segundos; después deja pasar un único envío de prueba (half-open)
+    y rechaza el resto hasta que la prueba termina: se cierra si tiene éxito y se vuelve a
+    abrir si falla. Una prueba sin resultado tras `reset_timeout` segundos deja paso a otra.
     """
-    url = WEBHOOK_NOTIFICATIONS_URL
-
-    if not url:
-        print("[WebHook] No se configuró la URL del WebHook. Abortando envío.")
-        return
-
-    try:
-        response = requests.post(url, json=data, timeout=5)
-        response.raise_for_status()
-        print(f"[WebHook] Notificación enviada correctamente: {response.json()}")
-    except requests.RequestException as e:
-        print(f"[WebHook] Error enviando la notificación: {str(e)}")
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started_at = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow_request(self) -> bool:
+        """Decide si un envío puede salir; en half-open reserva la única prueba."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open":
+            return False
+        now = time.monotonic()
+        if self.probe_started_at is not None and now - self.probe_started_at < self.reset_timeout:
+            return False
+        self.probe_started_at = now
+        return True
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half-open" or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self.probe_started_at = None
+
+
+class WebhookClient:
+    """
+    Cliente HTTP asíncrono de larga duración para el Notifications Service.
+    Reutiliza conexiones (keep-alive), limita las conexiones simultáneas y corta los envíos
+    mediante un circuit breaker cuando el servicio no responde.
+    """
+
+    def __init__(self):
+        self.breaker = CircuitBreaker(WEBHOOK_BREAKER_FAILURES, WEBHOOK_BREAKER_RESET_TIMEOUT)
+        self._client = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(WEBHOOK_NOTIFICATIONS_URL or WEBHOOK_NOTIFICATIONS_BATCH_URL)
+
+    @property
+    def batch_mode(self) -> bool:
+        return bool(WEBHOOK_NOTIFICATIONS_BATCH_URL)
+
+    async def start(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=WEBHOOK_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=WEBHOOK_MAX_CONNECTIONS,
+                    max_keepalive_connections=WEBHOOK_MAX_KEEPALIVE,
+                ),
+            )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def check(self) -> dict:
+        """
+        Comprobación para /ready: el Notifications Service acepta conexiones (cualquier respuesta
+        HTTP vale). No pasa por el circuit breaker; su estado se incluye en el resultado.
+        """
+        if not self.enabled:
+            return {"status": "disabled"}
+        await self.start()
+        await self._client.head(WEBHOOK_NOTIFICATIONS_BATCH_URL or WEBHOOK_NOTIFICATIONS_URL)
+        return {"circuit": self.breaker.state}
+
+    async def _post(self, url: str, body: dict):
+        if not self.breaker.allow_request():
+            WEBHOOK_REQUESTS.labels("circuit_open").inc()
+            raise CircuitOpenError("Notifications Service circuit is open")
+        await self.start()
+        start = time.perf_counter()
+        try:
+            response = await self._client.post(url, json=body)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            WEBHOOK_DURATION.observe(time.perf_counter() - start)
+            WEBHOOK_REQUESTS.labels("failure").inc()
+            self.breaker.record_failure()
+            print(f"[WebHook] Error enviando la notificación: {str(e)}")
+            raise
+        WEBHOOK_DURATION.observe(time.perf_counter() - start)
+        WEBHOOK_REQUESTS.labels("success").inc()
+        self.breaker.record_success()
+
+    async def send(self, data: dict):
+        """
+        Envía un único evento al Notifications Service. Lanza una excepción si el envío falla.
+        """
+        await self._post(WEBHOOK_NOTIFICATIONS_URL, data)
+
+    async def send_many(self, events: list) -> list:
+        """
+        Envía varios eventos y devuelve, en el mismo orden, None por cada evento entregado
+        o la excepción con la que falló.
+        En modo batch los eventos se agrupan en POSTs de hasta WEBHOOK_BATCH_MAX_SIZE eventos.
+        """
+        if not self.batch_mode:
+            return await asyncio.gather(*(self.send(event) for event in events), return_exceptions=True)
+
+        results = []
+        for start in range(0, len(events), WEBHOOK_BATCH_MAX_SIZE):
+            chunk = events[start:start + WEBHOOK_BATCH_MAX_SIZE]
+            try:
+                await self._post(WEBHOOK_NOTIFICATIONS_BATCH_URL, {"events": chunk})
+                results.extend([None] * len(chunk))
+            except Exception as e:
+                results.extend([e] * len(chunk))
+        return results
+
+
+webhook_client = WebhookClient()
+
@@ -0,0 +1,73 @@
+"""
+Identificadores deterministas del dataset de benchmark, compartidos por seed.py y load.py.
+"""
+import json
+import os
+import uuid
+from dataclasses import dataclass, asdict
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DB_HOST = os.getenv("DB_HOST", "localhost")
+DB_PORT = int(os.getenv("DB_PORT", 55432))
+DB_USER = os.getenv("DB_USER", "postgres")
+DB_PASSWORD = os.getenv("DB_PASSWORD", "postgres")
+PET_DB_NAME = os.getenv("PET_DB_NAME", "pets")
+POST_DB_NAME = os.getenv("POST_DB_NAME", "posts")
+REACTIONS_DB_NAME = os.getenv("REACTIONS_DB_NAME", "reactions")
+DB_NAMES = [PET_DB_NAME, POST_DB_NAME, REACTIONS_DB_NAME]
+REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
+REDIS_PORT = int(os.getenv("REDIS_PORT", 56379))
+JWT_SECRET = os.getenv("JWT_SECRET", "benchmark-secret")
+
+DATASET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dataset.json")
+
+# High bits of every generated UUID, so ids of different kinds never collide
+_PET, _POST, _RESPONSIBLE, _LIKE = 1, 2, 3, 4
+
+
+def _make_id(kind: int, i: int) -> str:
+    return str(uuid.UUID(int=(kind << 64) | i))
+
+
+def dsn(database: str) -> str:
+    return f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{database}"
+
+
+@dataclass
+class Dataset:
+    """
+    Escala del dataset. Cada post está likeado por las primeras likes_per_post mascotas;
+    el resto de pares (mascota, post) quedan libres para la fase de add.
+    """
+    pets: int
+    posts: int
+    likes_per_post: int
+    pets_per_responsible: int
+
+    def pet_id(self, i: int) -> str:
+        return _make_id(_PET, i)
+
+    def post_id(self, j: int) -> str:
+        return _make_id(_POST, j)
+
+    def like_id(self, j: int, i: int) -> str:
+        return _make_id(_LIKE, j * self.pets + i)
+
+    def responsible_index(self, i: int) -> int:
+        return i // self.pets_per_responsible
+
+    def responsible_id(self, i: int) -> str:
+        """responsibleId que es dueño de la mascota i."""
+        return _make_id(_RESPONSIBLE, self.responsible_index(i))
+
+    def save(self, path: str = DATASET_FILE):
+        with open(path, "w") as f:
+            json.dump(asdict(self), f, indent=2)
+
+    @classmethod
+    def load(cls, path: str = DATASET_FILE) -> "Dataset":
+        with open(path) as f:
+            return cls(**json.load(f))
@@ -0,0 +1,4 @@
+-- Databases of the benchmark stack (tables are created by seed.py)
+CREATE DATABASE pets;
+CREATE DATABASE posts;
+CREATE DATABASE reactions;
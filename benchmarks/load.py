@@ -0,0 +1,364 @@
+"""
+Generador de carga para add-like, remove-like y get-likes.
+
+Ejecuta una o varias fases (get, add, remove, mixed) con N clientes concurrentes contra el
+dataset de seed.py y reporta por endpoint p50/p95/p99, RPS, errores y consultas a la base de
+datos por petición (pg_stat_statements). Con --baseline termina con código 1 si alguna
+métrica empeora más de --max-regression respecto a un resultado guardado con --output.
+
+    python load.py --duration 30 --concurrency 50 --output results.json
+    python load.py --baseline results.json --max-regression 0.2
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from collections import defaultdict, deque
+
+import asyncpg
+import httpx
+import jwt
+
+from dataset import Dataset, dsn, DB_NAMES, REACTIONS_DB_NAME, JWT_SECRET
+
+PHASES = ["get", "add", "remove", "mixed"]
+# Share of each operation in the mixed phase
+MIXED_WEIGHTS = {"get": 0.7, "add": 0.15, "remove": 0.15}
+# Absolute slack for query-count comparisons (background flushes add a few statements per run)
+QUERY_COUNT_SLACK = 0.1
+
+# Transaction control and the harness' own statements are not counted as queries
+_QUERY_COUNTS_SQL = r"""
+SELECT d.datname, COALESCE(SUM(s.calls), 0)
+FROM pg_stat_statements s
+JOIN pg_database d ON d.oid = s.dbid
+WHERE d.datname = ANY($1::text[])
+  AND s.query !~* '^\s*(begin|commit|rollback|savepoint|release|set|show|deallocate|discard)\b'
+  AND s.query NOT ILIKE '%pg_stat_statements%'
+GROUP BY d.datname
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load test the like/unlike/get-likes hot paths")
+    parser.add_argument("--phases", default=",".join(PHASES), help=f"comma-separated subset of {PHASES}")
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds per phase")
+    parser.add_argument("--warmup", type=float, default=3, help="unmeasured seconds before each phase")
+    parser.add_argument("--concurrency", type=int, default=50, help="concurrent clients")
+    parser.add_argument("--add-url", default="http://localhost:6001")
+    parser.add_argument("--remove-url", default="http://localhost:6002")
+    parser.add_argument("--get-url", default="http://localhost:6003")
+    parser.add_argument("--base-url", help="single URL for all endpoints (combined app)")
+    parser.add_argument("--hot-fraction", type=float, default=0.2, help="fraction of posts that are hot")
+    parser.add_argument("--hot-traffic", type=float, default=0.8, help="share of reads that go to hot posts")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="tolerated relative worsening of p95, RPS and queries/request")
+    args = parser.parse_args()
+    args.phases = [phase.strip() for phase in args.phases.split(",") if phase.strip()]
+    unknown = set(args.phases) - set(PHASES)
+    if unknown:
+        parser.error(f"unknown phases: {sorted(unknown)}")
+    if args.base_url:
+        args.add_url = args.remove_url = args.get_url = args.base_url
+    return args
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    """Percentil por rango más cercano de una lista ya ordenada."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, min(len(sorted_values) - 1, math.ceil(p / 100 * len(sorted_values)) - 1))]
+
+
+class Recorder:
+    """Latencias y códigos de respuesta por endpoint durante la ventana medida de una fase."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(lambda: defaultdict(int))
+        self.recording = False
+        self.started_at = None
+        self.elapsed = 0.0
+
+    def start(self):
+        self.recording = True
+        self.started_at = time.perf_counter()
+
+    def stop(self):
+        self.recording = False
+        self.elapsed = time.perf_counter() - self.started_at
+
+    def record(self, endpoint: str, started: float, status: int):
+        if not self.recording:
+            return
+        self.latencies[endpoint].append((time.perf_counter() - started) * 1000)
+        if not 200 <= status < 300:
+            self.errors[endpoint][status] += 1
+
+    def summary(self) -> dict:
+        endpoints = {}
+        for endpoint, latencies in self.latencies.items():
+            latencies = sorted(latencies)
+            endpoints[endpoint] = {
+                "requests": len(latencies),
+                "errors": sum(self.errors[endpoint].values()),
+                "error_statuses": dict(self.errors[endpoint]),
+                "rps": round(len(latencies) / self.elapsed, 1) if self.elapsed else 0.0,
+                "mean_ms": round(sum(latencies) / len(latencies), 2),
+                "p50_ms": round(percentile(latencies, 50), 2),
+                "p95_ms": round(percentile(latencies, 95), 2),
+                "p99_ms": round(percentile(latencies, 99), 2),
+            }
+        return endpoints
+
+
+class Workload:
+    """Elige posts y pares (mascota, post) y guarda los likes añadidos para poder quitarlos."""
+
+    def __init__(self, dataset: Dataset, args):
+        self.dataset = dataset
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.hot_posts = max(1, int(dataset.posts * args.hot_fraction))
+        self.available_pairs = (dataset.pets - dataset.likes_per_post) * dataset.posts
+        self.used_pairs = set()
+        self.added = deque()
+        self._tokens = {}
+
+    def headers(self, i: int) -> dict:
+        responsible = self.dataset.responsible_index(i)
+        if responsible not in self._tokens:
+            self._tokens[responsible] = jwt.encode(
+                {"userId": self.dataset.responsible_id(i), "exp": int(time.time()) + 86400},
+                JWT_SECRET,
+                algorithm="HS256",
+            )
+        return {"Authorization": f"Bearer {self._tokens[responsible]}"}
+
+    def random_post(self) -> int:
+        if self.rng.random() < self.args.hot_traffic:
+            return self.rng.randrange(self.hot_posts)
+        return self.rng.randrange(self.dataset.posts)
+
+    def new_pair(self):
+        """Par (mascota, post) sin like todavía, o None si ya se usaron todos."""
+        if len(self.used_pairs) >= self.available_pairs:
+            return None
+        while True:
+            pair = (self.rng.randrange(self.dataset.likes_per_post, self.dataset.pets), self.rng.randrange(self.dataset.posts))
+            if pair not in self.used_pairs:
+                self.used_pairs.add(pair)
+                return pair
+
+
+async def send(client: httpx.AsyncClient, method: str, url: str, **kwargs) -> int:
+    try:
+        return (await client.request(method, url, **kwargs)).status_code
+    except httpx.HTTPError:
+        return 0
+
+
+async def do_get(client, workload: Workload, recorder: Recorder) -> bool:
+    postId = workload.dataset.post_id(workload.random_post())
+    started = time.perf_counter()
+    status = await send(client, "GET", f"{workload.args.get_url}/likes/{postId}")
+    recorder.record("get", started, status)
+    return True
+
+
+async def do_add(client, workload: Workload, recorder: Recorder) -> bool:
+    pair = workload.new_pair()
+    if pair is None:
+        return False
+    i, j = pair
+    started = time.perf_counter()
+    status = await send(
+        client, "POST", f"{workload.args.add_url}/likes/add",
+        json={"postId": workload.dataset.post_id(j), "petId": workload.dataset.pet_id(i)},
+        headers=workload.headers(i),
+    )
+    recorder.record("add", started, status)
+    if status == 200:
+        workload.added.append(pair)
+    return True
+
+
+async def do_remove(client, workload: Workload, recorder: Recorder) -> bool:
+    if not workload.added:
+        return False
+    i, j = workload.added.popleft()
+    started = time.perf_counter()
+    status = await send(
+        client, "DELETE", f"{workload.args.remove_url}/likes/remove",
+        json={"postId": workload.dataset.post_id(j), "petId": workload.dataset.pet_id(i)},
+        headers=workload.headers(i),
+    )
+    recorder.record("remove", started, status)
+    return True
+
+
+OPERATIONS = {"get": do_get, "add": do_add, "remove": do_remove}
+
+
+class QueryCounter:
+    """Cuenta las consultas de cada base de datos con pg_stat_statements (si está disponible)."""
+
+    def __init__(self):
+        self._connection = None
+
+    async def connect(self):
+        try:
+            self._connection = await asyncpg.connect(dsn(REACTIONS_DB_NAME))
+            await self._connection.execute("SELECT pg_stat_statements_reset()")
+        except (asyncpg.PostgresError, OSError) as e:
+            print(f"[Load] pg_stat_statements no disponible, no se contarán consultas: {str(e).splitlines()[0]}")
+            self._connection = None
+
+    async def reset(self):
+        if self._connection is not None:
+            await self._connection.execute("SELECT pg_stat_statements_reset()")
+
+    async def read(self) -> dict:
+        if self._connection is None:
+            return {}
+        rows = await self._connection.fetch(_QUERY_COUNTS_SQL, DB_NAMES)
+        return {name: int(calls) for name, calls in rows}
+
+    async def close(self):
+        if self._connection is not None:
+            await self._connection.close()
+
+
+async def run_phase(phase: str, client, workload: Workload, query_counter: QueryCounter, args) -> dict:
+    recorder = Recorder()
+    stopping = False
+
+    def pick_operation() -> str:
+        if phase != "mixed":
+            return phase
+        operation = workload.rng.choices(list(MIXED_WEIGHTS), weights=list(MIXED_WEIGHTS.values()))[0]
+        # Nothing added yet to remove: add instead
+        return "add" if operation == "remove" and not workload.added else operation
+
+    async def client_loop():
+        while not stopping:
+            if not await OPERATIONS[pick_operation()](client, workload, recorder):
+                # add/remove phases end early once their pairs run out
+                return
+
+    tasks = [asyncio.create_task(client_loop()) for _ in range(args.concurrency)]
+    if args.warmup:
+        await asyncio.wait(tasks, timeout=args.warmup)
+    await query_counter.reset()
+    recorder.start()
+    await asyncio.wait(tasks, timeout=args.duration)
+    recorder.stop()
+    query_counts = await query_counter.read()
+    stopping = True
+    await asyncio.gather(*tasks)
+
+    endpoints = recorder.summary()
+    measured = sum(stats["requests"] for stats in endpoints.values())
+    return {
+        "elapsed_s": round(recorder.elapsed, 2),
+        "endpoints": endpoints,
+        "queries_per_request": {
+            name: round(query_counts.get(name, 0) / measured, 2) for name in DB_NAMES
+        } if query_counts and measured else None,
+    }
+
+
+async def cleanup(client, workload: Workload, concurrency: int):
+    """Quita los likes añadidos que no quitó ninguna fase, para que el dataset vuelva a su estado inicial."""
+    recorder = Recorder()
+
+    async def client_loop():
+        while await do_remove(client, workload, recorder):
+            pass
+
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+
+
+def print_report(results: dict):
+    header = f"{'phase':<8}{'endpoint':<10}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}  queries/req ({'/'.join(DB_NAMES)})"
+    print(header)
+    print("-" * len(header))
+    for phase, data in results.items():
+        queries = data["queries_per_request"]
+        queries_column = "/".join(str(queries[name]) for name in DB_NAMES) if queries else "n/a"
+        for endpoint, stats in sorted(data["endpoints"].items()):
+            print(
+                f"{phase:<8}{endpoint:<10}{stats['requests']:>10}{stats['errors']:>8}{stats['rps']:>10}"
+                f"{stats['p50_ms']:>9}{stats['p95_ms']:>9}{stats['p99_ms']:>9}  {queries_column}"
+            )
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list:
+    """Devuelve las métricas que empeoran más de max_regression respecto a la línea base."""
+    regressions = []
+    for phase, data in results.items():
+        base = baseline["results"].get(phase)
+        if base is None:
+            continue
+        for endpoint, stats in data["endpoints"].items():
+            base_stats = base["endpoints"].get(endpoint)
+            if base_stats is None:
+                continue
+            if stats["p95_ms"] > base_stats["p95_ms"] * (1 + max_regression):
+                regressions.append(f"{phase}/{endpoint}: p95 {base_stats['p95_ms']} -> {stats['p95_ms']} ms")
+            if stats["rps"] < base_stats["rps"] * (1 - max_regression):
+                regressions.append(f"{phase}/{endpoint}: rps {base_stats['rps']} -> {stats['rps']}")
+        if data["queries_per_request"] and base["queries_per_request"]:
+            for name, queries in data["queries_per_request"].items():
+                base_queries = base["queries_per_request"].get(name, 0)
+                if queries > base_queries * (1 + max_regression) + QUERY_COUNT_SLACK:
+                    regressions.append(f"{phase}: queries/request on {name} {base_queries} -> {queries}")
+    return regressions
+
+
+async def main() -> int:
+    args = parse_args()
+    dataset = Dataset.load()
+    workload = Workload(dataset, args)
+    query_counter = QueryCounter()
+    await query_counter.connect()
+
+    results = {}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        try:
+            for phase in args.phases:
+                print(f"[Load] Fase {phase}: {args.concurrency} clientes, {args.duration}s", flush=True)
+                results[phase] = await run_phase(phase, client, workload, query_counter, args)
+        finally:
+            await cleanup(client, workload, args.concurrency)
+            await query_counter.close()
+
+    print_report(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"dataset": vars(dataset), "config": {
+                "duration": args.duration, "concurrency": args.concurrency,
+                "hot_fraction": args.hot_fraction, "hot_traffic": args.hot_traffic,
+            }, "results": results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        if regressions:
+            print("\n[Load] Regresiones respecto a la línea base:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print("\n[Load] Sin regresiones respecto a la línea base")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
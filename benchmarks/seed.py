@@ -0,0 +1,141 @@
+"""
+Crea el esquema y carga el dataset de benchmark (mascotas, posts y likes) a la escala indicada.
+
+    python seed.py --pets 2000 --posts 1000 --likes-per-post 100 --reset
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+
+import asyncpg
+import redis.asyncio as redis
+
+from dataset import (
+    Dataset, dsn, DB_NAMES, PET_DB_NAME, POST_DB_NAME, REACTIONS_DB_NAME, REDIS_HOST, REDIS_PORT
+)
+
+SCHEMA = {
+    PET_DB_NAME: [
+        """CREATE TABLE IF NOT EXISTS "Pets" (
+            id UUID PRIMARY KEY, name VARCHAR, species VARCHAR, breed VARCHAR, image VARCHAR,
+            birthdate TIMESTAMP, residence VARCHAR, gender VARCHAR, color VARCHAR,
+            "responsibleId" UUID, "createdAt" TIMESTAMP, "updatedAt" TIMESTAMP
+        )""",
+    ],
+    POST_DB_NAME: [
+        """CREATE TABLE IF NOT EXISTS "Posts" (
+            id UUID PRIMARY KEY, "petId" UUID, content VARCHAR, image VARCHAR, likes INTEGER,
+            "createdAt" TIMESTAMP, "updatedAt" TIMESTAMP
+        )""",
+        'CREATE TABLE IF NOT EXISTS "LikeFlushBatches" (id UUID PRIMARY KEY, "appliedAt" TIMESTAMP NOT NULL)',
+    ],
+    REACTIONS_DB_NAME: [
+        """CREATE TABLE IF NOT EXISTS "Likes" (
+            id UUID PRIMARY KEY, "postId" UUID, "petId" UUID, "createdAt" TIMESTAMP NOT NULL DEFAULT now(),
+            CONSTRAINT uq_likes_post_pet UNIQUE ("postId", "petId")
+        )""",
+        'CREATE INDEX IF NOT EXISTS ix_likes_post_created_id ON "Likes" ("postId", "createdAt", id)',
+        'CREATE INDEX IF NOT EXISTS ix_likes_pet_post ON "Likes" ("petId", "postId")',
+        """CREATE TABLE IF NOT EXISTS "LikeOutbox" (
+            id UUID PRIMARY KEY, "eventType" VARCHAR NOT NULL, payload JSONB NOT NULL,
+            status VARCHAR NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0,
+            "lastError" VARCHAR, "nextAttemptAt" TIMESTAMP NOT NULL, "createdAt" TIMESTAMP NOT NULL,
+            "deliveredAt" TIMESTAMP
+        )""",
+        'CREATE INDEX IF NOT EXISTS ix_like_outbox_status_next_attempt ON "LikeOutbox" (status, "nextAttemptAt")',
+        'CREATE INDEX IF NOT EXISTS ix_like_outbox_status_created ON "LikeOutbox" (status, "createdAt")',
+        """CREATE TABLE IF NOT EXISTS "PostOwners" (
+            "postId" UUID PRIMARY KEY, "ownerPetId" UUID NOT NULL, "ownerPetName" VARCHAR,
+            "ownerResponsibleId" UUID NOT NULL, "refreshedAt" TIMESTAMP NOT NULL
+        )""",
+        'CREATE INDEX IF NOT EXISTS ix_post_owners_owner_pet ON "PostOwners" ("ownerPetId")',
+    ],
+}
+TABLES = {PET_DB_NAME: ["Pets"], POST_DB_NAME: ["Posts", "LikeFlushBatches"], REACTIONS_DB_NAME: ["Likes", "LikeOutbox", "PostOwners"]}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Seed the benchmark databases")
+    parser.add_argument("--pets", type=int, default=2000)
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--likes-per-post", type=int, default=100)
+    parser.add_argument("--pets-per-responsible", type=int, default=2)
+    parser.add_argument("--reset", action="store_true",
+                        help="truncate existing benchmark tables (required when they already contain rows)")
+    args = parser.parse_args()
+    if args.likes_per_post >= args.pets:
+        parser.error("--likes-per-post must be lower than --pets (the rest of the pets are used by the add phase)")
+    return args
+
+
+async def seed(dataset: Dataset, reset: bool):
+    connections = {name: await asyncpg.connect(dsn(name)) for name in DB_NAMES}
+    try:
+        for name, statements in SCHEMA.items():
+            for statement in statements:
+                await connections[name].execute(statement)
+            # Query counts per endpoint (load.py); needs shared_preload_libraries=pg_stat_statements
+            try:
+                await connections[name].execute("CREATE EXTENSION IF NOT EXISTS pg_stat_statements")
+            except asyncpg.PostgresError as e:
+                print(f"[Seed] pg_stat_statements no disponible en {name}: {e.message}")
+
+        for name, tables in TABLES.items():
+            for table in tables:
+                if await connections[name].fetchval(f'SELECT EXISTS (SELECT 1 FROM "{table}")'):
+                    if not reset:
+                        raise SystemExit(f'"{table}" in {name} already has rows; rerun with --reset to truncate it')
+                    await connections[name].execute(f'TRUNCATE "{table}"')
+
+        now = datetime.utcnow().replace(microsecond=0)
+        await connections[PET_DB_NAME].copy_records_to_table(
+            "Pets",
+            columns=["id", "name", "species", "responsibleId", "createdAt", "updatedAt"],
+            records=[
+                (dataset.pet_id(i), f"pet-{i}", "dog", dataset.responsible_id(i), now, now)
+                for i in range(dataset.pets)
+            ],
+        )
+        await connections[POST_DB_NAME].copy_records_to_table(
+            "Posts",
+            columns=["id", "petId", "content", "likes", "createdAt", "updatedAt"],
+            records=[
+                (dataset.post_id(j), dataset.pet_id(j % dataset.pets), f"post-{j}", dataset.likes_per_post, now, now)
+                for j in range(dataset.posts)
+            ],
+        )
+        # Likes are written per post so memory stays flat at large scales
+        for j in range(dataset.posts):
+            await connections[REACTIONS_DB_NAME].copy_records_to_table(
+                "Likes",
+                columns=["id", "postId", "petId", "createdAt"],
+                records=[
+                    (dataset.like_id(j, i), dataset.post_id(j), dataset.pet_id(i), now - timedelta(seconds=i))
+                    for i in range(dataset.likes_per_post)
+                ],
+            )
+        for name in DB_NAMES:
+            await connections[name].execute("ANALYZE")
+    finally:
+        for connection in connections.values():
+            await connection.close()
+
+    # Cached counts, pages and indexes of a previous dataset are no longer valid
+    redis_client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT)
+    await redis_client.flushdb()
+    await redis_client.aclose()
+
+
+def main():
+    args = parse_args()
+    dataset = Dataset(args.pets, args.posts, args.likes_per_post, args.pets_per_responsible)
+    asyncio.run(seed(dataset, args.reset))
+    dataset.save()
+    print(
+        f"[Seed] {dataset.pets} mascotas, {dataset.posts} posts, "
+        f"{dataset.posts * dataset.likes_per_post} likes. Dataset guardado en dataset.json"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Notifications Service falso para los benchmarks: responde 200 a cualquier POST y cuenta
+los eventos recibidos. Solo usa la librería estándar.
+
+    python webhook_stub.py --port 8080 --latency-ms 20
+"""
+import argparse
+import asyncio
+import json
+import time
+
+stats = {"requests": 0, "events": 0}
+
+
+async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, latency: float):
+    try:
+        # HTTP/1.1 keep-alive: serve requests until the client closes the connection
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            headers = dict(
+                line.split(":", 1) for line in head.decode("latin-1").split("\r\n")[1:] if ":" in line
+            )
+            length = int({k.strip().lower(): v.strip() for k, v in headers.items()}.get("content-length", 0))
+            body = await reader.readexactly(length) if length else b""
+            try:
+                payload = json.loads(body) if body else {}
+                stats["events"] += len(payload["events"]) if isinstance(payload, dict) and "events" in payload else 1
+            except ValueError:
+                pass
+            stats["requests"] += 1
+            if latency:
+                await asyncio.sleep(latency)
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 2\r\n\r\n{}")
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def report(interval: float):
+    last_requests, last_time = 0, time.monotonic()
+    while True:
+        await asyncio.sleep(interval)
+        now = time.monotonic()
+        rate = (stats["requests"] - last_requests) / (now - last_time)
+        print(f"[WebhookStub] {stats['requests']} peticiones, {stats['events']} eventos ({rate:.1f} req/s)", flush=True)
+        last_requests, last_time = stats["requests"], now
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Stub notifications webhook")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency-ms", type=float, default=0, help="simulated notifier latency")
+    parser.add_argument("--report-interval", type=float, default=10)
+    args = parser.parse_args()
+
+    server = await asyncio.start_server(
+        lambda reader, writer: handle(reader, writer, args.latency_ms / 1000), args.host, args.port
+    )
+    print(f"[WebhookStub] Escuchando en {args.host}:{args.port}", flush=True)
+    async with server:
+        await asyncio.gather(server.serve_forever(), report(args.report_interval))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,134 @@
+"""
+Punto de entrada combinado: add-like, remove-like y get-likes en un solo proceso.
+
+Los tres servicios usan los mismos nombres de paquete (config, models, utils, ...), así que
+cada uno se importa aislado. Los módulos cuyo código es idéntico entre servicios se cargan
+una sola vez y se comparten: motores y pools de SQLAlchemy (config.db), cliente Redis,
+modelos, flusher de contadores y caché de mascotas. Cada servicio sigue pudiendo
+ejecutarse por separado con su propio app.py.
+"""
+import hashlib
+import importlib
+import os
+import sys
+from contextlib import asynccontextmanager, AsyncExitStack
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+import uvicorn
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVICES = ["add-like", "remove-like", "get-likes"]
+# Top-level packages every service defines under the same names
+SERVICE_PACKAGES = {"config", "models", "controllers", "routes", "schemas", "middlewares", "utils"}
+
+
+def _source_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _is_service_module(name: str) -> bool:
+    return name == "app" or name.split(".")[0] in SERVICE_PACKAGES
+
+
+def load_service(service: str, shared: dict):
+    """
+    Importa el app.py de un servicio con sus paquetes aislados del resto.
+    `shared` guarda los módulos ya cargados por nombre; los que tienen el mismo código en
+    este servicio se reutilizan en lugar de volver a importarse.
+    Devuelve el módulo app del servicio.
+    """
+    service_dir = os.path.join(ROOT_DIR, service)
+    for name in [name for name in sys.modules if _is_service_module(name)]:
+        del sys.modules[name]
+
+    for name, module in shared.items():
+        path = os.path.join(service_dir, *name.split(".")) + ".py"
+        if os.path.exists(path) and _source_digest(path) == _source_digest(module.__file__):
+            sys.modules[name] = module
+
+    sys.path.insert(0, service_dir)
+    try:
+        service_app = importlib.import_module("app")
+    finally:
+        sys.path.remove(service_dir)
+
+    for name in [name for name in sys.modules if _is_service_module(name)]:
+        module = sys.modules.pop(name)
+        if name != "app" and getattr(module, "__file__", None):
+            shared.setdefault(name, module)
+    return service_app
+
+
+shared_modules = {}
+services = {service: load_service(service, shared_modules) for service in SERVICES}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background tasks of every service (shared ones start only once)
+    async with AsyncExitStack() as stack:
+        for service_app in services.values():
+            await stack.enter_async_context(service_app.app.router.lifespan_context(service_app.app))
+        # The services warm up the shared pools and Redis; the combined schema is built here
+        app.openapi()
+        yield
+
+
+app = FastAPI(
+    title="Reactions API",
+    version="1.0.0",
+    description="Add-Like, Remove-Like and Get-Likes served from one process",
+    docs_url="/api-docs",
+    redoc_url=None,
+    openapi_url="/api-docs/openapi.json",
+    lifespan=lifespan,
+)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+app.add_middleware(shared_modules["utils.metrics"].MetricsMiddleware)
+app.add_middleware(
+    shared_modules["utils.query_profiler"].QueryProfilerMiddleware,
+    budgets={endpoint: budget for service_app in services.values() for endpoint, budget in service_app.QUERY_BUDGETS.items()},
+)
+
+# Literal /likes/... routes of add-like and remove-like go before get-likes' /likes/{postId}
+app.include_router(services["add-like"].like_router)
+app.include_router(services["remove-like"].like_router)
+app.include_router(services["get-likes"].like_router)
+app.include_router(services["get-likes"].graphql_app, prefix="/graphql", include_in_schema=False)
+
+
+@app.get("/health", tags=["Health Check"])
+def simple_health_check():
+    return {
+        "status": "ok",
+        "db_pools": shared_modules["config.db"].get_pool_metrics(),
+        "local_cache": services["get-likes"].local_cache.stats(),
+    }
+
+
+readiness = shared_modules["utils.readiness"].ReadinessProbe(
+    optional_checks={"notifier": services["add-like"].webhook_client.check}
+)
+
+
+@app.get("/ready", tags=["Health Check"])
+async def readiness_check():
+    return await readiness.response()
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return shared_modules["utils.metrics"].metrics_response()
+
+
+# Ejecución directa
+if __name__ == "__main__":
+    uvicorn.run("main:app", **shared_modules["config.server"].server_options(6000))
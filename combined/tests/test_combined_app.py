@@ -0,0 +1,27 @@
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from main import app, services, shared_modules
+
+
+def test_identical_modules_are_shared_between_services():
+    add_like, remove_like, get_likes = (services[service] for service in ["add-like", "remove-like", "get-likes"])
+    # One set of engines/pools and one flusher for the whole process
+    assert add_like.get_pool_metrics is remove_like.get_pool_metrics is get_likes.get_pool_metrics
+    assert add_like.likes_flusher is remove_like.likes_flusher
+    # Modules that differ per service are still loaded separately
+    assert add_like.like_router is not remove_like.like_router
+    assert shared_modules["config.db"].get_pool_metrics is add_like.get_pool_metrics
+
+
+def test_all_service_routes_are_mounted():
+    paths = {(route.path, method) for route in app.routes for method in getattr(route, "methods", None) or ()}
+    assert ("/likes/add", "POST") in paths
+    assert ("/likes/remove", "DELETE") in paths
+    assert ("/likes/{postId}", "GET") in paths
+    assert ("/graphql", "POST") in paths
+
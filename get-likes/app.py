@@ -1,11 +1,42 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 import uvicorn
 import strawberry.fastapi
-from schemas.graphql_schema import schema
+from schemas.graphql_schema import schema, get_context
 
 from routes.like_routes import router as like_router
+from config.db import get_pool_metrics
+from config.server import server_options
+from utils.metrics import MetricsMiddleware, metrics_response
+from utils.query_profiler import QueryProfilerMiddleware
+from utils.readiness import ReadinessProbe, warm_up
+from utils.local_cache import local_cache, local_cache_invalidator
+
+
+# Maximum SQL statements per request, checked in QUERY_PROFILING mode
+QUERY_BUDGETS = {
+    "GET /likes/{postId}": 2,
+    "GET /likes/{postId}/stream": 2,
+    "POST /likes/batch": 1,
+    "POST /likes/status": 1,
+    # 0 while the Redis leaderboards exist; 2 GROUP BY queries to rebuild them after a flush
+    "GET /likes/top": 2,
+    "GET /likes/trending": 2,
+    # One batched statement per DataLoader and per likes page
+    "POST /graphql": 6,
+}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pub/sub listener that keeps the in-process likes cache in sync (LOCAL_CACHE_ENABLED)
+    await local_cache_invalidator.start()
+    # Pre-open the DB pools and the Redis connection and build the OpenAPI schema
+    await warm_up(app)
+    yield
+    await local_cache_invalidator.stop()
 
 
 # Crear la app FastAPI
@@ -16,14 +47,29 @@ app = FastAPI(
     docs_url="/api-docs-getLikes",                  
     redoc_url=None,
     openapi_url="/api-docs-getLikes/openapi.json",   
+    lifespan=lifespan,
 )
 
-graphql_app = strawberry.fastapi.GraphQLRouter(schema)
+graphql_app = strawberry.fastapi.GraphQLRouter(schema, context_getter=get_context)
 app.include_router(graphql_app, prefix="/graphql", include_in_schema=False)
 
 @app.get("/health", tags=["Health Check"])
 def simple_health_check():
-    return {"status": "ok"}
+    return {"status": "ok", "db_pools": get_pool_metrics(), "local_cache": local_cache.stats()}
+
+
+# Postgres x3 and Redis, cached for READINESS_CACHE_SECONDS
+readiness = ReadinessProbe()
+
+
+@app.get("/ready", tags=["Health Check"])
+async def readiness_check():
+    return await readiness.response()
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return metrics_response()
 
 
 # Configurar CORS
@@ -34,6 +80,10 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Per-route latency histograms for /metrics
+app.add_middleware(MetricsMiddleware)
+# SQL statements per request against QUERY_BUDGETS (only with QUERY_PROFILING=true)
+app.add_middleware(QueryProfilerMiddleware, budgets=QUERY_BUDGETS)
 
 # Incluir las rutas
 app.include_router(like_router)
@@ -55,4 +105,4 @@ app.openapi = custom_openapi
 
 # Ejecución directa
 if __name__ == "__main__":
-    uvicorn.run("app:app", host="0.0.0.0", port=6003, reload=True)
\ No newline at end of file
+    uvicorn.run("app:app", **server_options(6003))
\ No newline at end of file
@@ -1,7 +1,36 @@
-import redis
+import redis.asyncio as redis
 import os
+import time
+from dotenv import load_dotenv
+from utils.metrics import observe_redis_command
+
+load_dotenv()
 
 redis_host = os.getenv("REDIS_HOST", "localhost")
 redis_port = int(os.getenv("REDIS_PORT", 6379))
 
-redis_client = redis.Redis(host=redis_host, port=redis_port, decode_responses=True)
+
+class InstrumentedPipeline(redis.client.Pipeline):
+    async def execute(self, raise_on_error: bool = True):
+        start = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            observe_redis_command("MULTI" if self.is_transaction else "PIPELINE", time.perf_counter() - start)
+
+
+class InstrumentedRedis(redis.Redis):
+    """Cliente Redis que mide la duración de cada comando y de cada pipeline (utils/metrics.py)."""
+
+    async def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            observe_redis_command(args[0], time.perf_counter() - start)
+
+    def pipeline(self, transaction: bool = True, shard_hint=None):
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+redis_client = InstrumentedRedis(host=redis_host, port=redis_port, decode_responses=True)
@@ -1,55 +1,278 @@
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 from fastapi import HTTPException
 from models.like_model import Like
 from models.post_model import Post
-from config.redis_client import redis_client
 from config.db import SessionReactions, SessionPost
+from redis.exceptions import RedisError
+from utils import likes_cache, pet_likes_index, leaderboard
+from utils.json_response import dumps
+from utils.pagination import DEFAULT_PAGE_SIZE, encode_cursor, decode_cursor, InvalidCursorError
 from uuid import UUID
 
-CACHE_TTL = 60
+STREAM_BATCH_SIZE = 1000
 
-def get_likes_info_controller(postId: UUID):
-    db_reactions = SessionReactions()
-    db_posts = SessionPost()
 
-    try:
-        # Buscar el post
-        post = db_posts.execute(
+def _serialize_like(like):
+    # UUIDs and datetimes stay native: orjson encodes them directly in the response
+    return {
+        "likeId": like.id,
+        "postId": like.postId,
+        "petId": like.petId,
+        "createdAt": like.createdAt
+    }
+
+
+def _build_page(likes: list, limit: int) -> tuple:
+    """
+    Recorta una lista de likes serializados (hasta limit + 1) a una página y calcula el cursor siguiente.
+    Acepta tanto likes de la base de datos (valores nativos) como de la caché (strings).
+    """
+    next_cursor = None
+    if len(likes) > limit:
+        likes = likes[:limit]
+        last = likes[-1]
+        next_cursor = encode_cursor(last["createdAt"], last["likeId"])
+    return likes, next_cursor
+
+
+async def _get_post_or_404(db_posts, postId):
+    post = (await db_posts.execute(
+        select(Post).where(Post.id == postId)
+    )).scalar_one_or_none()
+
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    return post
+
+
+def _likes_page_query(postId, limit: int, cursor_position=None):
+    """Consulta por keyset sobre (createdAt, id): `limit` likes después de `cursor_position`."""
+    query = (
+        select(Like)
+        .where(Like.postId == postId)
+        .order_by(Like.createdAt, Like.id)
+        .limit(limit)
+    )
+    if cursor_position is not None:
+        cursor_created_at, cursor_id = cursor_position
+        query = query.where(tuple_(Like.createdAt, Like.id) > tuple_(cursor_created_at, cursor_id))
+    return query
+
+
+async def _load_likes_cache(postId) -> tuple:
+    """
+    Lee el post, el contador y la primera página de likes de la base de datos y los guarda en caché.
+    Devuelve lo mismo que likes_cache.read().
+    """
+    generation = await likes_cache.flush_generation()
+    async with SessionReactions() as db_reactions, SessionPost() as db_posts:
+        post = (await db_posts.execute(
             select(Post).where(Post.id == postId)
-        ).scalar_one_or_none()
+        )).scalar_one_or_none()
 
         if not post:
-            raise HTTPException(status_code=404, detail="Post not found")
+            await likes_cache.write_missing(postId)
+            return True, None, None
+
+        pending_deltas, cacheable = await likes_cache.read_pending_deltas([str(postId)], generation)
+        like_count = max((post.likes or 0) + pending_deltas[str(postId)], 0)
+
+        likes = (await db_reactions.execute(
+            _likes_page_query(postId, DEFAULT_PAGE_SIZE + 1)
+        )).scalars().all()
+        first_page = [_serialize_like(like) for like in likes]
+
+    if not cacheable:
+        # A Posts.likes flush overlapped the reads: answer without caching a possibly wrong count
+        return False, like_count, first_page
+    like_count = await likes_cache.write(postId, like_count, first_page)
+    return False, like_count, first_page
+
+
+async def get_likes_info_controller(postId: UUID, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
+    cursor_position = None
+    if cursor:
+        try:
+            cursor_position = decode_cursor(cursor)
+        except InvalidCursorError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # Cache first: a hit answers without touching Postgres
+    missing, like_count, first_page = await likes_cache.read(postId)
+    if not missing and (like_count is None or first_page is None):
+        missing, like_count, first_page = await likes_cache.single_flight(
+            postId, lambda: _load_likes_cache(postId)
+        )
+
+    if missing:
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    if cursor_position is None and limit <= DEFAULT_PAGE_SIZE:
+        likes, next_cursor = _build_page(first_page, limit)
+    else:
+        async with SessionReactions() as db_reactions:
+            rows = (await db_reactions.execute(
+                _likes_page_query(postId, limit + 1, cursor_position)
+            )).scalars().all()
+        likes, next_cursor = _build_page([_serialize_like(like) for like in rows], limit)
+
+    return {
+        "postId": postId,
+        "likes_count": like_count,
+        "likes_details": likes,
+        "next_cursor": next_cursor
+    }
+
+
+async def get_likes_pages_controller(pages: list) -> list:
+    """
+    Devuelve (likes, next_cursor) para varias páginas (postId, limit, cursor_position) sin leer
+    el post ni el contador. Una primera página cacheada se sirve desde Redis; el resto sale de
+    la consulta por keyset, todas en la misma sesión.
+    """
+    results = {}
+    uncached = []
+    for page in dict.fromkeys(pages):
+        postId, limit, cursor_position = page
+        if cursor_position is None and limit <= DEFAULT_PAGE_SIZE:
+            _, _, first_page = await likes_cache.read(postId)
+            if first_page is not None:
+                results[page] = _build_page(first_page, limit)
+                continue
+        uncached.append(page)
+
+    if uncached:
+        async with SessionReactions() as db_reactions:
+            for page in uncached:
+                postId, limit, cursor_position = page
+                rows = (await db_reactions.execute(
+                    _likes_page_query(postId, limit + 1, cursor_position)
+                )).scalars().all()
+                results[page] = _build_page([_serialize_like(like) for like in rows], limit)
 
-        cache_key = f"post:{postId}:likes_count"
-        cached_likes_count = redis_client.get(cache_key)
+    return [results[page] for page in pages]
 
-        if cached_likes_count is not None:
-            like_count = int(cached_likes_count)
+
+async def get_likes_counts_controller(postIds: list) -> dict:
+    """
+    Devuelve {postId: likes_count} para varios posts (None si el post no existe) con una
+    lectura a Redis y, para los contadores no cacheados, una sola consulta WHERE id IN (...).
+    """
+    postIds = list(dict.fromkeys(str(postId) for postId in postIds))
+    cached = await likes_cache.read_counts(postIds)
+
+    likes_counts = {}
+    uncached = []
+    for postId in postIds:
+        missing, like_count = cached[postId]
+        if missing:
+            likes_counts[postId] = None
+        elif like_count is not None:
+            likes_counts[postId] = like_count
         else:
-            like_count = post.likes
-            redis_client.set(cache_key, like_count, ex=CACHE_TTL)
-
-        likes = db_reactions.execute(
-            select(Like).where(Like.postId == postId)
-        ).scalars().all()
-
-        likes_list = [
-            {
-                "likeId": like.id,
-                "postId": like.postId,
-                "petId": like.petId,
-                "createdAt": like.createdAt.isoformat() if like.createdAt else None
-            }
-            for like in likes
-        ]
-
-        return {
-            "postId": postId,
-            "likes_count": like_count,
-            "likes_details": likes_list
+            uncached.append(postId)
+
+    if uncached:
+        generation = await likes_cache.flush_generation()
+        async with SessionPost() as db_posts:
+            rows = (await db_posts.execute(
+                select(Post.id, Post.likes).where(Post.id.in_(uncached))
+            )).all()
+        found = {str(post_id): likes for post_id, likes in rows}
+        pending_deltas, cacheable = await likes_cache.read_pending_deltas(list(found), generation) if found else ({}, True)
+
+        loaded = {
+            postId: max((found[postId] or 0) + pending_deltas[postId], 0)
+            for postId in uncached if postId in found
         }
+        missing_postIds = [postId for postId in uncached if postId not in found]
+        await likes_cache.write_counts(loaded if cacheable else {}, missing_postIds)
+
+        likes_counts.update(loaded)
+        likes_counts.update({postId: None for postId in missing_postIds})
+
+    return likes_counts
+
+
+async def get_pet_likes_controller(petId, postIds: list) -> dict:
+    """
+    Devuelve {postId: True/False} según si la mascota dio like a cada post.
+    Se responde desde el índice Redis de la mascota; si no está en caché se reconstruye con
+    una consulta sobre (petId, postId), o se consulta solo la lista pedida si la mascota tiene
+    demasiados likes para indexarlos.
+    """
+    petId = str(petId)
+    postIds = list(dict.fromkeys(str(postId) for postId in postIds))
+
+    statuses = await pet_likes_index.read(petId, postIds)
+    if statuses is not None:
+        return statuses
+
+    token = await pet_likes_index.begin_build(petId)
+    async with SessionReactions() as db_reactions:
+        liked = (await db_reactions.execute(
+            select(Like.postId)
+            .where(Like.petId == petId)
+            .limit(pet_likes_index.PET_LIKES_INDEX_MAX_SIZE + 1)
+        )).scalars().all()
+
+        if len(liked) > pet_likes_index.PET_LIKES_INDEX_MAX_SIZE:
+            liked = (await db_reactions.execute(
+                select(Like.postId).where(
+                    Like.petId == petId,
+                    Like.postId.in_(postIds)
+                )
+            )).scalars().all()
+        else:
+            await pet_likes_index.commit_build(petId, token, [str(postId) for postId in liked])
+
+    liked = {str(postId) for postId in liked}
+    return {postId: postId in liked for postId in postIds}
+
+
+async def stream_likes_controller(postId: UUID):
+    """
+    Valida el post y devuelve un generador NDJSON con todos los Likes del post.
+    Las filas se leen con un cursor del lado del servidor (yield_per), por lo que
+    la memoria usada no depende del número de likes.
+    """
+    async with SessionPost() as db_posts:
+        await _get_post_or_404(db_posts, postId)
+
+    async def generate():
+        async with SessionReactions() as db_reactions:
+            rows = await db_reactions.stream_scalars(
+                select(Like)
+                .where(Like.postId == postId)
+                .order_by(Like.createdAt, Like.id)
+                .execution_options(yield_per=STREAM_BATCH_SIZE)
+            )
+            async for like in rows:
+                yield dumps(_serialize_like(like)) + b"\n"
+
+    return generate()
 
-    finally:
-        db_reactions.close()
-        db_posts.close()
+
+async def get_top_liked_controller(limit: int) -> dict:
+    """Ranking de posts con más likes, leído del sorted set de Redis."""
+    try:
+        posts = await leaderboard.top_liked(limit)
+    except (leaderboard.LeaderboardUnavailable, RedisError) as e:
+        print(f"[Leaderboard] Ranking no disponible: {str(e)}")
+        raise HTTPException(status_code=503, detail="Leaderboard unavailable")
+    return {"posts": [{"postId": postId, "likes_count": likes} for postId, likes in posts]}
+
+
+async def get_trending_controller(limit: int) -> dict:
+    """Posts en tendencia: likes de la ventana reciente con decaimiento por antigüedad."""
+    try:
+        posts = await leaderboard.trending(limit)
+    except (leaderboard.LeaderboardUnavailable, RedisError) as e:
+        print(f"[Leaderboard] Ranking no disponible: {str(e)}")
+        raise HTTPException(status_code=503, detail="Leaderboard unavailable")
+    return {
+        "bucket_seconds": leaderboard.TRENDING_BUCKET_SECONDS,
+        "window_buckets": leaderboard.TRENDING_WINDOW_BUCKETS,
+        "decay": leaderboard.TRENDING_DECAY,
+        "posts": [{"postId": postId, "score": score} for postId, score in posts],
+    }
@@ -1,27 +1,155 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Query, status
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer
-from schemas.like_schema import LikeListResponse
-from controllers.like_controller import get_likes_info_controller
+from typing import Optional
+from schemas.like_schema import (
+    LikeListResponse, LikesBatchRequest, LikesBatchResponse, LikeStatusRequest, LikeStatusResponse,
+    TopLikedResponse, TrendingResponse,
+)
+from controllers.like_controller import (
+    get_likes_info_controller, get_likes_counts_controller, get_pet_likes_controller, stream_likes_controller,
+    get_top_liked_controller, get_trending_controller,
+)
+from utils.json_response import FastJSONResponse
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from utils.leaderboard import LEADERBOARD_MAX_LIMIT
 from uuid import UUID
-router = APIRouter()
+# Responses are trusted controller output: they are returned as orjson-encoded responses directly,
+# skipping re-validation; response_model is kept only for the OpenAPI documentation
+router = APIRouter(default_response_class=FastJSONResponse)
 
 security_scheme = HTTPBearer()
 
+@router.post(
+    "/likes/batch",
+    tags=["Likes"],
+    summary="Retrieve like counts for several posts",
+    description="""
+    Retrieves the current number of likes for up to 100 posts in one request (e.g. a feed page).
+    Counts are returned in request order; `likes_count` is null for posts that do not exist.
+    """,
+    response_model=LikesBatchResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Like counts retrieved successfully"},
+        422: {"description": "Invalid or too many post IDs"},
+    },
+)
+async def get_likes_counts(body: LikesBatchRequest):
+    likes_counts = await get_likes_counts_controller(body.postIds)
+    return FastJSONResponse({
+        "counts": [
+            {"postId": postId, "likes_count": likes_counts[str(postId)]}
+            for postId in body.postIds
+        ]
+    })
+
+
+@router.post(
+    "/likes/status",
+    tags=["Likes"],
+    summary="Check which posts a pet has liked",
+    description="""
+    Returns, for up to 100 posts, whether the given pet has liked each of them
+    (e.g. to render a filled heart per post in a feed). Statuses are returned in request order.
+    """,
+    response_model=LikeStatusResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Like statuses retrieved successfully"},
+        422: {"description": "Invalid or too many IDs"},
+    },
+)
+async def get_like_statuses(body: LikeStatusRequest):
+    statuses = await get_pet_likes_controller(body.petId, body.postIds)
+    return FastJSONResponse({
+        "petId": body.petId,
+        "statuses": [
+            {"postId": postId, "liked": statuses[str(postId)]}
+            for postId in body.postIds
+        ]
+    })
+
+
+# /likes/top and /likes/trending are declared before /likes/{postId} so they are matched first
+@router.get(
+    "/likes/top",
+    tags=["Likes"],
+    summary="Most liked posts",
+    description="""
+    Returns the posts with the most likes, from highest to lowest.
+    Served from a Redis sorted set kept up to date by add-like and remove-like.
+    """,
+    response_model=TopLikedResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Ranking retrieved successfully"},
+        503: {"description": "Leaderboard unavailable (Redis down or rebuild in progress)"},
+    },
+)
+async def get_top_liked(limit: int = Query(10, ge=1, le=LEADERBOARD_MAX_LIMIT)):
+    return FastJSONResponse(await get_top_liked_controller(limit))
+
+
+@router.get(
+    "/likes/trending",
+    tags=["Likes"],
+    summary="Trending posts",
+    description="""
+    Returns the posts with the most recent likes. Likes are counted in buckets of `bucket_seconds`
+    over the last `window_buckets` buckets, and each bucket weighs `decay` times the next one,
+    so newer likes count more.
+    """,
+    response_model=TrendingResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Trending posts retrieved successfully"},
+        503: {"description": "Leaderboard unavailable (Redis down or rebuild in progress)"},
+    },
+)
+async def get_trending(limit: int = Query(10, ge=1, le=LEADERBOARD_MAX_LIMIT)):
+    return FastJSONResponse(await get_trending_controller(limit))
+
+
 @router.get(
     "/likes/{postId}",
     tags=["Likes"],
     summary="Retrieve likes for a post",
     description="""
-    Retrieves the current number of likes for a specific post,  
-    along with the details of all Like records for that post.
+    Retrieves the current number of likes for a specific post,
+    along with one page of Like records for that post.
+    Use `next_cursor` from the response as the `cursor` query parameter to fetch the next page.
     """,
     response_model=LikeListResponse,
     status_code=status.HTTP_200_OK,
     responses={
         200: {"description": "Likes retrieved successfully"},
+        400: {"description": "Invalid cursor"},
         404: {"description": "Post not found"},
         401: {"description": "Token missing or invalid"},
     },
 )
-def get_likes_info(postId: UUID):
-    return get_likes_info_controller(postId)
\ No newline at end of file
+async def get_likes_info(
+    postId: UUID,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+):
+    return FastJSONResponse(await get_likes_info_controller(postId, limit, cursor))
+
+
+@router.get(
+    "/likes/{postId}/stream",
+    tags=["Likes"],
+    summary="Stream all likes for a post as NDJSON",
+    description="""
+    Streams every Like record of a post as newline-delimited JSON (one LikeDetail per line).
+    Rows are read from the database in batches, so very large posts do not need to fit in memory.
+    """,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "NDJSON stream of likes", "content": {"application/x-ndjson": {}}},
+        404: {"description": "Post not found"},
+    },
+)
+async def stream_likes(postId: UUID):
+    return StreamingResponse(await stream_likes_controller(postId), media_type="application/x-ndjson")
@@ -1,16 +1,162 @@
 import strawberry
-from controllers.like_controller import get_likes_info_controller
+from collections import defaultdict
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+from strawberry.dataloader import DataLoader
+from strawberry.types import Info
+from controllers.like_controller import get_likes_pages_controller, get_likes_counts_controller, get_pet_likes_controller
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor, decode_cursor, InvalidCursorError
 
 @strawberry.type
 class LikeInfo:
     postId: str
-    likesCount: int  
+    likesCount: int
+
+
+@strawberry.type
+class LikeNode:
+    likeId: str
+    postId: str
+    petId: str
+    createdAt: Optional[str]
+
+
+@strawberry.type
+class LikeEdge:
+    cursor: str
+    node: LikeNode
+
+
+@strawberry.type
+class PageInfo:
+    hasNextPage: bool
+    endCursor: Optional[str]
+
+
+@strawberry.type
+class LikeConnection:
+    edges: List[LikeEdge]
+    pageInfo: PageInfo
+
+
+def _like_node(like: dict) -> LikeNode:
+    # Likes from the DB carry native UUID/datetime values, cached ones are already strings
+    createdAt = like["createdAt"]
+    return LikeNode(
+        likeId=str(like["likeId"]),
+        postId=str(like["postId"]),
+        petId=str(like["petId"]),
+        createdAt=createdAt.isoformat() if isinstance(createdAt, datetime) else createdAt,
+    )
+
+
+async def load_likes_counts(postIds: List[str]) -> List[Optional[int]]:
+    """Carga en lote los contadores pedidos durante una misma consulta GraphQL."""
+    likes_counts = await get_likes_counts_controller(postIds)
+    return [likes_counts[postId] for postId in postIds]
+
+
+async def load_likes_pages(keys: List[tuple]) -> List[tuple]:
+    """Carga en lote las páginas de likes de una consulta. Las claves son (postId, first, cursor decodificado)."""
+    return await get_likes_pages_controller(keys)
+
+
+async def load_liked_statuses(keys: List[tuple]) -> List[bool]:
+    """Carga en lote los isLikedBy de una consulta, agrupados por mascota. Las claves son (postId, petId)."""
+    postIds_by_pet = defaultdict(list)
+    for postId, petId in keys:
+        postIds_by_pet[petId].append(postId)
+    liked = {}
+    for petId, postIds in postIds_by_pet.items():
+        for postId, is_liked in (await get_pet_likes_controller(petId, postIds)).items():
+            liked[(postId, petId)] = is_liked
+    return [liked[key] for key in keys]
+
+
+async def get_context() -> dict:
+    # One DataLoader per request, so lookups are batched and cached only within a query
+    return {
+        "likes_count_loader": DataLoader(load_fn=load_likes_counts),
+        "likes_page_loader": DataLoader(load_fn=load_likes_pages),
+        "liked_status_loader": DataLoader(load_fn=load_liked_statuses),
+    }
+
+
+def _normalize_id(value: str, name: str = "postId") -> str:
+    try:
+        return str(UUID(value))
+    except ValueError:
+        raise ValueError(f"Invalid {name}: {value}")
+
+
+@strawberry.type
+class PostLikes:
+    """Likes de un post; cada campo solo consulta lo que se pide en la selección."""
+    postId: strawberry.ID
+
+    @strawberry.field
+    async def likesCount(self, info: Info) -> int:
+        likes_count = await info.context["likes_count_loader"].load(_normalize_id(self.postId))
+        if likes_count is None:
+            raise ValueError("Post not found")
+        return likes_count
+
+    @strawberry.field
+    async def likes(self, info: Info, first: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None) -> LikeConnection:
+        if not 1 <= first <= MAX_PAGE_SIZE:
+            raise ValueError(f"first must be between 1 and {MAX_PAGE_SIZE}")
+        try:
+            cursor_position = decode_cursor(after) if after else None
+        except InvalidCursorError:
+            raise ValueError("Invalid cursor")
+        # Only the keyset page query: the post row and the count have their own fields
+        likes, next_cursor = await info.context["likes_page_loader"].load(
+            (_normalize_id(self.postId), first, cursor_position)
+        )
+        edges = [
+            LikeEdge(
+                cursor=encode_cursor(like["createdAt"], like["likeId"]),
+                node=_like_node(like),
+            )
+            for like in likes
+        ]
+        return LikeConnection(
+            edges=edges,
+            pageInfo=PageInfo(
+                hasNextPage=next_cursor is not None,
+                endCursor=edges[-1].cursor if edges else None,
+            ),
+        )
+
+    @strawberry.field
+    async def isLikedBy(self, info: Info, petId: strawberry.ID) -> bool:
+        return await info.context["liked_status_loader"].load(
+            (_normalize_id(self.postId), _normalize_id(petId, "petId"))
+        )
+
 
 @strawberry.type
 class Query:
     @strawberry.field
-    def likesCount(self, postId: str) -> LikeInfo: 
-        data = get_likes_info_controller(postId)
-        return LikeInfo(postId=data["postId"], likesCount=data["likes_count"])
+    async def likesCount(self, info: Info, postId: str) -> LikeInfo:
+        likes_count = await info.context["likes_count_loader"].load(_normalize_id(postId))
+        if likes_count is None:
+            raise ValueError("Post not found")
+        return LikeInfo(postId=postId, likesCount=likes_count)
+
+    @strawberry.field
+    async def likesCounts(self, info: Info, postIds: List[strawberry.ID]) -> List[Optional[LikeInfo]]:
+        likes_counts = await info.context["likes_count_loader"].load_many(
+            [_normalize_id(postId) for postId in postIds]
+        )
+        return [
+            LikeInfo(postId=postId, likesCount=likes_count) if likes_count is not None else None
+            for postId, likes_count in zip(postIds, likes_counts)
+        ]
+
+    @strawberry.field
+    def post(self, postId: strawberry.ID) -> PostLikes:
+        return PostLikes(postId=_normalize_id(postId))
 
 schema = strawberry.Schema(query=Query)
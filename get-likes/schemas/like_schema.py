@@ -1,8 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 
+# Feeds render 20-50 posts at once
+MAX_BATCH_POST_IDS = 100
+
 class LikeDetail(BaseModel):
     likeId: UUID
     postId: UUID
@@ -16,6 +19,7 @@ class LikeListResponse(BaseModel):
     postId: UUID
     likes_count: int
     likes_details: List[LikeDetail]
+    next_cursor: Optional[str] = None
 
     class Config:
         orm_mode = True
@@ -30,6 +34,111 @@ class LikeListResponse(BaseModel):
                         "petId": "b35beaad-f5fd-4a77-bf68-9dbca72b36f2",
                         "createdAt": "2025-06-27T10:30:00"
                     }
+                ],
+                "next_cursor": "WyIyMDI1LTA2LTI3VDEwOjMwOjAwIiwiYTYyNzMxYmYtMTE0OC00OGQ3LWFhMjktOWU3YzQ2NjdiZTg3Il0"
+            }
+        }
+
+class LikesBatchRequest(BaseModel):
+    postIds: List[UUID] = Field(..., min_length=1, max_length=MAX_BATCH_POST_IDS)
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "postIds": [
+                    "998e719c-848c-4f60-9ff2-8d86a0a9616c",
+                    "123e4567-e89b-12d3-a456-426614174000"
+                ]
+            }
+        }
+
+class LikesCount(BaseModel):
+    postId: UUID
+    likes_count: Optional[int]
+
+class LikesBatchResponse(BaseModel):
+    counts: List[LikesCount]
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "counts": [
+                    {"postId": "998e719c-848c-4f60-9ff2-8d86a0a9616c", "likes_count": 5},
+                    {"postId": "123e4567-e89b-12d3-a456-426614174000", "likes_count": None}
+                ]
+            }
+        }
+
+class LikeStatusRequest(BaseModel):
+    petId: UUID
+    postIds: List[UUID] = Field(..., min_length=1, max_length=MAX_BATCH_POST_IDS)
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "petId": "b35beaad-f5fd-4a77-bf68-9dbca72b36f2",
+                "postIds": [
+                    "998e719c-848c-4f60-9ff2-8d86a0a9616c",
+                    "123e4567-e89b-12d3-a456-426614174000"
+                ]
+            }
+        }
+
+class LikeStatus(BaseModel):
+    postId: UUID
+    liked: bool
+
+class LikeStatusResponse(BaseModel):
+    petId: UUID
+    statuses: List[LikeStatus]
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "petId": "b35beaad-f5fd-4a77-bf68-9dbca72b36f2",
+                "statuses": [
+                    {"postId": "998e719c-848c-4f60-9ff2-8d86a0a9616c", "liked": True},
+                    {"postId": "123e4567-e89b-12d3-a456-426614174000", "liked": False}
+                ]
+            }
+        }
+
+class TopLikedPost(BaseModel):
+    postId: UUID
+    likes_count: int
+
+class TopLikedResponse(BaseModel):
+    posts: List[TopLikedPost]
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "posts": [
+                    {"postId": "998e719c-848c-4f60-9ff2-8d86a0a9616c", "likes_count": 120},
+                    {"postId": "123e4567-e89b-12d3-a456-426614174000", "likes_count": 87}
+                ]
+            }
+        }
+
+class TrendingPost(BaseModel):
+    postId: UUID
+    score: float
+
+class TrendingResponse(BaseModel):
+    bucket_seconds: int
+    window_buckets: int
+    decay: float
+    posts: List[TrendingPost]
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "bucket_seconds": 3600,
+                "window_buckets": 24,
+                "decay": 0.8,
+                "posts": [
+                    {"postId": "998e719c-848c-4f60-9ff2-8d86a0a9616c", "score": 14.2},
+                    {"postId": "123e4567-e89b-12d3-a456-426614174000", "score": 9.6}
                 ]
             }
         }
@@ -0,0 +1,77 @@
+import os
+import sys
+import asyncio
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from schemas import graphql_schema
+
+
+def test_liked_statuses_are_loaded_with_one_call_per_pet(monkeypatch):
+    calls = []
+
+    async def fake_get_pet_likes(petId, postIds):
+        calls.append((petId, postIds))
+        return {postId: postId == "p1" for postId in postIds}
+
+    monkeypatch.setattr(graphql_schema, "get_pet_likes_controller", fake_get_pet_likes)
+    keys = [("p1", "petA"), ("p2", "petA"), ("p1", "petB")]
+    assert asyncio.run(graphql_schema.load_liked_statuses(keys)) == [True, False, True]
+    assert calls == [("petA", ["p1", "p2"]), ("petB", ["p1"])]
+
+
+def test_likes_only_selection_runs_just_the_page_query(monkeypatch):
+    from datetime import datetime
+    from uuid import uuid4
+    from types import SimpleNamespace
+    from controllers import like_controller
+
+    postId = str(uuid4())
+    likes = [
+        SimpleNamespace(id=uuid4(), postId=postId, petId=uuid4(), createdAt=datetime(2024, 1, 1, 0, 0, i))
+        for i in range(3)
+    ]
+    statements = []
+
+    class _Session:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def execute(self, statement):
+            statements.append(statement)
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: likes))
+
+    def no_posts_session():
+        raise AssertionError("the Posts database must not be queried")
+
+    async def no_counts(postIds):
+        raise AssertionError("the count must not be loaded")
+
+    async def cache_miss(postId):
+        return False, None, None
+
+    monkeypatch.setattr(like_controller, "SessionReactions", _Session)
+    monkeypatch.setattr(like_controller, "SessionPost", no_posts_session)
+    monkeypatch.setattr(like_controller.likes_cache, "read", cache_miss)
+    monkeypatch.setattr(graphql_schema, "get_likes_counts_controller", no_counts)
+
+    async def run():
+        return await graphql_schema.schema.execute(
+            "query($postId: ID!) { post(postId: $postId) { likes(first: 2) { edges { node { likeId } } pageInfo { hasNextPage } } } }",
+            variable_values={"postId": postId},
+            context_value=await graphql_schema.get_context(),
+        )
+
+    result = asyncio.run(run())
+    assert result.errors is None
+    connection = result.data["post"]["likes"]
+    assert [edge["node"]["likeId"] for edge in connection["edges"]] == [str(like.id) for like in likes[:2]]
+    assert connection["pageInfo"]["hasNextPage"] is True
+    # A single statement, against the Likes table
+    assert len(statements) == 1
+    assert [table.name for table in statements[0].get_final_froms()] == ["Likes"]
@@ -0,0 +1,44 @@
+import os
+import sys
+from datetime import datetime
+from uuid import UUID
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+import orjson
+from utils.json_response import FastJSONResponse
+from utils.pagination import decode_cursor
+
+
+class DriverUUID(UUID):
+    """Stands in for asyncpg's uuid.UUID subclass."""
+
+
+def test_native_like_values_are_encoded_as_iso_strings():
+    like = {
+        "likeId": DriverUUID("a62731bf-1148-48d7-aa29-9e7c4667be87"),
+        "postId": UUID("998e719c-848c-4f60-9ff2-8d86a0a9616c"),
+        "petId": UUID("b35beaad-f5fd-4a77-bf68-9dbca72b36f2"),
+        "createdAt": datetime(2025, 6, 27, 10, 30, 0, 123456),
+    }
+    body = orjson.loads(FastJSONResponse({"likes_details": [like]}).body)
+    assert body["likes_details"][0] == {
+        "likeId": "a62731bf-1148-48d7-aa29-9e7c4667be87",
+        "postId": "998e719c-848c-4f60-9ff2-8d86a0a9616c",
+        "petId": "b35beaad-f5fd-4a77-bf68-9dbca72b36f2",
+        "createdAt": "2025-06-27T10:30:00.123456",
+    }
+
+
+def test_cursor_is_the_same_for_native_and_cached_likes():
+    from controllers.like_controller import _build_page
+
+    native = [{"likeId": like_id, "createdAt": datetime(2025, 6, 27, 10, 30, i)}
+              for i, like_id in enumerate([DriverUUID(int=1), DriverUUID(int=2)])]
+    cached = orjson.loads(FastJSONResponse(native).body)
+    _, native_cursor = _build_page(native, 1)
+    _, cached_cursor = _build_page(cached, 1)
+    assert native_cursor == cached_cursor
+    assert decode_cursor(native_cursor) == (datetime(2025, 6, 27, 10, 30, 0), UUID(int=1))
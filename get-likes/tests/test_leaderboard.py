@@ -0,0 +1,26 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from utils import leaderboard
+
+
+def test_bucket_boundaries_and_expiry():
+    start = datetime(2024, 1, 1, 10, 0, 0)
+    assert leaderboard.bucket_of(start) == leaderboard.bucket_of(start + timedelta(seconds=leaderboard.TRENDING_BUCKET_SECONDS - 1))
+    assert leaderboard.bucket_of(start + timedelta(seconds=leaderboard.TRENDING_BUCKET_SECONDS)) == leaderboard.bucket_of(start) + 1
+
+    bucket = leaderboard.bucket_of(start)
+    # A bucket expires once it is older than the window
+    assert leaderboard.bucket_expires_at(bucket) == (bucket + leaderboard.TRENDING_WINDOW_BUCKETS + 1) * leaderboard.TRENDING_BUCKET_SECONDS
+
+
+def test_window_starts_at_current_bucket():
+    buckets = leaderboard._window_buckets()
+    assert len(buckets) == leaderboard.TRENDING_WINDOW_BUCKETS
+    assert buckets[0] == leaderboard.bucket_of(datetime.utcnow())
+    assert buckets == sorted(buckets, reverse=True)
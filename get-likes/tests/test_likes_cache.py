@@ -0,0 +1,65 @@
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from utils.likes_cache import jittered_ttl, LIKES_CACHE_TTL, LIKES_CACHE_TTL_JITTER
+from utils.pagination import decode_cursor
+
+
+def test_jittered_ttl_stays_within_bounds():
+    ttls = {jittered_ttl(LIKES_CACHE_TTL) for _ in range(200)}
+    assert min(ttls) >= LIKES_CACHE_TTL * (1 - LIKES_CACHE_TTL_JITTER) - 1
+    assert max(ttls) <= LIKES_CACHE_TTL * (1 + LIKES_CACHE_TTL_JITTER) + 1
+    assert len(ttls) > 1
+
+
+def test_build_page_from_cached_first_page():
+    from controllers.like_controller import _build_page
+
+    first_page = [
+        {"likeId": f"00000000-0000-0000-0000-00000000000{i}", "createdAt": f"2025-06-27T10:30:0{i}"}
+        for i in range(3)
+    ]
+    likes, next_cursor = _build_page(first_page, 2)
+    assert len(likes) == 2
+    assert str(decode_cursor(next_cursor)[1]) == first_page[1]["likeId"]
+
+    likes, next_cursor = _build_page(first_page, 3)
+    assert len(likes) == 3 and next_cursor is None
+
+
+def test_batch_counts_served_from_cache_are_deduplicated(monkeypatch):
+    import asyncio
+    from controllers import like_controller
+    from utils import likes_cache
+
+    requested = []
+
+    async def fake_read_counts(postIds):
+        requested.append(postIds)
+        return {"a": (False, 3), "b": (True, None)}
+
+    monkeypatch.setattr(likes_cache, "read_counts", fake_read_counts)
+    counts = asyncio.run(like_controller.get_likes_counts_controller(["a", "b", "a"]))
+    assert counts == {"a": 3, "b": None}
+    assert requested == [["a", "b"]]
+
+
+def test_pet_likes_answered_from_cached_index_without_db(monkeypatch):
+    import asyncio
+    from controllers import like_controller
+    from utils import pet_likes_index
+
+    async def fake_read(petId, postIds):
+        return {postId: postId == "p1" for postId in postIds}
+
+    async def fail_begin_build(petId):
+        raise AssertionError("the index should not be rebuilt on a hit")
+
+    monkeypatch.setattr(pet_likes_index, "read", fake_read)
+    monkeypatch.setattr(pet_likes_index, "begin_build", fail_begin_build)
+    statuses = asyncio.run(like_controller.get_pet_likes_controller("petA", ["p1", "p2", "p1"]))
+    assert statuses == {"p1": True, "p2": False}
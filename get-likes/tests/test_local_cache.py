@@ -0,0 +1,34 @@
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from utils.local_cache import LocalCache
+
+
+def test_lru_eviction_and_counters():
+    cache = LocalCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # "b" is the least recently used
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1)
+
+
+def test_entries_expire_and_can_be_invalidated():
+    cache = LocalCache(max_size=10, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+    cache.ttl = 60
+    cache.set("b", 2)
+    cache.invalidate("b")
+    assert cache.get("b") is None
+    assert cache.stats()["invalidations"] == 1
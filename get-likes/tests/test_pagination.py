@@ -0,0 +1,38 @@
+import os
+import sys
+import pytest
+from datetime import datetime
+from uuid import uuid4
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from utils.pagination import encode_cursor, decode_cursor, InvalidCursorError
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 6, 27, 10, 30, 0, 123456)
+    like_id = uuid4()
+    assert decode_cursor(encode_cursor(created_at, like_id)) == (created_at, like_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "WyJ4Il0"])
+def test_invalid_cursor_raises(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+def test_page_ending_on_a_like_without_created_at_has_a_valid_cursor():
+    from controllers.like_controller import _build_page
+    from utils.pagination import EPOCH
+
+    likes = [
+        {"likeId": uuid4(), "postId": uuid4(), "petId": uuid4(), "createdAt": None},
+        {"likeId": uuid4(), "postId": uuid4(), "petId": uuid4(), "createdAt": None},
+        {"likeId": uuid4(), "postId": uuid4(), "petId": uuid4(), "createdAt": datetime(2025, 6, 27)},
+    ]
+    page, next_cursor = _build_page(likes, 2)
+    assert len(page) == 2
+    # Same position the backfilled row has after the NOT NULL migration, so the next page starts right after it
+    assert decode_cursor(next_cursor) == (EPOCH, likes[1]["likeId"])
@@ -0,0 +1,22 @@
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _default(value):
+    # asyncpg returns its own uuid.UUID subclass, which orjson only encodes through `default`
+    return str(value)
+
+
+def dumps(content) -> bytes:
+    """Serializa a JSON con orjson; UUIDs y datetimes se codifican de forma nativa."""
+    return orjson.dumps(content, default=_default)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Respuesta JSON codificada con orjson. Devolverla directamente desde una ruta evita que
+    FastAPI vuelva a validar el contenido con el response_model.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
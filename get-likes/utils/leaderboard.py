@@ -0,0 +1,199 @@
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import select, func
+from redis.exceptions import WatchError
+from dotenv import load_dotenv
+from config.db import SessionReactions
+from config.redis_client import redis_client
+from models.like_model import Like
+from utils.metrics import record_cache_lookup
+
+load_dotenv()
+
+# Trending likes are counted in buckets of TRENDING_BUCKET_SECONDS; the last TRENDING_WINDOW_BUCKETS
+# buckets are kept and each bucket weighs TRENDING_DECAY times the next one (time decay)
+TRENDING_BUCKET_SECONDS = int(os.getenv("TRENDING_BUCKET_SECONDS", 3600))
+TRENDING_WINDOW_BUCKETS = int(os.getenv("TRENDING_WINDOW_BUCKETS", 24))
+TRENDING_DECAY = float(os.getenv("TRENDING_DECAY", 0.8))
+# Seconds the rolled-up trending set is reused before the buckets are merged again
+TRENDING_ROLLUP_TTL = int(os.getenv("TRENDING_ROLLUP_TTL", 60))
+LEADERBOARD_MAX_LIMIT = 100
+# Seconds a request waits for the rebuild started by another worker
+LEADERBOARD_REBUILD_WAIT = 5.0
+LEADERBOARD_REBUILD_TIMEOUT = 60
+# Rebuilds discarded because a like arrived meanwhile before the last attempt is stored anyway
+LEADERBOARD_REBUILD_ATTEMPTS = 3
+# Rows per ZADD while rebuilding
+LEADERBOARD_REBUILD_CHUNK_SIZE = 1000
+
+# Present while the sorted sets are complete; add-like and remove-like only update them then
+LEADERBOARD_READY_KEY = "leaderboard:likes:ready"
+# postId -> total likes
+TOP_LIKED_KEY = "leaderboard:likes:top"
+# postId -> likes given during the bucket (expires when it leaves the window)
+TRENDING_BUCKET_KEY = "leaderboard:likes:trending:{bucket}"
+# postId -> time-decayed sum of the buckets of the window
+TRENDING_KEY = "leaderboard:likes:trending"
+LEADERBOARD_REBUILD_LOCK_KEY = "leaderboard:likes:rebuild"
+# Token of the rebuild in progress; add-like and remove-like delete it when they skip a like
+LEADERBOARD_BUILD_KEY = "leaderboard:likes:build"
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Merges the window buckets into TRENDING_KEY with their decay weights when the previous
+# roll-up has expired, then returns the top ARGV[2] members
+_TRENDING_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 and #KEYS > 1 then
+    local command = {'ZUNIONSTORE', KEYS[1], #KEYS - 1}
+    for i = 2, #KEYS do
+        command[#command + 1] = KEYS[i]
+    end
+    command[#command + 1] = 'WEIGHTS'
+    for i = 3, #ARGV do
+        command[#command + 1] = ARGV[i]
+    end
+    redis.call(unpack(command))
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return redis.call('ZREVRANGE', KEYS[1], 0, tonumber(ARGV[2]) - 1, 'WITHSCORES')
+"""
+_trending = redis_client.register_script(_TRENDING_SCRIPT)
+
+
+class LeaderboardUnavailable(Exception):
+    pass
+
+
+def bucket_of(moment: datetime) -> int:
+    """Número del bucket de tendencias de un instante (UTC sin zona, como Likes.createdAt)."""
+    return int((moment - _EPOCH).total_seconds() // TRENDING_BUCKET_SECONDS)
+
+
+def bucket_expires_at(bucket: int) -> int:
+    """Un bucket se guarda mientras forma parte de la ventana de tendencias."""
+    return (bucket + TRENDING_WINDOW_BUCKETS + 1) * TRENDING_BUCKET_SECONDS
+
+
+def _window_buckets() -> list:
+    """Buckets de la ventana, del actual al más antiguo."""
+    current = bucket_of(datetime.utcnow())
+    return [current - age for age in range(TRENDING_WINDOW_BUCKETS)]
+
+
+async def _read_aggregates():
+    """Un GROUP BY postId para el total y otro por bucket para la ventana de tendencias."""
+    window_start = _EPOCH + timedelta(seconds=_window_buckets()[-1] * TRENDING_BUCKET_SECONDS)
+    bucket = func.floor(func.extract("epoch", Like.createdAt) / TRENDING_BUCKET_SECONDS)
+    async with SessionReactions() as db_reactions:
+        totals = (await db_reactions.execute(
+            select(Like.postId, func.count()).group_by(Like.postId)
+        )).all()
+        buckets = (await db_reactions.execute(
+            select(Like.postId, bucket, func.count())
+            .where(Like.createdAt >= window_start)
+            .group_by(Like.postId, bucket)
+        )).all()
+    return totals, buckets
+
+
+async def _store(token: str, totals: list, buckets: list, force: bool) -> bool:
+    """
+    Sustituye los sorted sets y marca el ranking como listo, salvo que un like/unlike haya
+    borrado el token de la reconstrucción desde que se leyó la base de datos (WATCH).
+    """
+    by_bucket = {}
+    for postId, bucket_number, count in buckets:
+        by_bucket.setdefault(int(bucket_number), {})[str(postId)] = count
+
+    async with redis_client.pipeline(transaction=True) as pipe:
+        if not force:
+            await pipe.watch(LEADERBOARD_BUILD_KEY)
+            if await pipe.get(LEADERBOARD_BUILD_KEY) != token:
+                return False
+            pipe.multi()
+        pipe.delete(TOP_LIKED_KEY, TRENDING_KEY, *(TRENDING_BUCKET_KEY.format(bucket=b) for b in _window_buckets()))
+        for start in range(0, len(totals), LEADERBOARD_REBUILD_CHUNK_SIZE):
+            pipe.zadd(TOP_LIKED_KEY, {str(postId): count for postId, count in totals[start:start + LEADERBOARD_REBUILD_CHUNK_SIZE]})
+        for bucket_number, counts in by_bucket.items():
+            key = TRENDING_BUCKET_KEY.format(bucket=bucket_number)
+            pipe.zadd(key, counts)
+            pipe.expireat(key, bucket_expires_at(bucket_number))
+        pipe.delete(LEADERBOARD_BUILD_KEY)
+        # No expiry: the sets are only rebuilt when the marker is missing (first use, Redis flush)
+        pipe.set(LEADERBOARD_READY_KEY, datetime.utcnow().isoformat())
+        try:
+            await pipe.execute()
+        except WatchError:
+            return False
+    return True
+
+
+async def _rebuild():
+    """
+    Reconstruye los rankings desde la tabla Likes (primer uso, flush de Redis o reconciliación
+    periódica). Mientras no están listos, add-like y remove-like no los actualizan y borran el
+    token de la reconstrucción: si eso ocurre la lectura puede no incluir ese like y se repite.
+    """
+    for attempt in range(1, LEADERBOARD_REBUILD_ATTEMPTS + 1):
+        token = str(uuid.uuid4())
+        await redis_client.set(LEADERBOARD_BUILD_KEY, token, ex=LEADERBOARD_REBUILD_TIMEOUT)
+        totals, buckets = await _read_aggregates()
+        if await _store(token, totals, buckets, force=attempt == LEADERBOARD_REBUILD_ATTEMPTS):
+            print(f"[Leaderboard] Ranking reconstruido: {len(totals)} posts, {len(buckets)} entradas de tendencias")
+            return
+        print("[Leaderboard] Likes recibidos durante la reconstrucción, se repite la lectura")
+
+
+async def ensure_built():
+    """
+    Garantiza que los sorted sets existen. Si no están listos (flush de Redis o reconciliación),
+    un solo worker los reconstruye desde la base de datos; el resto sirve los anteriores si
+    existen o espera hasta LEADERBOARD_REBUILD_WAIT segundos.
+    """
+    if await redis_client.exists(LEADERBOARD_READY_KEY):
+        record_cache_lookup("leaderboard", True)
+        return
+    record_cache_lookup("leaderboard", False)
+
+    token = str(uuid.uuid4())
+    if await redis_client.set(LEADERBOARD_REBUILD_LOCK_KEY, token, nx=True, ex=LEADERBOARD_REBUILD_TIMEOUT):
+        try:
+            await _rebuild()
+        finally:
+            if await redis_client.get(LEADERBOARD_REBUILD_LOCK_KEY) == token:
+                await redis_client.delete(LEADERBOARD_REBUILD_LOCK_KEY)
+        return
+
+    # Periodic rebuild: the previous sets are served meanwhile
+    if await redis_client.exists(TOP_LIKED_KEY):
+        return
+
+    deadline = asyncio.get_running_loop().time() + LEADERBOARD_REBUILD_WAIT
+    while asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.1)
+        if await redis_client.exists(LEADERBOARD_READY_KEY):
+            return
+    raise LeaderboardUnavailable("Leaderboard is being rebuilt")
+
+
+async def top_liked(limit: int) -> list:
+    """Posts con más likes: [(postId, likes)] de mayor a menor."""
+    await ensure_built()
+    entries = await redis_client.zrevrange(TOP_LIKED_KEY, 0, limit - 1, withscores=True)
+    return [(postId, int(score)) for postId, score in entries]
+
+
+async def trending(limit: int) -> list:
+    """
+    Posts en tendencia: [(postId, score)] donde score es la suma de los likes de cada bucket
+    de la ventana ponderada por TRENDING_DECAY ** antigüedad del bucket.
+    """
+    await ensure_built()
+    buckets = _window_buckets()
+    values = await _trending(
+        keys=[TRENDING_KEY, *(TRENDING_BUCKET_KEY.format(bucket=b) for b in buckets)],
+        args=[TRENDING_ROLLUP_TTL, limit, *(TRENDING_DECAY ** age for age in range(len(buckets)))],
+    )
+    return [(values[i], round(float(values[i + 1]), 4)) for i in range(0, len(values), 2)]
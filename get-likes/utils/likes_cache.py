@@ -0,0 +1,196 @@
+import asyncio
+import os
+import random
+import uuid
+import orjson
+from dotenv import load_dotenv
+from config.redis_client import redis_client
+from utils.json_response import dumps
+from utils.local_cache import local_cache, local_cache_invalidator
+from utils.metrics import record_cache_lookup
+
+load_dotenv()
+
+LIKES_CACHE_TTL = int(os.getenv("LIKES_CACHE_TTL", 60))
+# TTLs are spread +/- this fraction so hot keys written together do not expire together
+LIKES_CACHE_TTL_JITTER = float(os.getenv("LIKES_CACHE_TTL_JITTER", 0.1))
+# How long a "post not found" answer is cached
+LIKES_NEGATIVE_CACHE_TTL = int(os.getenv("LIKES_NEGATIVE_CACHE_TTL", 10))
+# Lifetime of the repopulation lock (safety net if the holder dies)
+LIKES_CACHE_LOCK_TIMEOUT = float(os.getenv("LIKES_CACHE_LOCK_TIMEOUT", 5.0))
+# How long other requests wait for the lock holder before loading from the DB themselves
+LIKES_CACHE_LOCK_WAIT = float(os.getenv("LIKES_CACHE_LOCK_WAIT", 1.0))
+LIKES_CACHE_LOCK_POLL_INTERVAL = 0.05
+
+# Count key is also updated in place (write-through) by add-like and remove-like
+LIKES_COUNT_KEY = "post:{postId}:likes_count"
+# First page of likes as JSON; add-like and remove-like delete it when a change can alter it
+LIKES_PAGE_KEY = "post:{postId}:likes_page"
+POST_MISSING_KEY = "post:{postId}:missing"
+# Likes added/removed by add-like and remove-like that are not yet applied to Posts.likes
+PENDING_LIKES_DELTAS_KEY = "posts:likes:pending"
+# Claimed copies of that hash being applied by a flush, and the counter of flush claims/releases
+FLUSHING_LIKES_DELTAS_KEY = "posts:likes:flushing"
+LIKES_FLUSH_GENERATION_KEY = "posts:likes:flush_generation"
+LIKES_CACHE_LOCK_KEY = "post:{postId}:likes_lock"
+
+# Deletes the lock only if it still belongs to this request
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+_release_lock = redis_client.register_script(_RELEASE_LOCK_SCRIPT)
+
+
+def jittered_ttl(ttl: int) -> int:
+    """Devuelve el TTL con una variación aleatoria de +/- LIKES_CACHE_TTL_JITTER."""
+    return max(1, round(ttl * random.uniform(1 - LIKES_CACHE_TTL_JITTER, 1 + LIKES_CACHE_TTL_JITTER)))
+
+
+async def read(postId) -> tuple:
+    """
+    Lee la entrada de caché de un post: primero la caché local del proceso (si está activa)
+    y después Redis, en una sola ida.
+    Devuelve (missing, likes_count, first_page); los valores no cacheados vienen como None.
+    """
+    use_local_cache = local_cache_invalidator.subscribed
+    if use_local_cache:
+        entry = local_cache.get(str(postId))
+        record_cache_lookup("likes_local", entry is not None)
+        if entry is not None:
+            return entry
+
+    missing, count, page = await redis_client.mget(
+        POST_MISSING_KEY.format(postId=postId),
+        LIKES_COUNT_KEY.format(postId=postId),
+        LIKES_PAGE_KEY.format(postId=postId),
+    )
+    entry = (
+        missing is not None,
+        int(count) if count is not None else None,
+        orjson.loads(page) if page is not None else None,
+    )
+    complete = entry[0] or (entry[1] is not None and entry[2] is not None)
+    record_cache_lookup("likes", complete)
+    # Only complete entries are kept locally
+    if use_local_cache and complete:
+        local_cache.set(str(postId), entry)
+    return entry
+
+
+async def read_counts(postIds: list) -> dict:
+    """
+    Lee los contadores de varios posts: caché local y, para el resto, un solo MGET en Redis
+    de contadores y marcadores de post inexistente.
+    Devuelve {postId: (missing, likes_count)}; los contadores no cacheados vienen como None.
+    """
+    entries = {}
+    remaining = []
+    for postId in postIds:
+        entry = local_cache.get(postId) if local_cache_invalidator.subscribed else None
+        if entry is not None:
+            entries[postId] = (entry[0], entry[1])
+        else:
+            remaining.append(postId)
+
+    if remaining:
+        values = await redis_client.mget(
+            [LIKES_COUNT_KEY.format(postId=postId) for postId in remaining]
+            + [POST_MISSING_KEY.format(postId=postId) for postId in remaining]
+        )
+        for i, postId in enumerate(remaining):
+            count, missing = values[i], values[len(remaining) + i]
+            entries[postId] = (missing is not None, int(count) if count is not None else None)
+    hits = sum(1 for missing, count in entries.values() if missing or count is not None)
+    record_cache_lookup("likes_count", True, hits)
+    record_cache_lookup("likes_count", False, len(entries) - hits)
+    return entries
+
+
+async def flush_generation():
+    """Generación de flush de Posts.likes; se lee antes de consultar Posts para read_pending_deltas()."""
+    return await redis_client.get(LIKES_FLUSH_GENERATION_KEY)
+
+
+async def read_pending_deltas(postIds: list, generation) -> tuple:
+    """
+    Lee los deltas pendientes de Posts.likes (leer después de Posts). Devuelve
+    ({postId: delta}, cacheable): si un flush empezó, terminó o sigue en curso desde que se leyó
+    `generation`, Posts.likes y los deltas pueden no cuadrar y el contador no se debe cachear.
+    """
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.hmget(PENDING_LIKES_DELTAS_KEY, postIds)
+        pipe.get(LIKES_FLUSH_GENERATION_KEY)
+        pipe.zcard(FLUSHING_LIKES_DELTAS_KEY)
+        deltas, current_generation, flushing = await pipe.execute()
+    return (
+        {postId: int(delta or 0) for postId, delta in zip(postIds, deltas)},
+        current_generation == generation and flushing == 0,
+    )
+
+
+async def write_counts(likes_counts: dict, missing_postIds: list):
+    """
+    Guarda varios contadores (sin sobrescribir los existentes) y marcadores de post inexistente en un pipeline.
+    """
+    if not likes_counts and not missing_postIds:
+        return
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for postId, likes_count in likes_counts.items():
+            pipe.set(LIKES_COUNT_KEY.format(postId=postId), likes_count, ex=jittered_ttl(LIKES_CACHE_TTL), nx=True)
+        for postId in missing_postIds:
+            pipe.set(POST_MISSING_KEY.format(postId=postId), 1, ex=LIKES_NEGATIVE_CACHE_TTL)
+        await pipe.execute()
+
+
+async def write(postId, likes_count: int, first_page: list) -> int:
+    """
+    Guarda el contador y la primera página de likes con TTLs con jitter.
+    El contador solo se escribe si no existe (puede haberlo actualizado ya add-like/remove-like);
+    devuelve el contador que queda en caché.
+    """
+    count_key = LIKES_COUNT_KEY.format(postId=postId)
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.set(count_key, likes_count, ex=jittered_ttl(LIKES_CACHE_TTL), nx=True)
+        pipe.set(
+            LIKES_PAGE_KEY.format(postId=postId),
+            dumps(first_page),
+            ex=jittered_ttl(LIKES_CACHE_TTL)
+        )
+        pipe.get(count_key)
+        _, _, cached_count = await pipe.execute()
+    return int(cached_count) if cached_count is not None else likes_count
+
+
+async def write_missing(postId):
+    """Cachea durante poco tiempo que el post no existe."""
+    await redis_client.set(POST_MISSING_KEY.format(postId=postId), 1, ex=LIKES_NEGATIVE_CACHE_TTL)
+
+
+async def single_flight(postId, load) -> tuple:
+    """
+    Repuebla la caché de un post con una sola llamada a `load` entre todas las réplicas.
+    Quien obtiene el lock ejecuta `load`; el resto espera a que la caché se rellene (como
+    mucho LIKES_CACHE_LOCK_WAIT segundos) y, si no llega, carga por su cuenta.
+    `load` debe devolver lo mismo que read().
+    """
+    lock_key = LIKES_CACHE_LOCK_KEY.format(postId=postId)
+    token = str(uuid.uuid4())
+    if await redis_client.set(lock_key, token, nx=True, px=int(LIKES_CACHE_LOCK_TIMEOUT * 1000)):
+        try:
+            return await load()
+        finally:
+            await _release_lock(keys=[lock_key], args=[token])
+
+    waited = 0.0
+    while waited < LIKES_CACHE_LOCK_WAIT:
+        await asyncio.sleep(LIKES_CACHE_LOCK_POLL_INTERVAL)
+        waited += LIKES_CACHE_LOCK_POLL_INTERVAL
+        missing, likes_count, first_page = await read(postId)
+        if missing or (likes_count is not None and first_page is not None):
+            return missing, likes_count, first_page
+
+    print(f"[Cache] Timeout esperando el lock de {lock_key}, cargando desde la base de datos")
+    return await load()
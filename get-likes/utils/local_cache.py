@@ -0,0 +1,122 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from dotenv import load_dotenv
+from config.redis_client import redis_client
+
+load_dotenv()
+
+LOCAL_CACHE_ENABLED = os.getenv("LOCAL_CACHE_ENABLED", "false").lower() == "true"
+LOCAL_CACHE_MAX_SIZE = int(os.getenv("LOCAL_CACHE_MAX_SIZE", 10000))
+# Upper bound on staleness if an invalidation message is missed
+LOCAL_CACHE_TTL = float(os.getenv("LOCAL_CACHE_TTL", 1.0))
+LOCAL_CACHE_RECONNECT_DELAY = 1.0
+
+# add-like and remove-like publish the postId here whenever its likes change
+LIKES_INVALIDATION_CHANNEL = "likes:invalidate"
+
+
+class LocalCache:
+    """
+    Caché LRU en memoria del proceso, acotada en tamaño y con TTL corto, delante de Redis.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key):
+        if self._entries.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": LOCAL_CACHE_ENABLED,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class LocalCacheInvalidator:
+    """
+    Suscriptor Redis pub/sub que borra de la caché local los posts modificados por add-like y remove-like.
+    Si se pierde la conexión, vacía la caché (pudo perder mensajes) y se vuelve a suscribir.
+    """
+
+    def __init__(self, cache: LocalCache):
+        self.cache = cache
+        self._task = None
+        # The local cache is only used while invalidations are being received
+        self.subscribed = False
+
+    async def start(self):
+        if not LOCAL_CACHE_ENABLED:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.subscribe(LIKES_INVALIDATION_CHANNEL)
+                # Anything cached before the subscription may have missed its invalidation
+                self.cache.clear()
+                self.subscribed = True
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.cache.invalidate(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[LocalCache] Error en la suscripción de invalidaciones: {str(e)}")
+                self.subscribed = False
+                self.cache.clear()
+                await asyncio.sleep(LOCAL_CACHE_RECONNECT_DELAY)
+            finally:
+                self.subscribed = False
+                await pubsub.aclose()
+
+
+local_cache = LocalCache(LOCAL_CACHE_MAX_SIZE, LOCAL_CACHE_TTL)
+local_cache_invalidator = LocalCacheInvalidator(local_cache)
@@ -0,0 +1,40 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# Likes.createdAt that were NULL before it became NOT NULL are backfilled with this value
+EPOCH = datetime(1970, 1, 1)
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime | str | None, like_id: UUID | str) -> str:
+    """
+    Codifica la posición (createdAt, id) del último Like de una página en un cursor opaco.
+    createdAt puede venir como datetime o ya en formato ISO (likes leídos de la caché); un
+    createdAt nulo se codifica como EPOCH, el valor con el que lo rellena la migración.
+    """
+    if created_at is None:
+        created_at = EPOCH
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    raw = json.dumps([created_at, str(like_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Decodifica un cursor generado por encode_cursor.
+    Lanza InvalidCursorError si el cursor está mal formado.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, like_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), UUID(like_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(str(e))
@@ -0,0 +1,64 @@
+import os
+import uuid
+from dotenv import load_dotenv
+from config.redis_client import redis_client
+from utils.metrics import record_cache_lookup
+
+load_dotenv()
+
+PET_LIKES_INDEX_TTL = int(os.getenv("PET_LIKES_INDEX_TTL", 600))
+# Pets with more likes than this are answered from the DB only (the set is not built)
+PET_LIKES_INDEX_MAX_SIZE = int(os.getenv("PET_LIKES_INDEX_MAX_SIZE", 5000))
+PET_LIKES_INDEX_BUILD_TIMEOUT = 10
+
+# Set of postIds liked by the pet; add-like and remove-like SADD/SREM it while it exists
+PET_LIKED_POSTS_KEY = "pet:{petId}:liked_posts"
+# Token of the build in progress; add-like and remove-like delete it to cancel a stale build
+PET_LIKED_POSTS_BUILD_KEY = "pet:{petId}:liked_posts:build"
+# Member that keeps the set alive for pets without likes (Redis drops empty sets)
+EMPTY_SET_MARKER = "-"
+
+# Stores the set only if no like/unlike of the pet happened since the build started
+_COMMIT_BUILD_SCRIPT = """
+if redis.call('GET', KEYS[2]) ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[2], KEYS[1])
+redis.call('SADD', KEYS[1], unpack(ARGV, 3))
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+_commit_build = redis_client.register_script(_COMMIT_BUILD_SCRIPT)
+
+
+async def read(petId, postIds: list):
+    """
+    Consulta en una sola ida a Redis qué posts de la lista tienen like de la mascota.
+    Devuelve {postId: True/False}, o None si el índice de la mascota no está en caché.
+    """
+    key = PET_LIKED_POSTS_KEY.format(petId=petId)
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.exists(key)
+        pipe.smismember(key, postIds)
+        exists, members = await pipe.execute()
+    record_cache_lookup("pet_likes_index", bool(exists))
+    if not exists:
+        return None
+    return {postId: bool(is_member) for postId, is_member in zip(postIds, members)}
+
+
+async def begin_build(petId) -> str:
+    """Marca el inicio de la reconstrucción del índice y devuelve su token."""
+    token = str(uuid.uuid4())
+    await redis_client.set(PET_LIKED_POSTS_BUILD_KEY.format(petId=petId), token, ex=PET_LIKES_INDEX_BUILD_TIMEOUT)
+    return token
+
+
+async def commit_build(petId, token: str, liked_postIds: list) -> bool:
+    """
+    Guarda el índice leído de la base de datos, salvo que un like/unlike de la mascota lo haya invalidado.
+    """
+    return bool(await _commit_build(
+        keys=[PET_LIKED_POSTS_KEY.format(petId=petId), PET_LIKED_POSTS_BUILD_KEY.format(petId=petId)],
+        args=[token, PET_LIKES_INDEX_TTL, EMPTY_SET_MARKER, *liked_postIds]
+    ))
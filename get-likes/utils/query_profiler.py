@@ -0,0 +1,156 @@
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from dotenv import load_dotenv
+from config.db import engine_pet, engine_post, engine_reactions
+
+load_dotenv()
+
+# Opt-in profiling mode (development, load tests, CI); it adds an EXPLAIN per slow statement
+QUERY_PROFILING = os.getenv("QUERY_PROFILING", "false").lower() == "true"
+# Statements slower than this are logged with their EXPLAIN plan
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 100))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+# Statements allowed per request when the endpoint has no budget of its own (0 = no limit)
+QUERY_BUDGET_DEFAULT = int(os.getenv("QUERY_BUDGET_DEFAULT", 0))
+# "warn" logs the requests over budget; "raise" fails them (use it in tests and CI)
+QUERY_BUDGET_MODE = os.getenv("QUERY_BUDGET_MODE", "warn").lower()
+
+
+def _parse_budgets(value: str) -> dict:
+    """Lee QUERY_BUDGETS con el formato "POST /likes/add=3,GET /likes/{postId}=2"."""
+    budgets = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        endpoint, _, budget = item.rpartition("=")
+        budgets[endpoint.strip()] = int(budget)
+    return budgets
+
+
+# Overrides the budgets declared by each app
+QUERY_BUDGETS = _parse_budgets(os.getenv("QUERY_BUDGETS", ""))
+
+_current_profile = ContextVar("query_profile", default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryProfile:
+    """
+    Sentencias SQL ejecutadas dentro de una petición (o de un bloque profile_queries()).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.by_database = Counter()
+        self.statements = []
+
+    def record(self, database: str, statement: str, duration: float):
+        self.count += 1
+        self.duration += duration
+        self.by_database[database] += 1
+        self.statements.append(f"[{database}] {' '.join(statement.split())[:200]}")
+
+    def summary(self) -> str:
+        databases = ", ".join(f"{name}={count}" for name, count in sorted(self.by_database.items()))
+        return f"{self.count} consultas ({databases or 'ninguna'}) en {self.duration * 1000:.1f} ms de BD"
+
+
+@contextmanager
+def profile_queries():
+    """Cuenta las sentencias ejecutadas dentro del bloque: `with profile_queries() as profile:`."""
+    profile = QueryProfile()
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+def _explain(conn, statement, parameters) -> str:
+    """
+    EXPLAIN de la sentencia en la misma conexión y transacción, dentro de un SAVEPOINT
+    para que un fallo del EXPLAIN no aborte la transacción de la petición.
+    """
+    if not statement.lstrip().upper().startswith(("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")):
+        return "(sin plan)"
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT query_profiler_explain")
+        try:
+            cursor.execute(f"EXPLAIN {statement}", parameters)
+            return "\n".join(row[0] for row in cursor.fetchall())
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT query_profiler_explain")
+            return f"(EXPLAIN falló: {e})"
+        finally:
+            cursor.execute("RELEASE SAVEPOINT query_profiler_explain")
+    except Exception as e:
+        return f"(EXPLAIN falló: {e})"
+    finally:
+        cursor.close()
+
+
+def _instrument_engine(engine, database: str):
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if QUERY_PROFILING or _current_profile.get() is not None:
+            context._profiler_start = time.perf_counter()
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_profiler_start", None)
+        if start is None:
+            return
+        duration = time.perf_counter() - start
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.record(database, statement, duration)
+        if QUERY_PROFILING and duration * 1000 >= SLOW_QUERY_MS:
+            plan = _explain(conn, statement, parameters) if SLOW_QUERY_EXPLAIN and not executemany else ""
+            print(f"[QueryProfiler] Consulta lenta en {database} ({duration * 1000:.1f} ms): {' '.join(statement.split())}")
+            if plan:
+                print(plan)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+
+
+for _database, _engine in (("pet", engine_pet), ("post", engine_post), ("reactions", engine_reactions)):
+    _instrument_engine(_engine, _database)
+
+
+class QueryProfilerMiddleware:
+    """
+    Middleware ASGI que, con QUERY_PROFILING activo, cuenta las sentencias SQL de cada petición
+    y las compara con el presupuesto del endpoint ("METHOD /ruta/{param}").
+    Sin QUERY_PROFILING no hace nada.
+    """
+
+    def __init__(self, app, budgets: dict = None, enabled: bool = None, mode: str = None):
+        self.app = app
+        self.budgets = {**(budgets or {}), **QUERY_BUDGETS}
+        self.enabled = QUERY_PROFILING if enabled is None else enabled
+        self.mode = mode or QUERY_BUDGET_MODE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        with profile_queries() as profile:
+            await self.app(scope, receive, send)
+
+        route = getattr(scope.get("route"), "path", scope["path"])
+        endpoint = f"{scope['method']} {route}"
+        budget = self.budgets.get(endpoint, QUERY_BUDGET_DEFAULT)
+        print(f"[QueryProfiler] {endpoint}: {profile.summary()}")
+
+        if budget and profile.count > budget:
+            message = f"{endpoint} ejecutó {profile.count} consultas (presupuesto {budget}):\n" + "\n".join(profile.statements)
+            if self.mode == "raise":
+                raise QueryBudgetExceeded(message)
+            print(f"[QueryProfiler] Presupuesto superado: {message}")
@@ -0,0 +1,120 @@
+import os
+import time
+import asyncio
+from datetime import datetime, timezone
+from fastapi.responses import JSONResponse
+from dotenv import load_dotenv
+from config.db import engine_pet, engine_post, engine_reactions, DB_POOL_SIZE, DB_USE_NULLPOOL
+from config.redis_client import redis_client
+
+load_dotenv()
+
+# Seconds a /ready result is reused, so frequent probes do not hit the dependencies
+READINESS_CACHE_SECONDS = float(os.getenv("READINESS_CACHE_SECONDS", 5))
+# Seconds each dependency check may take before it counts as failed
+READINESS_TIMEOUT = float(os.getenv("READINESS_TIMEOUT", 2))
+# Startup warm-up: pool connections opened per database (capped at DB_POOL_SIZE, 0 disables it)
+WARMUP_DB_CONNECTIONS = min(int(os.getenv("WARMUP_DB_CONNECTIONS", DB_POOL_SIZE)), DB_POOL_SIZE)
+
+ENGINES = {"postgres_pet": engine_pet, "postgres_post": engine_post, "postgres_reactions": engine_reactions}
+
+
+async def _check_database(engine):
+    async with engine.connect() as conn:
+        await conn.exec_driver_sql("SELECT 1")
+
+
+async def _check_redis():
+    await redis_client.ping()
+
+
+class ReadinessProbe:
+    """
+    Estado de las dependencias del servicio para /ready, con la latencia de cada comprobación.
+    Postgres y Redis son obligatorios: si fallan el servicio no está listo (503).
+    Los checks opcionales (p. ej. el Notifications Service, cuyos eventos esperan en el outbox)
+    solo marcan el estado como "degraded".
+    El resultado se guarda READINESS_CACHE_SECONDS y las sondas simultáneas comparten la misma comprobación.
+    """
+
+    def __init__(self, optional_checks: dict = None):
+        self.checks = {name: (lambda engine=engine: _check_database(engine)) for name, engine in ENGINES.items()}
+        self.checks["redis"] = _check_redis
+        self.optional_checks = optional_checks or {}
+        self._result = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def _run_check(self, check) -> dict:
+        start = time.perf_counter()
+        try:
+            details = await asyncio.wait_for(check(), READINESS_TIMEOUT) or {}
+        except asyncio.TimeoutError:
+            return {"status": "error", "latency_ms": round((time.perf_counter() - start) * 1000, 2), "error": "timeout"}
+        except Exception as e:
+            return {"status": "error", "latency_ms": round((time.perf_counter() - start) * 1000, 2), "error": str(e)}
+        return {"status": "ok", "latency_ms": round((time.perf_counter() - start) * 1000, 2), **details}
+
+    async def check(self) -> dict:
+        async with self._lock:
+            if self._result is not None and time.monotonic() - self._checked_at < READINESS_CACHE_SECONDS:
+                return {**self._result, "cached": True}
+
+            names = [*self.checks, *self.optional_checks]
+            results = await asyncio.gather(
+                *(self._run_check(check) for check in [*self.checks.values(), *self.optional_checks.values()])
+            )
+            checks = dict(zip(names, results))
+            if any(checks[name]["status"] == "error" for name in self.checks):
+                status = "not_ready"
+            elif any(checks[name]["status"] == "error" for name in self.optional_checks):
+                status = "degraded"
+            else:
+                status = "ready"
+
+            self._result = {
+                "status": status,
+                "checked_at": datetime.now(timezone.utc).isoformat(),
+                "checks": checks,
+            }
+            self._checked_at = time.monotonic()
+            return {**self._result, "cached": False}
+
+    async def response(self) -> JSONResponse:
+        result = await self.check()
+        return JSONResponse(result, status_code=503 if result["status"] == "not_ready" else 200)
+
+
+async def _open_pool(name: str, engine):
+    # Opened together so the pool holds WARMUP_DB_CONNECTIONS idle connections afterwards
+    connections = await asyncio.gather(*(engine.connect() for _ in range(WARMUP_DB_CONNECTIONS)), return_exceptions=True)
+    errors = [c for c in connections if isinstance(c, Exception)]
+    for connection in connections:
+        if not isinstance(connection, Exception):
+            await connection.close()
+    if errors:
+        print(f"[Warmup] No se pudieron abrir conexiones a {name}: {errors[0]}")
+
+
+async def _prime_redis():
+    try:
+        await redis_client.ping()
+    except Exception as e:
+        print(f"[Warmup] Redis no disponible: {e}")
+
+
+async def warm_up(app=None):
+    """
+    Calentamiento al arrancar: abre las conexiones de los pools de las tres bases de datos,
+    la conexión a Redis y genera el esquema OpenAPI, para que las primeras peticiones tras
+    un despliegue no paguen ese coste. Los fallos se registran pero no impiden arrancar
+    (/ready los seguirá reportando).
+    """
+    start = time.perf_counter()
+    tasks = [_prime_redis()]
+    if WARMUP_DB_CONNECTIONS > 0 and not DB_USE_NULLPOOL:
+        tasks.extend(_open_pool(name, engine) for name, engine in ENGINES.items())
+    await asyncio.gather(*tasks)
+    if app is not None:
+        app.openapi()
+    print(f"[Warmup] Completado en {(time.perf_counter() - start) * 1000:.0f} ms")
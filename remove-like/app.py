@@ -1,9 +1,35 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 import uvicorn
 
 from routes.like_routes import router as like_router
+from config.db import get_pool_metrics
+from config.server import server_options
+from utils.metrics import MetricsMiddleware, metrics_response
+from utils.query_profiler import QueryProfilerMiddleware
+from utils.readiness import ReadinessProbe, warm_up
+from utils.likes_counter import likes_flusher
+from utils.pet_cache import pet_cache
+
+
+# Maximum SQL statements per request, checked in QUERY_PROFILING mode
+QUERY_BUDGETS = {"DELETE /likes/remove": 3, "DELETE /likes/remove/bulk": 3}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Write-behind flusher for Posts.likes (final flush on shutdown)
+    await likes_flusher.start()
+    # Listener for pet ownership cache invalidations
+    await pet_cache.start()
+    # Pre-open the DB pools and the Redis connection and build the OpenAPI schema
+    await warm_up(app)
+    yield
+    await pet_cache.stop()
+    await likes_flusher.stop()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -13,11 +39,26 @@ app = FastAPI(
     docs_url="/api-docs-removeLike",                  
     redoc_url=None,
     openapi_url="/api-docs-likes/openapi.json",   
+    lifespan=lifespan,
 )
 
 @app.get("/health", tags=["Health Check"])
 def simple_health_check():
-    return {"status": "ok"}
+    return {"status": "ok", "db_pools": get_pool_metrics()}
+
+
+# Postgres x3 and Redis, cached for READINESS_CACHE_SECONDS
+readiness = ReadinessProbe()
+
+
+@app.get("/ready", tags=["Health Check"])
+async def readiness_check():
+    return await readiness.response()
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return metrics_response()
 
 # Configure CORS
 app.add_middleware(
@@ -27,6 +68,10 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Per-route latency histograms for /metrics
+app.add_middleware(MetricsMiddleware)
+# SQL statements per request against QUERY_BUDGETS (only with QUERY_PROFILING=true)
+app.add_middleware(QueryProfilerMiddleware, budgets=QUERY_BUDGETS)
 
 # Include routes
 app.include_router(like_router)
@@ -48,4 +93,4 @@ app.openapi = custom_openapi
 
 # Run app directly
 if __name__ == "__main__":
-    uvicorn.run("app:app", host="0.0.0.0", port=6002, reload=True)
+    uvicorn.run("app:app", **server_options(6002))
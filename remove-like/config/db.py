@@ -1,6 +1,10 @@
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import time
+import uuid
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -10,9 +14,76 @@ DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_HOST = os.getenv("DB_HOST")
 DB_PORT = os.getenv("DB_PORT")
 
+# Pool settings (shared by the three engines of this process)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+# Pre-ping costs a round trip per checkout; pool_recycle already retires stale connections
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() == "true"
+# NullPool opens a connection per checkout; use it when an external pooler (PgBouncer) does the pooling
+DB_USE_NULLPOOL = os.getenv("DB_USE_NULLPOOL", "false").lower() == "true"
+# PgBouncer transaction/statement pooling does not support server-side prepared statements
+DB_PGBOUNCER_MODE = os.getenv("DB_PGBOUNCER_MODE", "false").lower() == "true"
+
+
+class _MeteredPoolMixin:
+    """
+    Cuenta los checkouts del pool y el tiempo de espera para obtener una conexión.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.checkouts += 1
+            self.checkout_wait_total += waited
+            self.checkout_wait_max = max(self.checkout_wait_max, waited)
+
+
+class MeteredQueuePool(_MeteredPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class MeteredNullPool(_MeteredPoolMixin, NullPool):
+    pass
+
+
 def get_engine(db_name):
-    DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{db_name}"
-    return create_engine(DATABASE_URL, echo=False)
+    DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{db_name}"
+    options = {"echo": False, "pool_pre_ping": DB_POOL_PRE_PING}
+
+    if DB_USE_NULLPOOL:
+        options["poolclass"] = MeteredNullPool
+    else:
+        options.update(
+            poolclass=MeteredQueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+
+    if DB_PGBOUNCER_MODE:
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+
+    return create_async_engine(DATABASE_URL, **options)
 
 # Engines for each DB
 engine_pet = get_engine(os.getenv("PET_DB_NAME"))
@@ -20,8 +91,33 @@ engine_post = get_engine(os.getenv("POST_DB_NAME"))
 engine_reactions = get_engine(os.getenv("REACTIONS_DB_NAME"))
 
 # Sessions
-SessionPet = sessionmaker(autocommit=False, autoflush=False, bind=engine_pet)
-SessionPost = sessionmaker(autocommit=False, autoflush=False, bind=engine_post)
-SessionReactions = sessionmaker(autocommit=False, autoflush=False, bind=engine_reactions)
+SessionPet = async_sessionmaker(bind=engine_pet, autoflush=False, expire_on_commit=False)
+SessionPost = async_sessionmaker(bind=engine_post, autoflush=False, expire_on_commit=False)
+SessionReactions = async_sessionmaker(bind=engine_reactions, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
+
+
+def get_pool_metrics():
+    """
+    Devuelve el estado y las métricas de checkout de los pools de cada base de datos.
+    """
+    metrics = {}
+    for name, engine in (("pet", engine_pet), ("post", engine_post), ("reactions", engine_reactions)):
+        pool = engine.pool
+        data = {
+            "pool_class": type(pool).__name__,
+            "checkouts": pool.checkouts,
+            "checkout_timeouts": pool.checkout_timeouts,
+            "checkout_wait_avg_ms": round(pool.checkout_wait_total / pool.checkouts * 1000, 3) if pool.checkouts else 0.0,
+            "checkout_wait_max_ms": round(pool.checkout_wait_max * 1000, 3),
+        }
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            data.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+            )
+        metrics[name] = data
+    return metrics
@@ -0,0 +1,36 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Development only: file watcher + single worker
+UVICORN_RELOAD = os.getenv("UVICORN_RELOAD", "false").lower() == "true"
+# Each worker is a separate process with its own DB pools: a replica opens up to
+# WEB_CONCURRENCY x 3 x (DB_POOL_SIZE + DB_MAX_OVERFLOW) Postgres connections, so the worker
+# count is set explicitly (os.cpu_count() reports the host's cores inside a container)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 1))
+KEEP_ALIVE_TIMEOUT = int(os.getenv("KEEP_ALIVE_TIMEOUT", 75))
+# On SIGTERM, in-flight requests get this long to finish before the lifespan shutdown
+# flushes the background work
+GRACEFUL_SHUTDOWN_TIMEOUT = int(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", 30))
+SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", 2048))
+
+
+def server_options(default_port: int) -> dict:
+    """
+    Opciones de uvicorn.run: en producción varios workers con uvloop y httptools;
+    con UVICORN_RELOAD=true, un solo proceso con recarga automática para desarrollo.
+    """
+    options = {"host": os.getenv("HOST", "0.0.0.0"), "port": int(os.getenv("PORT", default_port))}
+    if UVICORN_RELOAD:
+        return {**options, "reload": True}
+    return {
+        **options,
+        "workers": WEB_CONCURRENCY,
+        "loop": "uvloop",
+        "http": "httptools",
+        "timeout_keep_alive": KEEP_ALIVE_TIMEOUT,
+        "timeout_graceful_shutdown": GRACEFUL_SHUTDOWN_TIMEOUT,
+        "backlog": SERVER_BACKLOG,
+        "server_header": False,
+    }
@@ -1,64 +1,137 @@
-from sqlalchemy import select, update, delete
+import asyncio
+import uuid
+from collections import defaultdict
+from sqlalchemy import select, delete, tuple_
 from fastapi import HTTPException
 from models.like_model import Like
 from models.post_model import Post
-from models.pet_model import Pet
-from config.db import SessionReactions, SessionPost, SessionPet
+from config.db import SessionReactions, SessionPost
+from utils.likes_counter import likes_flusher
+from utils.pet_likes_index import record_pet_like
+from utils.pet_cache import pet_cache
+from utils.leaderboard import record_leaderboard_like
 
-def remove_like_controller(postId, responsibleId, petId):
-    db_reactions = SessionReactions()
-    db_posts = SessionPost()
-    db_pets = SessionPet()
 
+def _canonical_ids(postId, petId):
+    """
+    Normaliza los ids de la petición a la forma canónica del UUID (minúsculas, con guiones),
+    la que usan las filas y las claves de Redis (contador, índice por mascota, rankings).
+    """
     try:
-       
-        pet = db_pets.execute(
-            select(Pet).where(
-                Pet.id == petId,
-                Pet.responsibleId == responsibleId
-            )
-        ).scalar_one_or_none()
-
-        if not pet:
-            raise HTTPException(status_code=403, detail="Responsible does not own the pet trying to remove like")
+        return str(uuid.UUID(str(postId))), str(uuid.UUID(str(petId)))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Invalid postId or petId")
 
 
-        post = db_posts.execute(
-            select(Post).where(Post.id == postId)
-        ).scalar_one_or_none()
+async def remove_like_controller(postId, responsibleId, petId):
+    postId, petId = _canonical_ids(postId, petId)
+    async with SessionReactions() as db_reactions, SessionPost() as db_posts:
+        # Pet ownership (cached) and post existence are checked concurrently
+        pet, post_result = await asyncio.gather(
+            pet_cache.get_pet(petId),
+            db_posts.execute(
+                select(Post).where(Post.id == postId)
+            ),
+        )
+        post = post_result.scalar_one_or_none()
+
+        if not pet or pet["responsibleId"] != str(responsibleId).lower():
+            raise HTTPException(status_code=403, detail="Responsible does not own the pet trying to remove like")
 
         if not post:
             raise HTTPException(status_code=404, detail="Post not found")
 
-        existing_like = db_reactions.execute(
-            select(Like).where(
+        # Delete and existence check in a single statement
+        deleted_like = (await db_reactions.execute(
+            delete(Like).where(
                 Like.postId == postId,
                 Like.petId == petId
-            )
-        ).scalar_one_or_none()
+            ).returning(Like.id, Like.createdAt)
+        )).one_or_none()
 
-        if not existing_like:
+        if deleted_like is None:
             raise HTTPException(status_code=404, detail="Like does not exist")
 
-        db_reactions.execute(
-            delete(Like).where(
-                Like.postId == postId,
-                Like.petId == petId
-            )
-        )
-        db_reactions.commit()
+        await db_reactions.commit()
 
-        new_likes_count = max(post.likes - 1, 0)
-        db_posts.execute(
-            update(Post)
-            .where(Post.id == postId)
-            .values(likes=new_likes_count)
+        # Update the like counter (Redis write-through, Posts.likes flushed in batches),
+        # get-likes' per-pet index of liked posts and the leaderboards (trending bucket of the like)
+        await asyncio.gather(
+            likes_flusher.record(postId, -1, [petId]),
+            record_pet_like(petId, postId, False),
+            record_leaderboard_like(postId, -1, deleted_like.createdAt),
         )
-        db_posts.commit()
 
         return {"message": "Like removed successfully"}
 
-    finally:
-        db_reactions.close()
-        db_posts.close()
-        db_pets.close()
+
+async def remove_likes_bulk_controller(operations: list, responsibleId) -> list:
+    """
+    Elimina varios likes en una sola transacción.
+    La propiedad de las mascotas y la existencia de los posts se validan con consultas IN,
+    los likes se borran con un único DELETE y se devuelve un resultado por operación.
+    """
+    results = {}
+    # (postId, petId) as sent -> canonical pair; spellings of the same pair are processed once
+    canonical = {}
+    for postId, petId in dict.fromkeys((op.postId, op.petId) for op in operations):
+        try:
+            canonical[(postId, petId)] = _canonical_ids(postId, petId)
+        except HTTPException:
+            results[(postId, petId)] = (422, "Invalid postId or petId")
+    pending = list(dict.fromkeys(canonical.values()))
+
+    async with SessionReactions() as db_reactions, SessionPost() as db_posts:
+        pets, post_rows = await asyncio.gather(
+            pet_cache.get_pets(list({petId for _, petId in pending})),
+            db_posts.execute(
+                select(Post.id).where(Post.id.in_(list({postId for postId, _ in pending})))
+            ),
+        )
+        existing_posts = {str(post_id) for post_id in post_rows.scalars().all()}
+
+        valid = []
+        for key in pending:
+            postId, petId = key
+            pet = pets.get(petId)
+            if not pet or pet["responsibleId"] != str(responsibleId).lower():
+                results[key] = (403, "Responsible does not own the pet trying to remove like")
+            elif postId not in existing_posts:
+                results[key] = (404, "Post not found")
+            else:
+                valid.append(key)
+
+        deleted = {}
+        if valid:
+            # Single DELETE ... WHERE ("postId", "petId") IN (...)
+            rows = (await db_reactions.execute(
+                delete(Like)
+                .where(tuple_(Like.postId, Like.petId).in_(valid))
+                .returning(Like.postId, Like.petId, Like.createdAt)
+            )).all()
+            # (postId, petId) -> createdAt of the removed like (its trending bucket)
+            deleted = {(str(postId), str(petId)): createdAt for postId, petId, createdAt in rows}
+            await db_reactions.commit()
+
+            for key in valid:
+                if key in deleted:
+                    results[key] = (200, "Like removed successfully")
+                else:
+                    results[key] = (404, "Like does not exist")
+
+    if deleted:
+        removed_by_post = defaultdict(list)
+        for postId, petId in deleted:
+            removed_by_post[postId].append(petId)
+        await asyncio.gather(
+            *(likes_flusher.record(postId, -len(petIds), petIds) for postId, petIds in removed_by_post.items()),
+            *(record_pet_like(petId, postId, False) for postId, petId in deleted),
+            *(record_leaderboard_like(postId, -1, createdAt) for (postId, _), createdAt in deleted.items()),
+        )
+
+    response = []
+    for op in operations:
+        key = (op.postId, op.petId)
+        status_code, detail = results[canonical.get(key, key)]
+        response.append({"postId": op.postId, "petId": op.petId, "status": status_code, "detail": detail})
+    return response
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, status
 from fastapi.security import HTTPBearer
-from schemas.like_schema import LikeRequest, LikeResponse
-from controllers.like_controller import remove_like_controller
+from schemas.like_schema import LikeRequest, LikeResponse, BulkLikeRequest, BulkLikeResponse
+from controllers.like_controller import remove_like_controller, remove_likes_bulk_controller
 from middlewares.auth_middleware import get_current_responsible
 
 router = APIRouter()
@@ -30,10 +30,11 @@ Allows removing a Like previously added by a pet.
         404: {"description": "Like or post not found"},
         403: {"description": "Responsible does not own the pet"},
         401: {"description": "Token missing or invalid"},
+        422: {"description": "postId or petId is not a valid UUID"},
     },
     dependencies=[Depends(security_scheme)],
 )
-def remove_like(
+async def remove_like(
     request_data: LikeRequest,
     responsible_id: str = Depends(get_current_responsible)
 ):
@@ -43,8 +44,33 @@ def remove_like(
     - Returns 403 if the pet does not belong to the authenticated responsible.
     - Returns 404 if the like does not exist.
     """
-    return remove_like_controller(
+    return await remove_like_controller(
         request_data.postId,
         responsible_id,
         request_data.petId
     )
+
+
+@router.delete(
+    "/likes/remove/bulk",
+    tags=["Likes"],
+    summary="Remove several Likes in one request",
+    description="""
+Removes up to 500 Likes in a single transaction (imports, mobile clients syncing offline).
+Returns one result per operation, in request order, with the status code the single request would have returned
+(200 removed, 403 pet not owned by the responsible, 404 post or like not found).
+""",
+    response_model=BulkLikeResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Operations processed (see each result)"},
+        401: {"description": "Token missing or invalid"},
+        422: {"description": "Invalid request or too many operations"},
+    },
+    dependencies=[Depends(security_scheme)],
+)
+async def remove_likes_bulk(
+    request_data: BulkLikeRequest,
+    responsible_id: str = Depends(get_current_responsible)
+):
+    return {"results": await remove_likes_bulk_controller(request_data.operations, responsible_id)}
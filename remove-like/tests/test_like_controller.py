@@ -0,0 +1,210 @@
+import os
+import re
+import sys
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+from controllers import like_controller
+
+POST = "11111111-1111-1111-1111-11111111aaaa"
+PET = "33333333-3333-3333-3333-33333333bbbb"
+RESPONSIBLE = "44444444-4444-4444-4444-444444444444"
+LIKED_AT = datetime(2024, 1, 1, 10, 0, 0)
+
+
+class _Result:
+    def scalar_one_or_none(self):
+        return object()
+
+    def one_or_none(self):
+        return SimpleNamespace(id=1, createdAt=LIKED_AT)
+
+
+class _Session:
+    def __init__(self):
+        self.statements = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return _Result()
+
+    async def commit(self):
+        pass
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    calls = []
+    session = _Session()
+
+    async def get_pet(petId):
+        calls.append(("pet", petId))
+        return {"responsibleId": RESPONSIBLE, "name": "Luna"}
+
+    async def record(*args):
+        calls.append(args)
+
+    monkeypatch.setattr(like_controller, "SessionReactions", lambda: session)
+    monkeypatch.setattr(like_controller, "SessionPost", lambda: session)
+    monkeypatch.setattr(like_controller.pet_cache, "get_pet", get_pet)
+    monkeypatch.setattr(like_controller.likes_flusher, "record", record)
+    monkeypatch.setattr(like_controller, "record_pet_like", record)
+    monkeypatch.setattr(like_controller, "record_leaderboard_like", record)
+    return calls, session
+
+
+def test_uppercase_ids_are_canonicalized_for_redis_and_the_queries(recorded):
+    calls, session = recorded
+
+    asyncio.run(like_controller.remove_like_controller(POST.upper(), RESPONSIBLE, PET.upper()))
+
+    assert ("pet", PET) in calls
+    assert (POST, -1, [PET]) in calls
+    assert (PET, POST, False) in calls
+    assert (POST, -1, LIKED_AT) in calls
+    for statement in session.statements:
+        assert POST in statement.compile().params.values()
+
+
+def test_malformed_id_is_a_422_not_a_database_error(recorded):
+    calls, session = recorded
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(like_controller.remove_like_controller("not-a-uuid", RESPONSIBLE, PET))
+
+    assert error.value.status_code == 422
+    assert calls == [] and session.statements == []
+
+
+_UUID = re.compile(r"'([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})'")
+
+
+def _ids(statement) -> list:
+    """UUIDs que aparecen en el SQL que se enviaría a Postgres, en orden."""
+    sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    return _UUID.findall(sql)
+
+
+class _LikesTable:
+    """Sesión falsa sobre {(postId, petId): createdAt}: el DELETE masivo devuelve las filas borradas."""
+
+    def __init__(self, likes: dict, posts=()):
+        self.likes = dict(likes)
+        self.posts = set(posts)
+        self.commits = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        ids = _ids(statement)
+        if statement.is_delete:
+            pairs = zip(ids[0::2], ids[1::2])
+            rows = [(postId, petId, self.likes.pop((postId, petId))) for postId, petId in pairs if (postId, petId) in self.likes]
+            return SimpleNamespace(all=lambda: rows)
+        posts = [postId for postId in self.posts if postId in ids]
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: posts))
+
+    async def commit(self):
+        self.commits += 1
+
+
+OTHER_PET = "55555555-5555-5555-5555-555555555555"
+STRANGER_PET = "66666666-6666-6666-6666-666666666666"
+MISSING_POST = "77777777-7777-7777-7777-777777777777"
+
+
+def test_bulk_remove_maps_each_operation_to_its_status(monkeypatch):
+    table = _LikesTable({(POST, PET): LIKED_AT, (POST, OTHER_PET): LIKED_AT}, posts={POST})
+    calls = []
+
+    async def get_pets(petIds):
+        return {petId: {"responsibleId": "someone-else" if petId == STRANGER_PET else RESPONSIBLE, "name": "Luna"} for petId in petIds}
+
+    async def record(*args):
+        calls.append(args)
+
+    monkeypatch.setattr(like_controller, "SessionReactions", lambda: table)
+    monkeypatch.setattr(like_controller, "SessionPost", lambda: table)
+    monkeypatch.setattr(like_controller.pet_cache, "get_pets", get_pets)
+    monkeypatch.setattr(like_controller.likes_flusher, "record", record)
+    monkeypatch.setattr(like_controller, "record_pet_like", record)
+    monkeypatch.setattr(like_controller, "record_leaderboard_like", record)
+    operations = [
+        SimpleNamespace(postId=POST, petId=PET),
+        SimpleNamespace(postId=POST.upper(), petId=PET),  # same like, spelled differently
+        SimpleNamespace(postId=POST, petId=OTHER_PET),
+        SimpleNamespace(postId=POST, petId=OTHER_PET),
+        SimpleNamespace(postId=POST, petId=STRANGER_PET),
+        SimpleNamespace(postId=MISSING_POST, petId=PET),
+        SimpleNamespace(postId="not-a-uuid", petId=PET),
+    ]
+
+    results = asyncio.run(like_controller.remove_likes_bulk_controller(operations, RESPONSIBLE))
+
+    assert [result["status"] for result in results] == [200, 200, 200, 200, 403, 404, 422]
+    assert table.likes == {} and table.commits == 1
+    # The counter gets one -2 for the post; the index and the trending bucket one update per like
+    assert (POST, -2, [PET, OTHER_PET]) in calls
+    assert sorted(call for call in calls if call[-1] is False) == [(PET, POST, False), (OTHER_PET, POST, False)]
+    assert [call for call in calls if call[-1] == LIKED_AT] == [(POST, -1, LIKED_AT)] * 2
+
+
+def test_bulk_remove_of_a_like_that_does_not_exist(monkeypatch):
+    table = _LikesTable({}, posts={POST})
+    monkeypatch.setattr(like_controller, "SessionReactions", lambda: table)
+    monkeypatch.setattr(like_controller, "SessionPost", lambda: table)
+
+    async def get_pets(petIds):
+        return {petId: {"responsibleId": RESPONSIBLE, "name": "Luna"} for petId in petIds}
+
+    monkeypatch.setattr(like_controller.pet_cache, "get_pets", get_pets)
+    results = asyncio.run(like_controller.remove_likes_bulk_controller([SimpleNamespace(postId=POST, petId=PET)], RESPONSIBLE))
+    assert results == [{"postId": POST, "petId": PET, "status": 404, "detail": "Like does not exist"}]
+
+
+def test_bulk_unlike_of_repeated_operations_removes_each_like_once(monkeypatch):
+    pets = ["33333333-3333-3333-3333-33333333333%d" % i for i in range(3)]
+    table = _LikesTable({(POST, petId): LIKED_AT for petId in pets}, posts={POST})
+    calls = []
+
+    async def get_pets(petIds):
+        return {petId: {"responsibleId": RESPONSIBLE, "name": "Luna"} for petId in petIds}
+
+    async def record(*args):
+        calls.append(args)
+
+    monkeypatch.setattr(like_controller, "SessionReactions", lambda: table)
+    monkeypatch.setattr(like_controller, "SessionPost", lambda: table)
+    monkeypatch.setattr(like_controller.pet_cache, "get_pets", get_pets)
+    monkeypatch.setattr(like_controller.likes_flusher, "record", record)
+    monkeypatch.setattr(like_controller, "record_pet_like", record)
+    monkeypatch.setattr(like_controller, "record_leaderboard_like", record)
+    operations = [SimpleNamespace(postId=POST.upper(), petId=petId) for petId in pets[:2]]
+    operations += [SimpleNamespace(postId=POST, petId=pets[0])]
+
+    results = asyncio.run(like_controller.remove_likes_bulk_controller(operations, RESPONSIBLE))
+
+    assert [result["status"] for result in results] == [200] * 3
+    assert list(table.likes) == [(POST, pets[2])]
+    # Counter and leaderboard get -2 for the post, not -3
+    assert sum(call[1] for call in calls if call[0] == POST and call[-1] != LIKED_AT) == -2
+    assert sum(call[1] for call in calls if call[-1] == LIKED_AT) == -2
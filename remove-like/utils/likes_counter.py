@@ -0,0 +1,327 @@
+import asyncio
+import os
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from sqlalchemy import select, update, delete, func, values, column, Integer
+from sqlalchemy.dialects.postgresql import UUID, insert
+from dotenv import load_dotenv
+from config.db import SessionPost
+from config.redis_client import redis_client
+from models.post_model import Post
+from models.like_flush_batch_model import LikeFlushBatch
+
+load_dotenv()
+
+# "redis": deltas are aggregated in a Redis hash shared by every replica (get-likes adds them to cache misses)
+# "memory": deltas are aggregated in this process only; fewer Redis writes, but unflushed deltas are
+#           invisible to get-likes cache misses until the next flush
+LIKES_FLUSH_BACKEND = os.getenv("LIKES_FLUSH_BACKEND", "redis").lower()
+# Maximum staleness of Posts.likes, in seconds
+LIKES_FLUSH_INTERVAL = float(os.getenv("LIKES_FLUSH_INTERVAL", 5.0))
+# Flush early when this many posts have pending deltas in memory
+LIKES_FLUSH_MAX_PENDING = int(os.getenv("LIKES_FLUSH_MAX_PENDING", 1000))
+# Rows per UPDATE ... FROM (VALUES ...) statement
+LIKES_FLUSH_CHUNK_SIZE = 1000
+# A claimed batch of deltas still registered after this many seconds is taken over by the next
+# flush of any replica; LikeFlushBatches keeps it from being applied twice if its flush was only slow
+LIKES_FLUSH_ORPHAN_TIMEOUT = float(os.getenv("LIKES_FLUSH_ORPHAN_TIMEOUT", 60))
+# How long applied batch ids are kept in LikeFlushBatches (must outlive any claimed batch)
+LIKES_FLUSH_BATCH_RETENTION = float(os.getenv("LIKES_FLUSH_BATCH_RETENTION", 86400))
+LIKES_FLUSH_BATCH_PURGE_INTERVAL = 3600
+
+# Same keys get-likes uses to cache a post's like count and first page of likes
+LIKES_COUNT_KEY = "post:{postId}:likes_count"
+LIKES_PAGE_KEY = "post:{postId}:likes_page"
+# Likes stored in that page: get-likes DEFAULT_PAGE_SIZE plus the extra row used for next_cursor
+LIKES_PAGE_ROWS = 50 + 1
+# get-likes drops its in-process cache entry for every postId published here
+LIKES_INVALIDATION_CHANNEL = "likes:invalidate"
+# Hash postId -> like delta not yet applied to Posts.likes
+PENDING_LIKES_DELTAS_KEY = "posts:likes:pending"
+# Sorted set of the claimed copies of that hash (posts:likes:pending:<uuid>) -> claim time
+FLUSHING_LIKES_DELTAS_KEY = "posts:likes:flushing"
+# Incremented when a flush claims or releases deltas; get-likes does not cache a count computed
+# while it changed, because Posts.likes and the pending hash may have disagreed
+LIKES_FLUSH_GENERATION_KEY = "posts:likes:flush_generation"
+
+# Updates the cached count in place if present (a missing count is left missing: get-likes
+# rebuilds it from Posts.likes + pending delta), drops the cached first page only when the change
+# can alter it, publishes the invalidation for get-likes local caches and, when KEYS[3] is given,
+# records the delta in the pending hash.
+# The page holds the oldest ARGV[4] likes (ORDER BY createdAt, id): a new like lands past it once
+# the post has more likes than that, and a removed like only matters if its pet (ARGV[5..]) is in it.
+_APPLY_DELTA_SCRIPT = """
+if #KEYS > 2 then
+    redis.call('HINCRBY', KEYS[3], ARGV[1], ARGV[2])
+end
+local count = nil
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    count = redis.call('INCRBY', KEYS[1], ARGV[2])
+    if count < 0 then
+        redis.call('SET', KEYS[1], 0, 'KEEPTTL')
+        count = 0
+    end
+end
+if count == nil or count <= tonumber(ARGV[4]) then
+    redis.call('DEL', KEYS[2])
+elseif #ARGV > 4 then
+    local page = redis.call('GET', KEYS[2])
+    if page then
+        for i = 5, #ARGV do
+            if string.find(page, '"petId":"' .. ARGV[i] .. '"', 1, true) then
+                redis.call('DEL', KEYS[2])
+                break
+            end
+        end
+    end
+end
+redis.call('PUBLISH', ARGV[3], ARGV[1])
+return count
+"""
+_apply_delta = redis_client.register_script(_APPLY_DELTA_SCRIPT)
+
+# Moves the pending hash to KEYS[2] and registers it, so it can be found if the flush dies
+_CLAIM_DELTAS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('RENAME', KEYS[1], KEYS[2])
+redis.call('ZADD', KEYS[3], ARGV[1], KEYS[2])
+redis.call('INCR', KEYS[4])
+return 1
+"""
+_claim_deltas = redis_client.register_script(_CLAIM_DELTAS_SCRIPT)
+
+# Takes over a claimed copy whose claim is older than ARGV[2] by renewing its claim time, so only
+# one replica retries it
+_TAKE_OVER_DELTAS_SCRIPT = """
+local claimed_at = redis.call('ZSCORE', KEYS[1], ARGV[1])
+if claimed_at and tonumber(claimed_at) <= tonumber(ARGV[2]) then
+    redis.call('ZADD', KEYS[1], ARGV[3], ARGV[1])
+    return 1
+end
+return 0
+"""
+_take_over_deltas = redis_client.register_script(_TAKE_OVER_DELTAS_SCRIPT)
+
+
+def build_bulk_likes_update(deltas: dict):
+    """
+    Construye un único UPDATE "Posts" ... FROM (VALUES (id, delta), ...) para varios posts.
+    Las filas van ordenadas por id, igual que el bloqueo previo de flush().
+    """
+    deltas_table = values(
+        column("id", UUID(as_uuid=True)),
+        column("delta", Integer),
+        name="deltas",
+    ).data(sorted((uuid.UUID(str(postId)), delta) for postId, delta in deltas.items()))
+
+    return (
+        update(Post)
+        .where(Post.id == deltas_table.c.id)
+        .values(likes=func.greatest(func.coalesce(Post.likes, 0) + deltas_table.c.delta, 0))
+    )
+
+
+class LikesFlusher:
+    """
+    Agregador write-behind de los contadores Posts.likes.
+    Cada like/unlike suma un delta por post (en Redis o en memoria) y una tarea en segundo
+    plano aplica todos los deltas acumulados con un solo UPDATE por lote, como mucho cada
+    LIKES_FLUSH_INTERVAL segundos. Al apagar el servicio se hace un último flush.
+    """
+
+    def __init__(self):
+        self._task = None
+        self._stopping = False
+        self._buffer = defaultdict(int)
+        self._wakeup = asyncio.Event()
+        self._last_batch_purge = 0.0
+
+    async def record(self, postId, delta: int, removed_petIds=()):
+        """
+        Aplica +1/-1 al contador de likes del post: el contador cacheado en Redis se actualiza
+        de forma atómica y el delta queda pendiente hasta el siguiente flush a Posts.likes.
+        `removed_petIds` son las mascotas cuyo like se borró (para saber si cambia la primera página).
+        """
+        keys = [LIKES_COUNT_KEY.format(postId=postId), LIKES_PAGE_KEY.format(postId=postId)]
+        use_redis_backend = LIKES_FLUSH_BACKEND == "redis"
+        if use_redis_backend:
+            keys.append(PENDING_LIKES_DELTAS_KEY)
+        try:
+            await _apply_delta(
+                keys=keys,
+                args=[str(postId), delta, LIKES_INVALIDATION_CHANNEL, LIKES_PAGE_ROWS, *map(str, removed_petIds)]
+            )
+        except Exception as e:
+            print(f"[LikesCounter] Redis no disponible, acumulando el delta en memoria: {str(e)}")
+            use_redis_backend = False
+
+        if not use_redis_backend:
+            self._buffer[str(postId)] += delta
+            if len(self._buffer) >= LIKES_FLUSH_MAX_PENDING:
+                self._wakeup.set()
+
+    async def start(self):
+        # Idempotent: add-like and remove-like share this flusher in the combined app
+        if self._task is not None:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        # Final flush so in-memory deltas are not lost on shutdown
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"[LikesCounter] Error en el flush final de Posts.likes: {str(e)}")
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=LIKES_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._stopping:
+                break
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"[LikesCounter] Error actualizando Posts.likes: {str(e)}")
+
+    async def _take_redis_deltas(self) -> tuple:
+        """
+        Renombra el hash de pendientes para procesarlo en exclusiva: los likes que llegan
+        mientras tanto quedan para el siguiente flush y varias réplicas pueden hacer flush a la
+        vez sin aplicar dos veces el mismo delta. La copia queda registrada en posts:likes:flushing
+        hasta que se confirma; su uuid identifica el lote en LikeFlushBatches.
+        """
+        processing_key = f"{PENDING_LIKES_DELTAS_KEY}:{uuid.uuid4()}"
+        claimed = await _claim_deltas(
+            keys=[PENDING_LIKES_DELTAS_KEY, processing_key, FLUSHING_LIKES_DELTAS_KEY, LIKES_FLUSH_GENERATION_KEY],
+            args=[time.time()],
+        )
+        if not claimed:
+            return None, {}
+        return processing_key, await self._read_redis_deltas(processing_key)
+
+    async def _read_redis_deltas(self, processing_key: str) -> dict:
+        return {postId: int(delta) for postId, delta in (await redis_client.hgetall(processing_key)).items()}
+
+    async def _take_orphaned_deltas(self) -> dict:
+        """
+        Toma las copias que un flush no llegó a confirmar en LIKES_FLUSH_ORPHAN_TIMEOUT segundos
+        (proceso terminado, Redis o Postgres fallando, o un flush simplemente lento). Se vuelven a
+        aplicar con el mismo id de lote, así que si ya se aplicaron no cuentan dos veces.
+        Devuelve {processing_key: deltas}.
+        """
+        cutoff = time.time() - LIKES_FLUSH_ORPHAN_TIMEOUT
+        orphaned = await redis_client.zrangebyscore(FLUSHING_LIKES_DELTAS_KEY, "-inf", cutoff)
+        batches = {}
+        for processing_key in orphaned:
+            if await _take_over_deltas(keys=[FLUSHING_LIKES_DELTAS_KEY], args=[processing_key, cutoff, time.time()]):
+                batches[processing_key] = await self._read_redis_deltas(processing_key)
+                print(f"[LikesCounter] Reintentando los deltas de un flush sin confirmar: {processing_key}")
+        return batches
+
+    async def _release_redis_deltas(self, processing_keys: list):
+        """Marca las copias de un flush fallido como abandonadas para que el siguiente flush las reintente."""
+        try:
+            await redis_client.zadd(FLUSHING_LIKES_DELTAS_KEY, {key: 0 for key in processing_keys}, xx=True)
+        except Exception as e:
+            # They are taken over anyway once LIKES_FLUSH_ORPHAN_TIMEOUT expires
+            print(f"[LikesCounter] No se pudieron liberar los deltas de Redis: {str(e)}")
+
+    async def _mark_batches_applied(self, db_posts, processing_keys: list) -> set:
+        """
+        Registra los lotes en LikeFlushBatches dentro de la transacción del UPDATE y devuelve los
+        que no estaban. Si otra réplica está aplicando el mismo lote, el INSERT espera a su commit.
+        """
+        if not processing_keys:
+            return set()
+        batch_ids = {uuid.UUID(key.rsplit(":", 1)[1]): key for key in processing_keys}
+        now = datetime.utcnow()
+        inserted = (await db_posts.execute(
+            insert(LikeFlushBatch)
+            .values([{"id": batch_id, "appliedAt": now} for batch_id in sorted(batch_ids)])
+            .on_conflict_do_nothing(index_elements=["id"])
+            .returning(LikeFlushBatch.id)
+        )).scalars().all()
+        if time.monotonic() - self._last_batch_purge >= LIKES_FLUSH_BATCH_PURGE_INTERVAL:
+            await db_posts.execute(delete(LikeFlushBatch).where(
+                LikeFlushBatch.appliedAt < now - timedelta(seconds=LIKES_FLUSH_BATCH_RETENTION)
+            ))
+            self._last_batch_purge = time.monotonic()
+        return {batch_ids[batch_id] for batch_id in inserted}
+
+    async def flush(self) -> int:
+        """
+        Aplica los deltas pendientes (memoria + Redis) a Posts.likes en una sola transacción.
+        Devuelve el número de posts actualizados.
+        """
+        memory_deltas, self._buffer = self._buffer, defaultdict(int)
+        batches = {}
+        if LIKES_FLUSH_BACKEND == "redis":
+            try:
+                batches.update(await self._take_orphaned_deltas())
+                processing_key, redis_deltas = await self._take_redis_deltas()
+                if processing_key:
+                    batches[processing_key] = redis_deltas
+            except Exception as e:
+                print(f"[LikesCounter] No se pudieron leer los deltas de Redis: {str(e)}")
+
+        deltas = {}
+        try:
+            if memory_deltas or batches:
+                async with SessionPost() as db_posts:
+                    new_batches = await self._mark_batches_applied(db_posts, list(batches))
+                    deltas = defaultdict(int)
+                    for source in (memory_deltas, *(batches[key] for key in new_batches)):
+                        for postId, delta in source.items():
+                            deltas[postId] += delta
+                    deltas = {postId: delta for postId, delta in deltas.items() if delta != 0}
+
+                    # Rows are locked in id order so concurrent flushes of several replicas cannot deadlock
+                    items = sorted(deltas.items())
+                    for start in range(0, len(items), LIKES_FLUSH_CHUNK_SIZE):
+                        chunk = dict(items[start:start + LIKES_FLUSH_CHUNK_SIZE])
+                        await db_posts.execute(
+                            select(Post.id)
+                            .where(Post.id.in_([uuid.UUID(postId) for postId in chunk]))
+                            .order_by(Post.id)
+                            .with_for_update()
+                        )
+                        await db_posts.execute(
+                            build_bulk_likes_update(chunk),
+                            execution_options={"synchronize_session": False}
+                        )
+                    await db_posts.commit()
+        except Exception:
+            # Keep the deltas for a later flush
+            for postId, delta in memory_deltas.items():
+                self._buffer[postId] += delta
+            if batches:
+                await self._release_redis_deltas(list(batches))
+            raise
+
+        if batches:
+            # If this fails the copies stay registered; retrying them is a no-op (already in LikeFlushBatches)
+            async with redis_client.pipeline(transaction=True) as pipe:
+                for processing_key in batches:
+                    pipe.delete(processing_key)
+                    pipe.zrem(FLUSHING_LIKES_DELTAS_KEY, processing_key)
+                pipe.incr(LIKES_FLUSH_GENERATION_KEY)
+                await pipe.execute()
+        return len(deltas)
+
+likes_flusher = LikesFlusher()
+
@@ -0,0 +1,105 @@
+import os
+import time
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+)
+from fastapi import Response
+from sqlalchemy import event
+from dotenv import load_dotenv
+from config.db import engine_pet, engine_post, engine_reactions
+
+load_dotenv()
+
+# With several workers set PROMETHEUS_MULTIPROC_DIR (an empty directory) so /metrics
+# aggregates the samples of every worker process
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+# Finer buckets for calls that usually take a few milliseconds
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "SQL statement duration by database",
+    ["database"], buckets=FAST_BUCKETS,
+)
+DB_QUERY_ERRORS = Counter("db_query_errors_total", "SQL statements that raised an error", ["database"])
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds", "Redis command (or whole pipeline) duration",
+    ["command"], buckets=FAST_BUCKETS,
+)
+CACHE_LOOKUPS = Counter("cache_lookups_total", "Cache lookups by cache and result (hit/miss)", ["cache", "result"])
+WEBHOOK_DURATION = Histogram("webhook_request_duration_seconds", "Notifications Service request latency")
+WEBHOOK_REQUESTS = Counter(
+    "webhook_requests_total", "Notifications Service requests by outcome (success/failure/circuit_open)", ["outcome"]
+)
+
+
+def record_cache_lookup(cache: str, hit: bool, count: int = 1):
+    if count:
+        CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc(count)
+
+
+def observe_redis_command(command, duration: float):
+    REDIS_COMMAND_DURATION.labels(str(command).upper()).observe(duration)
+
+
+def _instrument_engine(engine, database: str):
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_start = time.perf_counter()
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        DB_QUERY_DURATION.labels(database).observe(time.perf_counter() - context._metrics_start)
+
+    def handle_error(exception_context):
+        DB_QUERY_ERRORS.labels(database).inc()
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", handle_error)
+
+
+for _database, _engine in (("pet", engine_pet), ("post", engine_post), ("reactions", engine_reactions)):
+    _instrument_engine(_engine, _database)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mide la latencia de cada petición HTTP, etiquetada con la plantilla
+    de la ruta (/likes/{postId}) para no crear una serie por cada id.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the scope
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_DURATION.labels(scope["method"], route, str(status_code)).observe(time.perf_counter() - start)
+
+
+def metrics_response() -> Response:
+    """Respuesta de /metrics en el formato de texto de Prometheus."""
+    registry = REGISTRY
+    if PROMETHEUS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,172 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from sqlalchemy import select
+from dotenv import load_dotenv
+from config.db import SessionPet
+from config.redis_client import redis_client
+from models.pet_model import Pet
+from utils.metrics import record_cache_lookup
+
+load_dotenv()
+
+# Shared Redis tier
+PET_CACHE_TTL = int(os.getenv("PET_CACHE_TTL", 300))
+# In-process tier in front of Redis
+PET_CACHE_LOCAL_TTL = float(os.getenv("PET_CACHE_LOCAL_TTL", 30.0))
+PET_CACHE_LOCAL_MAX_SIZE = int(os.getenv("PET_CACHE_LOCAL_MAX_SIZE", 10000))
+PET_CACHE_RECONNECT_DELAY = 1.0
+
+PET_INFO_KEY = "pet:{petId}:info"
+# Invalidation hook: PUBLISH the petId here (e.g. from the pets service on an ownership change)
+PET_INVALIDATION_CHANNEL = "pets:invalidate"
+
+
+def _normalize_pet_id(petId):
+    try:
+        return str(uuid.UUID(str(petId)))
+    except ValueError:
+        return None
+
+
+class PetCache:
+    """
+    Caché read-through de petId -> {"responsibleId", "name"} en dos niveles: memoria del
+    proceso (TTL corto) y Redis (compartido entre réplicas), con la base de datos de Pets
+    como respaldo. Las mascotas inexistentes no se cachean.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._task = None
+
+    def _get_local(self, petId):
+        entry = self._entries.get(petId)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[petId]
+            return None
+        self._entries.move_to_end(petId)
+        return entry[1]
+
+    def _set_local(self, petId, pet: dict):
+        self._entries[petId] = (time.monotonic() + PET_CACHE_LOCAL_TTL, pet)
+        self._entries.move_to_end(petId)
+        while len(self._entries) > PET_CACHE_LOCAL_MAX_SIZE:
+            self._entries.popitem(last=False)
+
+    async def get_pets(self, petIds: list) -> dict:
+        """
+        Devuelve {petId: {"responsibleId": str, "name": str} o None si la mascota no existe}.
+        """
+        pets = {}
+        remaining = []
+        local_hits = 0
+        for petId in dict.fromkeys(petIds):
+            normalized = _normalize_pet_id(petId)
+            if normalized is None:
+                pets[petId] = None
+                continue
+            pet = self._get_local(normalized)
+            if pet is not None:
+                pets[petId] = pet
+                local_hits += 1
+            else:
+                remaining.append((petId, normalized))
+        record_cache_lookup("pet_local", True, local_hits)
+        record_cache_lookup("pet_local", False, len(remaining))
+
+        if not remaining:
+            return pets
+
+        cached = {}
+        try:
+            values = await redis_client.mget([PET_INFO_KEY.format(petId=normalized) for _, normalized in remaining])
+            cached = {normalized: json.loads(value) for (_, normalized), value in zip(remaining, values) if value is not None}
+        except Exception as e:
+            print(f"[PetCache] Redis no disponible, consultando la base de datos: {str(e)}")
+
+        missing = [normalized for _, normalized in remaining if normalized not in cached]
+        record_cache_lookup("pet_redis", True, len(remaining) - len(missing))
+        record_cache_lookup("pet_redis", False, len(missing))
+        if missing:
+            async with SessionPet() as db_pets:
+                rows = (await db_pets.execute(
+                    select(Pet.id, Pet.responsibleId, Pet.name).where(Pet.id.in_(missing))
+                )).all()
+            loaded = {
+                str(pet_id): {"responsibleId": str(responsible_id), "name": name}
+                for pet_id, responsible_id, name in rows
+            }
+            if loaded:
+                try:
+                    async with redis_client.pipeline(transaction=False) as pipe:
+                        for normalized, pet in loaded.items():
+                            pipe.set(PET_INFO_KEY.format(petId=normalized), json.dumps(pet), ex=PET_CACHE_TTL)
+                        await pipe.execute()
+                except Exception as e:
+                    print(f"[PetCache] No se pudo guardar en Redis: {str(e)}")
+            cached.update(loaded)
+
+        for petId, normalized in remaining:
+            pet = cached.get(normalized)
+            if pet is not None:
+                self._set_local(normalized, pet)
+            pets[petId] = pet
+        return pets
+
+    async def get_pet(self, petId):
+        return (await self.get_pets([petId]))[petId]
+
+    async def invalidate(self, petId):
+        """
+        Hook de invalidación: borra la mascota de Redis y avisa a todas las réplicas para que
+        la borren de su caché local.
+        """
+        normalized = _normalize_pet_id(petId)
+        if normalized is None:
+            return
+        self._entries.pop(normalized, None)
+        await redis_client.delete(PET_INFO_KEY.format(petId=normalized))
+        await redis_client.publish(PET_INVALIDATION_CHANNEL, normalized)
+
+    async def start(self):
+        # Idempotent: add-like and remove-like share this cache in the combined app
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _listen(self):
+        while True:
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.subscribe(PET_INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._entries.pop(message["data"], None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Invalidations may have been missed: drop every local entry
+                print(f"[PetCache] Error en la suscripción de invalidaciones: {str(e)}")
+                self._entries.clear()
+                await asyncio.sleep(PET_CACHE_RECONNECT_DELAY)
+            finally:
+                await pubsub.aclose()
+
+
+pet_cache = PetCache()